@@ -0,0 +1,93 @@
+"""
+analyze_commits 의 파일별 집계를 예전 방식(groupby 여러 번 + merge + apply)과
+aggregate_commit_rows(정렬 한 번 + groupby 집계 한 번)로 각각 실행해 시간을 비교하는 벤치마크입니다.
+
+- legacy: 학생별로 나누어 예전 방식으로 집계
+- per-student: 학생별로 나누어 aggregate_commit_rows 호출
+- combined: 전체 학생의 행을 한 번에 aggregate_commit_rows 로 집계
+
+사용법 (프로젝트 루트에서): python -m benchmarks.bench_aggregate [행 수 ...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_commit_rows
+from git_analyzer import aggregate_commit_rows, calculate_duration
+
+
+def legacy_aggregate(df, exclude_first_commit=True):
+    """
+    이전 _summarize_commits 의 집계 부분 (LOC/유사도 계산 제외)
+    """
+    if exclude_first_commit:
+        df = df.copy()
+        df["rank"] = df.groupby("filename")["date"].rank(method="first")
+        df = df[~((df["rank"] == 1) & (df.groupby("filename")["filename"].transform("count") > 1))]
+        df = df.drop(columns=["rank"])
+
+    grouped_time = df.groupby("filename").agg(
+        first_date=("date", "min"),
+        last_date=("date", "max")
+    ).reset_index()
+    grouped_time["코딩 시간"] = grouped_time.apply(lambda row: calculate_duration(row["first_date"], row["last_date"]),
+                                               axis=1)
+
+    latest_info = df.sort_values("date").groupby("filename").last().reset_index()
+
+    summary = df.groupby("filename").agg(
+        user=("user", "first"),
+        date=("date", "max"),
+        total_changes_mean=("total_changes", "mean"),
+        additions_mean=("additions", "mean"),
+        deletions_mean=("deletions", "mean"),
+        commit_count=("filename", "count")
+    ).reset_index()
+
+    summary = summary.merge(latest_info[["filename", "status", "url"]], on="filename", how="left")
+    summary = summary.merge(grouped_time[["filename", "코딩 시간"]], on="filename", how="left")
+    summary["파일명 (총 커밋 수)"] = summary.apply(
+        lambda row: f'<a href="{row["url"]}" target="_blank">{row["filename"]} ({row["commit_count"]})</a>', axis=1)
+    summary["평균 수정 라인 수 (+/-)"] = summary.apply(
+        lambda row: f'{row["total_changes_mean"]} ({row["additions_mean"]}/{row["deletions_mean"]})', axis=1
+    )
+    return summary
+
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def _check_same(legacy, combined):
+    # 수치 결과가 같은지 확인합니다 (같은 시각 커밋의 상태/URL은 예전 방식에서 정렬이 불안정하므로 제외).
+    legacy = legacy.sort_values(["user", "filename"], ignore_index=True)
+    combined = combined.sort_values(["user", "filename"], ignore_index=True)
+    minutes = legacy["코딩 시간"].str.rstrip("분").astype(int)
+    assert (legacy["commit_count"].to_numpy() == combined["commit_count"].to_numpy()).all()
+    assert (legacy["date"].to_numpy() == combined["date"].to_numpy()).all()
+    assert (minutes.to_numpy() == combined["coding_minutes"].to_numpy()).all()
+    assert np.allclose(legacy["total_changes_mean"], combined["total_changes_mean"])
+
+
+def run(sizes):
+    print(f"{'rows':>9} {'students':>8} {'legacy s':>9} {'per-stu s':>9} {'combined s':>10} {'speedup':>8}")
+    for n_rows in sizes:
+        df = make_commit_rows(n_rows, seed=n_rows)
+        by_student = [group for _, group in df.groupby("user", sort=False)]
+
+        legacy, legacy_time = _timed(lambda: pd.concat([legacy_aggregate(g) for g in by_student]))
+        _, per_student_time = _timed(
+            lambda: pd.concat([aggregate_commit_rows(g, exclude_first_commit=True) for g in by_student]))
+        combined, combined_time = _timed(lambda: aggregate_commit_rows(df, exclude_first_commit=True))
+        _check_same(legacy, combined)
+
+        print(f"{n_rows:>9} {len(by_student):>8} {legacy_time:>9.3f} {per_student_time:>9.3f} "
+              f"{combined_time:>10.3f} {legacy_time / combined_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [20000, 200000, 2000000])
@@ -0,0 +1,137 @@
+"""
+로컬 GitHub 모의 서버(benchmarks.mock_github)를 대상으로 주요 경로의 시간/요청 수/메모리를 측정하는 벤치마크입니다.
+
+시나리오:
+- analyze_commits: 학생 한 명 분석 (REST)
+- analyze_multiple_users: 전체 학생 분석 + CSV/HTML 보고서 생성
+- calculate_similarity: 제출 파일과 로컬 기준 파일의 유사도 계산 (네트워크 없음)
+- save_dataframe_as_html: analyze_multiple_users 결과로 종합 보고서 렌더링
+
+각 시나리오마다 경과 시간, 모의 서버가 받은 요청 수(엔드포인트별), 응답 바이트, tracemalloc 최대 메모리를 출력합니다.
+작업 디렉토리는 임시 디렉토리이며 week_information.txt 와 lib/ 만 연결해 둡니다.
+
+사용법 (프로젝트 루트에서):
+    python -m benchmarks.bench_github [--students 20] [--commits 40] [--files 20] [--latency 0.01]
+                                      [--concurrency 8] [--workers 4] [--json results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+import git_analyzer
+from benchmarks.mock_github import MockGitHubServer
+from html_parser import save_dataframe_as_html
+from main import analyze_multiple_users
+from rate_limiter import RateLimitScheduler
+
+SCENARIOS = ("analyze_commits", "analyze_multiple_users", "calculate_similarity", "save_dataframe_as_html")
+
+
+def _measure(server, func, verbose=False):
+    server.reset_stats()
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    tracemalloc.start()
+    started = time.perf_counter()
+    with output:
+        func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = server.stats()
+    requests_by_endpoint = stats["requests"]
+    return {
+        "seconds": round(elapsed, 3),
+        "requests": sum(requests_by_endpoint.values()),
+        "requests_by_endpoint": requests_by_endpoint,
+        "statuses": stats["statuses"],
+        "response_mb": round(stats["bytes"] / 1024 / 1024, 2),
+        "peak_mb": round(peak / 1024 / 1024, 1),
+    }
+
+
+def run(args):
+    project_root = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, \
+            MockGitHubServer(args.students, args.commits, args.files, latency=args.latency, seed=args.seed) as server:
+        shutil.copy(os.path.join(project_root, "week_information.txt"), workdir)
+        os.symlink(os.path.join(project_root, "lib"), os.path.join(workdir, "lib"))
+        os.chdir(workdir)
+
+        git_analyzer.configure_base_urls(api_url=server.api_url, raw_url=server.raw_url)
+        # 실제 GitHub의 초당 요청 제한 대신 벤치마크용 제한을 사용합니다.
+        git_analyzer.set_scheduler(RateLimitScheduler(session_factory=git_analyzer._get_session,
+                                                      rate=args.rate, burst=args.rate))
+        accounts = server.account_lines()
+        with open("users_account.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(accounts) + "\n")
+
+        try:
+            if "analyze_commits" in args.scenarios:
+                github_url, token, username, name = accounts[0].split(",")
+                results["analyze_commits"] = _measure(server, lambda: git_analyzer.analyze_commits(
+                    github_url, token, username, directory="lib/", exclude_first_commit=True,
+                    user_actual_name=name, concurrency=args.concurrency), args.verbose)
+
+            if "analyze_multiple_users" in args.scenarios or "save_dataframe_as_html" in args.scenarios:
+                results["analyze_multiple_users"] = _measure(server, lambda: analyze_multiple_users(
+                    "users_account.txt", workers=args.workers, report_workers=1,
+                    concurrency=args.concurrency), args.verbose)
+
+            if "calculate_similarity" in args.scenarios:
+                pairs = []
+                for repo in server.repos.values():
+                    for path, remote_code in repo["files"].items():
+                        if os.path.exists(path):
+                            with open(path, "r", encoding="utf-8") as f:
+                                pairs.append((f.read(), remote_code))
+                results["calculate_similarity"] = _measure(
+                    server, lambda: [git_analyzer.calculate_similarity(a, b) for a, b in pairs], args.verbose)
+                results["calculate_similarity"]["pairs"] = len(pairs)
+
+            if "save_dataframe_as_html" in args.scenarios and os.path.exists("all_users_summary.csv"):
+                df = pd.read_csv("all_users_summary.csv")
+                results["save_dataframe_as_html"] = _measure(server, lambda: save_dataframe_as_html(
+                    df, output_path="bench_report.html", title="benchmark"), args.verbose)
+                results["save_dataframe_as_html"]["rows"] = len(df)
+        finally:
+            os.chdir(project_root)
+
+    results = {name: result for name, result in results.items() if name in args.scenarios}
+    print(f"students={args.students} commits={args.commits} files={args.files} latency={args.latency}s "
+          f"concurrency={args.concurrency} workers={args.workers}")
+    print(f"{'scenario':<24} {'seconds':>8} {'requests':>8} {'resp MB':>8} {'peak MB':>8}  endpoints")
+    for name, result in results.items():
+        endpoints = ", ".join(f"{key}={value}" for key, value in sorted(result["requests_by_endpoint"].items()))
+        print(f"{name:<24} {result['seconds']:>8.3f} {result['requests']:>8} {result['response_mb']:>8.2f} "
+              f"{result['peak_mb']:>8.1f}  {endpoints}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": {key: value for key, value in vars(args).items() if key != "json"},
+                       "results": results}, f, ensure_ascii=False, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GitHub 모의 서버 대상 벤치마크")
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--commits", type=int, default=40, help="학생당 커밋 수")
+    parser.add_argument("--files", type=int, default=20, help="학생당 파일 수")
+    parser.add_argument("--latency", type=float, default=0.01, help="모의 서버의 요청당 지연(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=8, help="학생별 동시 요청 수")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 분석할 학생 수")
+    parser.add_argument("--rate", type=float, default=1000.0, help="초당 요청 수 제한 (token bucket)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--json", metavar="PATH", default=None, help="결과를 JSON 파일로도 저장")
+    parser.add_argument("--verbose", action="store_true", help="분석 중 출력 메시지를 그대로 표시")
+    run(parser.parse_args())
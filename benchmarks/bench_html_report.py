@@ -0,0 +1,33 @@
+"""
+save_dataframe_as_html 렌더링 시간이 행 수에 선형으로 늘어나는지 확인하는 벤치마크입니다.
+
+사용법 (프로젝트 루트에서): python -m benchmarks.bench_html_report [행 수 ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_summary_frame
+from html_parser import save_dataframe_as_html
+
+
+def run(sizes):
+    print(f"{'rows':>8} {'seconds':>9} {'us/row':>8} {'peak MB':>8} {'HTML MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "report.html")
+        for n_rows in sizes:
+            df = make_summary_frame(n_rows, seed=n_rows)
+            tracemalloc.start()
+            started = time.perf_counter()
+            save_dataframe_as_html(df, output_path=output_path, title="benchmark")
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size_mb = os.path.getsize(output_path) / 1024 / 1024
+            print(f"{n_rows:>8} {elapsed:>9.3f} {elapsed / n_rows * 1e6:>8.1f} {peak / 1024 / 1024:>8.1f} {size_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,382 @@
+"""
+벤치마크용 로컬 GitHub 모의 서버입니다.
+
+학생 수/커밋 수/파일 수를 정해 가짜 저장소(커밋 목록, 커밋 상세, 트리, blob, raw 파일, GraphQL 커밋 기록)를 만들고,
+별도 프로세스의 ThreadingHTTPServer로 제공합니다. 요청마다 latency초를 기다려 실제 네트워크 지연을 흉내 냅니다.
+
+- REST API: {base}/api/repos/... (git_analyzer.configure_base_urls(api_url=...)에 넘길 주소)
+- raw 파일: {base}/raw/{owner}/{repo}/{branch}/{path}
+- GraphQL: {base}/api/graphql
+- 요청 통계: GET {base}/_stats, 초기화: POST {base}/_reset
+
+단독 실행 (프로젝트 루트에서): python -m benchmarks.mock_github --students 30 --latency 0.05 --port 8765
+"""
+import argparse
+import base64
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from git_analyzer import load_week_range
+
+DEFAULT_REPO_NAME = "homework"
+DEFAULT_BRANCH = "main"
+
+_GRAPHQL_BLOCK = re.compile(
+    r'(\w+): repository\(owner: ("(?:[^"\\]|\\.)*"), name: ("(?:[^"\\]|\\.)*")\) \{\s*'
+    r'ref\(qualifiedName: ("(?:[^"\\]|\\.)*")\).*?history\(first: (\d+),.*?after: (null|"[^"]*")\)',
+    re.S)
+
+
+def student_login(index):
+    return f"student{index:04d}"
+
+
+def _reference_files(base_dir="lib"):
+    references = []
+    for root, _, files in os.walk(base_dir):
+        for name in sorted(files):
+            if name.endswith(".js"):
+                path = os.path.join(root, name)
+                with open(path, "r", encoding="utf-8") as f:
+                    references.append((path.replace(os.sep, "/"), f.read()))
+    return sorted(references)
+
+
+def _mutate(code, rng):
+    lines = code.splitlines()
+    result = []
+    for line in lines:
+        roll = rng.random()
+        if roll < 0.1:
+            continue
+        if roll < 0.2:
+            line = line + f" // {rng.randint(0, 999)}"
+        result.append(line)
+    return "\n".join(result) + "\n"
+
+
+def build_fixtures(n_students=10, commits_per_student=40, files_per_student=20, seed=0, base_dir="lib",
+                   week_range=None, repo_name=DEFAULT_REPO_NAME, branch=DEFAULT_BRANCH):
+    """
+    학생별 가짜 저장소를 만듭니다.
+    파일 경로는 base_dir 아래 기준 파일 경로를 재사용하고(코드 유사도 계산 대상), 내용은 기준 파일을 조금씩 바꾼 것입니다.
+    커밋의 약 80%는 주차 범위 안, 나머지는 주차 시작 이전 날짜입니다.
+
+    반환값: {(owner, repo): {"branch", "commits"(최신순), "files"({경로: 내용}), "blobs"({sha: 내용})}}
+    """
+    _, start, end = week_range or load_week_range()
+    rng = random.Random(seed)
+    references = _reference_files(base_dir) or [("lib/sample.js", "console.log('hello');\n")]
+    window_seconds = int((end - start).total_seconds())
+
+    repos = {}
+    for index in range(n_students):
+        owner = student_login(index)
+        paths = [references[i % len(references)][0] if i < len(references)
+                 else f"lib/extra/{owner}_{i:03d}.js" for i in range(files_per_student)]
+        files = {}
+        for i, path in enumerate(paths):
+            source = references[i % len(references)][1]
+            files[path] = _mutate(source, rng)
+
+        commits = []
+        for number in range(commits_per_student):
+            if rng.random() < 0.8:
+                authored = start + timedelta(seconds=rng.randint(0, window_seconds))
+            else:
+                authored = start - timedelta(days=rng.randint(1, 14), seconds=rng.randint(0, 86399))
+            touched = rng.sample(paths, k=min(len(paths), rng.randint(1, 3)))
+            sha = hashlib.sha1(f"{owner}/{number}".encode("utf-8")).hexdigest()
+            utc = (authored - timedelta(hours=9)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            commit_files = []
+            for path in touched:
+                additions, deletions = rng.randint(0, 40), rng.randint(0, 15)
+                commit_files.append({"filename": path, "status": "modified" if number else "added",
+                                     "additions": additions, "deletions": deletions,
+                                     "changes": additions + deletions})
+            commits.append({
+                "sha": sha,
+                "html_url": f"https://github.com/{owner}/{repo_name}/commit/{sha}",
+                "commit": {"author": {"name": owner, "email": f"{owner}@example.com", "date": utc},
+                           "committer": {"name": owner, "email": f"{owner}@example.com", "date": utc}},
+                "author": {"login": owner},
+                "files": commit_files,
+            })
+        commits.sort(key=lambda c: c["commit"]["author"]["date"], reverse=True)
+
+        blobs = {hashlib.sha1(body.encode("utf-8")).hexdigest(): body for body in files.values()}
+        repos[(owner, repo_name)] = {"branch": branch, "commits": commits, "files": files, "blobs": blobs}
+    return repos
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockGitHub/1.0"
+
+    def log_message(self, *args):
+        pass
+
+    # --- 응답 도우미 ---
+    def _send(self, endpoint, status, body, content_type="application/json", extra_headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        state = self.server.state
+        if state["latency"]:
+            time.sleep(state["latency"])
+        with state["lock"]:
+            state["requests"][endpoint] += 1
+            state["statuses"][str(status)] += 1
+            state["bytes"] += len(body)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_control(self, body):
+        # 통계 조회/초기화 응답은 지연 없이 보내고 요청 수에도 넣지 않습니다.
+        body = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_found(self, endpoint):
+        self._send(endpoint, 404, {"message": "Not Found"})
+
+    # --- 라우팅 ---
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        repos = self.server.repos
+
+        if parts == ["_stats"]:
+            state = self.server.state
+            with state["lock"]:
+                stats = {"requests": dict(state["requests"]), "statuses": dict(state["statuses"]),
+                         "bytes": state["bytes"]}
+            return self._send_control(stats)
+
+        if parts[0] == "raw" and len(parts) >= 5:
+            repo = repos.get((parts[1], parts[2]))
+            body = repo["files"].get("/".join(parts[4:])) if repo and repo["branch"] == parts[3] else None
+            if body is None:
+                return self._not_found("raw")
+            return self._send("raw", 200, body.encode("utf-8"), content_type="text/plain; charset=utf-8")
+
+        if parts[:2] != ["api", "repos"] or len(parts) < 4:
+            return self._not_found("other")
+        repo = repos.get((parts[2], parts[3]))
+        rest = parts[4:]
+
+        if not rest:
+            if repo is None:
+                return self._not_found("repo")
+            return self._send("repo", 200, {"name": parts[3], "owner": {"login": parts[2]},
+                                            "default_branch": repo["branch"]})
+        if repo is None:
+            return self._not_found(rest[0])
+
+        if rest == ["commits"]:
+            commits = repo["commits"]
+            since, until = query.get("since", [None])[0], query.get("until", [None])[0]
+            author, path = query.get("author", [None])[0], query.get("path", [None])[0]
+            if since:
+                commits = [c for c in commits if c["commit"]["author"]["date"] >= since]
+            if until:
+                commits = [c for c in commits if c["commit"]["author"]["date"] <= until]
+            if author:
+                commits = [c for c in commits if c["author"]["login"] == author]
+            if path:
+                prefix = path.rstrip("/") + "/"
+                commits = [c for c in commits if any(f["filename"].startswith(prefix) for f in c["files"])]
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            listed = [{"sha": c["sha"], "html_url": c["html_url"], "commit": c["commit"], "author": c["author"]}
+                      for c in commits[(page - 1) * per_page:page * per_page]]
+            return self._send("commits", 200, listed)
+
+        if len(rest) == 2 and rest[0] == "commits":
+            for commit in repo["commits"]:
+                if commit["sha"] == rest[1]:
+                    return self._send("commit", 200, commit, extra_headers={"ETag": f'"{commit["sha"]}"'})
+            return self._not_found("commit")
+
+        if len(rest) == 3 and rest[:2] == ["git", "trees"]:
+            if rest[2] != repo["branch"]:
+                return self._not_found("tree")
+            tree = [{"path": path, "type": "blob", "sha": hashlib.sha1(body.encode("utf-8")).hexdigest()}
+                    for path, body in repo["files"].items()]
+            return self._send("tree", 200, {"sha": repo["branch"], "tree": tree, "truncated": False})
+
+        if len(rest) == 3 and rest[:2] == ["git", "blobs"]:
+            body = repo["blobs"].get(rest[2])
+            if body is None:
+                return self._not_found("blob")
+            if "application/vnd.github.raw" in (self.headers.get("Accept") or ""):
+                return self._send("blob", 200, body.encode("utf-8"), content_type="application/vnd.github.raw")
+            return self._send("blob", 200, {"sha": rest[2], "encoding": "base64",
+                                            "content": base64.b64encode(body.encode("utf-8")).decode("ascii")})
+
+        return self._not_found("other")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length) if length else b""
+
+        if url.path == "/_reset":
+            state = self.server.state
+            with state["lock"]:
+                state["requests"].clear()
+                state["statuses"].clear()
+                state["bytes"] = 0
+            return self._send_control({})
+
+        if url.path != "/api/graphql":
+            return self._not_found("other")
+        request = json.loads(payload or b"{}")
+        variables = request.get("variables") or {}
+        data = {}
+        for alias, owner, name, ref, first, after in _GRAPHQL_BLOCK.findall(request.get("query", "")):
+            repo = self.server.repos.get((json.loads(owner), json.loads(name)))
+            if repo is None:
+                data[alias] = None
+                continue
+            if json.loads(ref) != f"refs/heads/{repo['branch']}":
+                data[alias] = {"ref": None}
+                continue
+            commits = repo["commits"]
+            if variables.get("since"):
+                commits = [c for c in commits if c["commit"]["author"]["date"] >= variables["since"]]
+            if variables.get("until"):
+                commits = [c for c in commits if c["commit"]["author"]["date"] <= variables["until"]]
+            if variables.get("path"):
+                prefix = variables["path"].rstrip("/") + "/"
+                commits = [c for c in commits if any(f["filename"].startswith(prefix) for f in c["files"])]
+            offset = int(json.loads(after)) if after != "null" else 0
+            page = commits[offset:offset + int(first)]
+            has_next = offset + int(first) < len(commits)
+            data[alias] = {"ref": {"target": {"history": {
+                "pageInfo": {"hasNextPage": has_next, "endCursor": str(offset + int(first)) if has_next else None},
+                "nodes": [{"oid": c["sha"], "url": c["html_url"], "authoredDate": c["commit"]["author"]["date"],
+                           "author": {"name": c["commit"]["author"]["name"], "email": c["commit"]["author"]["email"],
+                                      "user": {"login": c["author"]["login"]}}} for c in page],
+            }}}}
+        data["rateLimit"] = {"cost": 1, "remaining": 4999, "resetAt": None}
+        return self._send("graphql", 200, {"data": data})
+
+
+def _serve(repos, latency, port, ready):
+    server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    server.daemon_threads = True
+    server.repos = repos
+    server.state = {"latency": latency, "lock": threading.Lock(), "requests": Counter(), "statuses": Counter(),
+                    "bytes": 0}
+    ready.send(server.server_address[1])
+    ready.close()
+    server.serve_forever()
+
+
+class MockGitHubServer:
+    """
+    build_fixtures로 만든 저장소를 별도 프로세스에서 제공하는 모의 서버입니다.
+    (벤치마크 대상 코드와 GIL/메모리를 나누지 않도록 프로세스를 분리합니다.)
+
+        with MockGitHubServer(n_students=20, latency=0.02) as server:
+            git_analyzer.configure_base_urls(api_url=server.api_url, raw_url=server.raw_url)
+    """
+
+    def __init__(self, n_students=10, commits_per_student=40, files_per_student=20, latency=0.0, seed=0,
+                 port=0, base_dir="lib", week_range=None):
+        self.repos = build_fixtures(n_students, commits_per_student, files_per_student, seed=seed,
+                                    base_dir=base_dir, week_range=week_range)
+        self.latency = latency
+        self.port = port
+        self._process = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def api_url(self):
+        return f"{self.base_url}/api"
+
+    @property
+    def raw_url(self):
+        return f"{self.base_url}/raw"
+
+    def account_lines(self, token="mock-token"):
+        """
+        users_account.txt 형식(url,token,username,이름)의 줄 목록을 반환합니다.
+        """
+        return [f"https://github.com/{owner}/{repo},{token},{owner},{owner}" for owner, repo in self.repos]
+
+    def start(self):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(target=_serve, args=(self.repos, self.latency, self.port, sender),
+                                                daemon=True)
+        self._process.start()
+        sender.close()
+        self.port = receiver.recv()
+        receiver.close()
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(timeout=5)
+            self._process = None
+
+    def stats(self):
+        import requests
+        return requests.get(f"{self.base_url}/_stats", timeout=10).json()
+
+    def reset_stats(self):
+        import requests
+        requests.post(f"{self.base_url}/_reset", timeout=10)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 GitHub 모의 서버")
+    parser.add_argument("--students", type=int, default=10)
+    parser.add_argument("--commits", type=int, default=40, help="학생당 커밋 수")
+    parser.add_argument("--files", type=int, default=20, help="학생당 파일 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청마다 기다릴 시간(초)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    mock = MockGitHubServer(args.students, args.commits, args.files, latency=args.latency, port=args.port)
+    mock.start()
+    print(f"🧪 모의 GitHub 서버: API {mock.api_url}, raw {mock.raw_url}")
+    print(f"   GITHUB_API_URL={mock.api_url} GITHUB_RAW_URL={mock.raw_url} 환경 변수로 main.py를 연결할 수 있습니다.")
+    for line in mock.account_lines():
+        print(f"   {line}")
+    try:
+        mock._process.join()
+    except KeyboardInterrupt:
+        mock.stop()
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+
+def make_summary_frame(n_rows, n_students=None, seed=0):
+    """
+    analyze_commits 결과와 같은 컬럼을 가진 가짜 파일별 요약 DataFrame을 만듭니다.
+    (학생 한 명당 평균 40개 파일)
+    """
+    rng = np.random.default_rng(seed)
+    n_students = n_students or max(1, n_rows // 40)
+    student_ids = rng.integers(0, n_students, n_rows)
+    commit_counts = rng.integers(1, 12, n_rows)
+    total = np.round(rng.random(n_rows) * 30, 2)
+    additions = np.round(total * 0.7, 2)
+    deletions = np.round(total - additions, 2)
+    similarity = np.round(rng.random(n_rows) * 100, 2)
+    similarity[rng.random(n_rows) < 0.05] = np.nan
+    minutes = rng.integers(0, 3000, n_rows)
+    days = rng.integers(0, 6, n_rows)
+
+    return pd.DataFrame({
+        "이름": [f"학생{s:04d}" for s in student_ids.tolist()],
+        "user": [f"user{s:04d}" for s in student_ids.tolist()],
+        "파일명 (총 커밋 수)": [
+            f'<a href="https://github.com/u/r/commit/{i:040x}" target="_blank">lib/week09/f{i % 40}.js ({c})</a>'
+            for i, c in enumerate(commit_counts.tolist())
+        ],
+        "최근 커밋일시": [
+            f"2025-{10 + (30 + d) // 32:02d}-{(30 + d - 1) % 31 + 1:02d} 12:{i % 60:02d}"
+            for i, d in enumerate(days.tolist())
+        ],
+        "상태": np.where(rng.random(n_rows) < 0.3, "added", "modified"),
+        "평균 수정 라인 수 (+/-)": [
+            f"{t} ({a}/{d})" for t, a, d in zip(total.tolist(), additions.tolist(), deletions.tolist())
+        ],
+        "코드 유사도": similarity,
+        "코딩 시간": [f"{m}분" for m in minutes.tolist()],
+        "평가": "success",
+    })
+
+
+def make_commit_rows(n_rows, n_students=None, files_per_student=40, seed=0):
+    """
+    _parse_commit_detail 결과(raw_data)와 같은 컬럼을 가진 가짜 커밋-파일 행 DataFrame을 만듭니다.
+    (학생 한 명당 평균 files_per_student개 파일, 파일당 여러 커밋)
+    """
+    rng = np.random.default_rng(seed)
+    n_students = n_students or max(1, n_rows // (files_per_student * 5))
+    student_ids = rng.integers(0, n_students, n_rows)
+    file_ids = rng.integers(0, files_per_student, n_rows)
+    additions = rng.integers(0, 40, n_rows)
+    deletions = rng.integers(0, 20, n_rows)
+    users = np.array([f"user{s:05d}" for s in range(n_students)], dtype=object)
+    files = np.array([f"lib/week09/f{i:02d}.js" for i in range(files_per_student)], dtype=object)
+    started = np.datetime64("2025-10-30T00:00")
+
+    return pd.DataFrame({
+        "user": users[student_ids],
+        "date": started + rng.integers(0, 6 * 24 * 60, n_rows).astype("timedelta64[m]"),
+        "filename": files[file_ids],
+        "total_changes": additions + deletions,
+        "additions": additions,
+        "deletions": deletions,
+        "status": np.where(rng.random(n_rows) < 0.3, "added", "modified").astype(object),
+        "url": [f"https://github.com/u/r/commit/{i:040x}" for i in range(n_rows)],
+    })
@@ -0,0 +1,167 @@
+import argparse
+import os
+import re
+import sys
+from datetime import datetime
+
+import main
+from week_config import load_week_ranges
+
+# 사용법: python cli.py <명령> [옵션]
+#   validate-roster  users_account.txt 형식 검사 (--online 이면 저장소 존재/권한도 확인)
+#   show-week        week_information.txt 의 주차 범위 출력
+#   fetch            커밋을 조회·집계하여 all_users_summary.csv 만 저장 (HTML 생성 안 함)
+#   analyze          main.py 와 같은 전체 분석 (조회 + 보고서)
+#   render           all_users_summary.csv 로 HTML 보고서만 다시 생성 (네트워크 사용 안 함)
+# pandas/numpy/requests는 그것이 필요한 명령(fetch, analyze, render, validate-roster --online)에서만 불러옵니다.
+
+REPO_URL_PATTERN = re.compile(r"^https://github\.com/[^/\s]+/[^/\s]+/?$")
+
+
+def validate_roster(account_file, online=False):
+    """
+    계정 목록 파일의 각 줄(저장소 URL,토큰,GitHub 사용자명[,실제 이름])을 검사하여 (줄 번호, 문제) 목록을 반환합니다.
+    online=True이면 GitHub API로 저장소 존재/권한도 확인합니다.
+    """
+    problems = []
+    seen_urls, seen_names = {}, {}
+    with open(account_file, "r", encoding="utf-8") as f:
+        lines = [(number, line.strip()) for number, line in enumerate(f, start=1) if line.strip()]
+
+    valid = []
+    for number, line in lines:
+        parts = [part.strip() for part in line.split(",")]
+        if len(parts) < 3:
+            problems.append((number, "필드가 부족합니다 (저장소 URL,토큰,GitHub 사용자명[,실제 이름])"))
+            continue
+        github_url, token, username = parts[0], parts[1], parts[2]
+        name = parts[3] if len(parts) > 3 and parts[3] else username
+        if not REPO_URL_PATTERN.match(github_url):
+            problems.append((number, f"잘못된 GitHub 저장소 주소입니다: {github_url}"))
+            continue
+        if not token:
+            problems.append((number, "토큰이 비어 있습니다"))
+        if not username:
+            problems.append((number, "GitHub 사용자명이 비어 있습니다"))
+
+        url_key = github_url.rstrip("/").lower().removesuffix(".git")
+        if url_key in seen_urls:
+            problems.append((number, f"{seen_urls[url_key]}번째 줄과 같은 저장소입니다"))
+        seen_urls.setdefault(url_key, number)
+        if name in seen_names:
+            problems.append((number, f"{seen_names[name]}번째 줄과 같은 이름({name})입니다 (보고서 파일이 덮어써짐)"))
+        seen_names.setdefault(name, number)
+        valid.append((number, github_url, token))
+
+    if online:
+        from git_analyzer import extract_repo_info
+        for number, github_url, token in valid:
+            try:
+                extract_repo_info(github_url, token)
+            except Exception as e:
+                problems.append((number, str(e)))
+    return len(lines), sorted(problems)
+
+
+def cmd_validate_roster(args):
+    count, problems = validate_roster(args.account_file, online=args.online)
+    for number, message in problems:
+        print(f"❌ {args.account_file}:{number}: {message}")
+    if problems:
+        print(f"❗ {count}줄 중 문제 {len(problems)}건")
+        return 1
+    print(f"✅ {args.account_file}: {count}줄 모두 올바릅니다.")
+    return 0
+
+
+def cmd_show_week(args):
+    try:
+        week_ranges = load_week_ranges(args.week_file)
+    except (OSError, ValueError) as e:
+        print(f"❌ {args.week_file}: {e}")
+        return 1
+    today = datetime.strptime(args.date, "%Y-%m-%d") if args.date else datetime.now()
+    for label, start, end in week_ranges:
+        days = (end.date() - start.date()).days + 1
+        marker = "  ◀ 현재" if start <= today <= end else ""
+        print(f"📅 {label}: {start:%Y-%m-%d} ~ {end:%Y-%m-%d} ({days}일){marker}")
+    return 0
+
+
+def cmd_fetch(args):
+    main.run(args, write_html=False)
+    return 0
+
+
+def cmd_analyze(args):
+    main.run(args)
+    return 0
+
+
+def cmd_render(args):
+    import pandas as pd
+
+    if not os.path.exists(args.csv):
+        print(f"❌ {args.csv} 파일이 없습니다. 먼저 python cli.py fetch 또는 analyze 를 실행하세요.")
+        return 1
+    combined_df = pd.read_csv(args.csv)
+    week_ranges = load_week_ranges(args.week_file)
+    if len(week_ranges) > 1 and "week_label" not in combined_df.columns:
+        print(f"❌ {args.week_file} 에는 주차가 여러 개인데 {args.csv} 에 week_label 컬럼이 없습니다.")
+        return 1
+    suspicious_pairs = None
+    if args.suspicious_pairs and os.path.exists(args.suspicious_pairs):
+        suspicious_pairs = pd.read_csv(args.suspicious_pairs)
+    main.write_reports(combined_df, week_ranges, suspicious_pairs=suspicious_pairs, z_scope=args.z_scope,
+                       report_workers=args.report_workers, robust=args.robust_z)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="GitHub 커밋 분석 도구")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate-roster", help="계정 목록 파일 형식 검사")
+    validate.add_argument("account_file", nargs="?", default="users_account.txt",
+                          help="검사할 계정 목록 파일 (기본값: users_account.txt)")
+    validate.add_argument("--online", action="store_true", help="GitHub API로 저장소 존재/권한도 확인합니다")
+    validate.set_defaults(handler=cmd_validate_roster)
+
+    show_week = commands.add_parser("show-week", help="주차 범위 출력")
+    show_week.add_argument("--week-file", default="week_information.txt",
+                           help="주차 정보 파일 (기본값: week_information.txt)")
+    show_week.add_argument("--date", default=None, help="현재 주차 표시 기준 날짜 YYYY-MM-DD (기본값: 오늘)")
+    show_week.set_defaults(handler=cmd_show_week)
+
+    fetch = commands.add_parser("fetch", help="커밋 조회·집계 후 all_users_summary.csv 만 저장")
+    main.add_arguments(fetch)
+    fetch.set_defaults(handler=cmd_fetch)
+
+    analyze = commands.add_parser("analyze", help="전체 분석 (main.py 와 동일)")
+    main.add_arguments(analyze)
+    analyze.set_defaults(handler=cmd_analyze)
+
+    render = commands.add_parser("render", help="all_users_summary.csv 로 HTML 보고서 생성 (네트워크 사용 안 함)")
+    render.add_argument("--csv", default="all_users_summary.csv",
+                        help="보고서를 만들 요약 CSV (기본값: all_users_summary.csv)")
+    render.add_argument("--week-file", default="week_information.txt",
+                        help="주차 정보 파일 (기본값: week_information.txt)")
+    render.add_argument("--suspicious-pairs", default="suspicious_pairs.csv",
+                        help="종합 보고서에 붙일 학생 간 의심 유사 제출 CSV (파일이 있을 때만 사용)")
+    render.add_argument("--report-workers", type=int, default=None,
+                        help="학생별 HTML 보고서를 생성할 프로세스 수 (기본값: CPU 수, 1이면 순차 처리)")
+    render.add_argument("--z-scope", choices=main.Z_SCOPES, default="student",
+                        help="학생별 보고서의 Z-score 기준 (기본값: student)")
+    render.add_argument("--robust-z", action="store_true",
+                        help="Z-score 기준으로 평균/표준편차 대신 중앙값/MAD를 사용합니다")
+    render.set_defaults(handler=cmd_render)
+    return parser
+
+
+def run_cli(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli())
@@ -0,0 +1,301 @@
+import math
+
+import numpy as np
+
+# Z-score를 계산하는 컬럼 (보고서에 표시되는 세 지표)
+Z_SCORE_COLUMNS = ("총 커밋 수", "평균 수정 라인 수", "코딩 시간(분)")
+
+# 지표별 이상치 판정 규칙: 컬럼 -> (방향, Z-score 기준값)
+OUTLIER_RULES = {
+    "총 커밋 수": ("<", -1.0),
+    "평균 수정 라인 수": (">", 2.0),
+    "코딩 시간(분)": ("<", -1.0),
+}
+
+# 정규분포에서 MAD를 표준편차 척도로 맞추는 상수
+MAD_SCALE = 1.4826
+
+# 코드 유사도가 이 값(%) 미만이거나 없으면 이상치
+SIMILARITY_THRESHOLD = 85.0
+
+
+class RunningStats:
+    """
+    Welford 방식의 평균/제곱편차합 누적기입니다.
+    작업자별로 따로 모은 누적기를 merge()로 합칠 수 있고, 이전에 합친 부분을 subtract()로 뺄 수 있어
+    학생 한 명의 값이 바뀌어도 전체 행을 다시 훑지 않고 평균/표준편차를 갱신합니다.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return cls()
+        mean = np.mean(values)
+        deviations = values - mean
+        return cls(len(values), float(mean), float(np.sum(deviations * deviations)))
+
+    def merge(self, other):
+        """
+        두 누적기를 합친 새 누적기를 반환합니다 (Chan 등의 병렬 결합식).
+        """
+        if other.count == 0:
+            return RunningStats(self.count, self.mean, self.m2)
+        if self.count == 0:
+            return RunningStats(other.count, other.mean, other.m2)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / count
+        return RunningStats(count, mean, m2)
+
+    def subtract(self, other):
+        """
+        merge()로 합쳤던 other를 다시 뺀 누적기를 반환합니다.
+        """
+        count = self.count - other.count
+        if count <= 0:
+            return RunningStats()
+        mean = (self.mean * self.count - other.mean * other.count) / count
+        delta = other.mean - mean
+        m2 = self.m2 - other.m2 - delta * delta * count * other.count / self.count
+        return RunningStats(count, mean, max(m2, 0.0))
+
+    @property
+    def std(self):
+        """
+        모집단 표준편차 (np.std와 같은 ddof=0)
+        """
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+
+class CohortStatsEngine:
+    """
+    학생(또는 작업자)별 기여분을 키로 관리하며 Z-score 기준 (중심, 척도)를 누적 계산합니다.
+
+    - 기본(robust=False): 컬럼별 RunningStats로 (평균, 모집단 표준편차)
+    - robust=True: (중앙값, 1.4826 x MAD) — 극단값 몇 개가 기준 전체를 끌고 가지 않도록 할 때 사용
+    update(key, df)는 key의 이전 기여분을 빼고 새 값을 더하므로, 학생이 하나씩 도착하거나 바뀌어도
+    전체 DataFrame을 다시 계산하지 않습니다. 컬럼별 값은 정렬 배열로도 유지하여 중앙값과
+    이상치 경계가 옮겨졌을 때 영향을 받는 학생을 이진 탐색으로 찾습니다.
+    """
+
+    def __init__(self, columns=Z_SCORE_COLUMNS, robust=False):
+        self.columns = tuple(columns)
+        self.robust = robust
+        self._totals = {column: RunningStats() for column in self.columns}
+        self._parts = {}  # 키 -> {컬럼: (RunningStats, 값 배열)}
+        self._sorted_values = {column: np.empty(0) for column in self.columns}
+        self._sorted_keys = {column: np.empty(0, dtype=object) for column in self.columns}
+        self._cached_stats = None
+
+    def __contains__(self, key):
+        return key in self._parts
+
+    def keys(self):
+        return list(self._parts)
+
+    def _insert(self, column, key, values):
+        sorted_values, sorted_keys = self._sorted_values[column], self._sorted_keys[column]
+        values = np.sort(values)
+        positions = np.searchsorted(sorted_values, values)
+        self._sorted_values[column] = np.insert(sorted_values, positions, values)
+        self._sorted_keys[column] = np.insert(sorted_keys, positions, np.full(len(values), key, dtype=object))
+
+    def _delete(self, column, key):
+        keep = self._sorted_keys[column] != key
+        self._sorted_values[column] = self._sorted_values[column][keep]
+        self._sorted_keys[column] = self._sorted_keys[column][keep]
+
+    def remove(self, key):
+        part = self._parts.pop(key, None)
+        if part is None:
+            return
+        for column, (stats, _) in part.items():
+            self._totals[column] = self._totals[column].subtract(stats)
+            self._delete(column, key)
+        self._cached_stats = None
+
+    def update(self, key, df):
+        """
+        key(예: 학생 이름)의 행을 df로 바꿉니다. 이전 기여분이 있으면 먼저 뺍니다.
+        """
+        self.remove(key)
+        part = {}
+        for column in self.columns:
+            values = df[column].to_numpy(dtype=float)
+            stats = RunningStats.from_values(values)
+            part[column] = (stats, values)
+            self._totals[column] = self._totals[column].merge(stats)
+            self._insert(column, key, values)
+        self._parts[key] = part
+        self._cached_stats = None
+
+    def merge(self, other):
+        """
+        다른 작업자가 모은 엔진(키가 겹치지 않아야 함)을 이 엔진에 합칩니다.
+        """
+        for key, part in other._parts.items():
+            if key in self._parts:
+                raise ValueError(f"이미 포함된 키입니다: {key}")
+            self._parts[key] = part
+            for column, (stats, values) in part.items():
+                self._totals[column] = self._totals[column].merge(stats)
+                self._insert(column, key, values)
+        self._cached_stats = None
+        return self
+
+    def stats(self):
+        """
+        컬럼별 (중심, 척도)를 반환합니다. save_dataframe_as_html(cohort_stats=...)에 그대로 넘길 수 있습니다.
+        """
+        if self._cached_stats is None:
+            if self.robust:
+                self._cached_stats = {column: _median_mad(self._sorted_values[column]) for column in self.columns}
+            else:
+                self._cached_stats = {column: (self._totals[column].mean, self._totals[column].std)
+                                      for column in self.columns}
+        return self._cached_stats
+
+    def keys_near_boundary(self, old_stats, new_stats):
+        """
+        기준이 old_stats에서 new_stats로 바뀔 때 이상치 판정이 달라지는 값을 가진 키 집합을 반환합니다.
+        (규칙별 경계값 사이의 값만 이진 탐색으로 찾으며, 나머지 학생의 판정은 그대로입니다)
+        """
+        keys = set()
+        for column, (direction, z_threshold) in OUTLIER_RULES.items():
+            if column not in self.columns:
+                continue
+            bounds = [_boundary(stats.get(column), direction, z_threshold) for stats in (old_stats, new_stats)]
+            if any(math.isnan(bound) for bound in bounds):
+                keys.update(self._parts)
+                continue
+            low, high = min(bounds), max(bounds)
+            if low == high:
+                continue
+            # 부동소수점 비교 차이로 경계에 걸친 값을 놓치지 않도록 조금 넓혀 찾습니다.
+            finite = [abs(bound) for bound in bounds if math.isfinite(bound)]
+            margin = 1e-9 * max([1.0] + finite)
+            values = self._sorted_values[column]
+            start = np.searchsorted(values, low - margin, side="left")
+            end = np.searchsorted(values, high + margin, side="right")
+            # 후보 중 score_rows와 같은 식으로 계산한 판정이 실제로 바뀌는 값만 남깁니다.
+            candidates = values[start:end]
+            flipped = _is_outlier(candidates, old_stats[column], direction, z_threshold) != \
+                _is_outlier(candidates, new_stats[column], direction, z_threshold)
+            keys.update(self._sorted_keys[column][start:end][flipped].tolist())
+        return keys
+
+
+def _median_mad(sorted_values):
+    if len(sorted_values) == 0:
+        return 0.0, 0.0
+    median = float(np.median(sorted_values))
+    mad = float(np.median(np.abs(sorted_values - median)))
+    return median, MAD_SCALE * mad
+
+
+def _boundary(stats, direction, z_threshold):
+    """
+    Z-score 기준값에 해당하는 원래 값의 경계입니다. 척도가 0이면 Z-score가 모두 0이라 이상치가 없습니다.
+    """
+    if stats is None:
+        return math.nan
+    center, scale = stats
+    if scale == 0:
+        return -math.inf if direction == "<" else math.inf
+    return center + z_threshold * scale
+
+
+def _is_outlier(values, stats, direction, z_threshold):
+    z = z_scores(values, stats)
+    return z < z_threshold if direction == "<" else z > z_threshold
+
+
+def z_scores(values, stats=None):
+    """
+    모집단 표준편차 기준 Z-score를 반환합니다 (표준편차가 0이면 모두 0).
+    stats=(중심, 척도)가 주어지면 values 대신 그 값을 기준으로 사용합니다.
+    """
+    mean, std = stats if stats is not None else (np.mean(values), np.std(values))
+    if std != 0:
+        return (values - mean) / std
+    return np.zeros(len(values))
+
+
+def score_rows(df, cohort_stats=None):
+    """
+    파일별 행에 Z-score, 지표별 이상치 플래그, 이상치 개수와 '평가'(success/warning/fail)를 붙인 복사본을 반환합니다.
+    cohort_stats({컬럼: (중심, 척도)})가 없거나 컬럼이 빠져 있으면 df 자체의 평균/표준편차를 사용합니다.
+    """
+    cohort_stats = cohort_stats or {}
+    df = df.copy()
+
+    # '총 커밋 수'에 대한 Z-score 계산 및 이상치 플래그 생성
+    z_scores_commit = z_scores(df["총 커밋 수"].to_numpy(), cohort_stats.get("총 커밋 수"))
+    df["z_score_commit"] = np.round(z_scores_commit, 2)
+    df['commit_count_is_outlier'] = z_scores_commit < OUTLIER_RULES["총 커밋 수"][1]
+
+    # '평균 수정 라인 수'에 대한 Z-score 계산 및 이상치 플래그 생성
+    z_scores_changes = z_scores(df["평균 수정 라인 수"].to_numpy(dtype=float), cohort_stats.get("평균 수정 라인 수"))
+    df["z_score_changes"] = np.round(z_scores_changes, 2)
+    df['avg_changes_is_outlier'] = z_scores_changes > OUTLIER_RULES["평균 수정 라인 수"][1]
+
+    # 코드 유사도에 대한 이상치 플래그 생성
+    df['code_similarity_is_outlier'] = df['코드 유사도'].isna() | (df['코드 유사도'] < SIMILARITY_THRESHOLD)
+
+    # '코딩 시간'에 대한 Z-score 계산 및 이상치 플래그 생성
+    z_scores_minutes = z_scores(df["코딩 시간(분)"].to_numpy(), cohort_stats.get("코딩 시간(분)"))
+    df["z_score_minutes"] = np.round(z_scores_minutes, 2)
+    df['coding_minutes_is_outlier'] = z_scores_minutes < OUTLIER_RULES["코딩 시간(분)"][1]
+
+    # 새로운 평가 로직: 이상치 개수 기반
+    df['outlier_count'] = df['commit_count_is_outlier'].astype(int) + \
+                          df['avg_changes_is_outlier'].astype(int) + \
+                          df['code_similarity_is_outlier'].astype(int) + \
+                          df['coding_minutes_is_outlier'].astype(int)
+
+    df['평가'] = 'success'
+    df.loc[df['outlier_count'] >= 3, '평가'] = 'fail'
+    df.loc[(df['outlier_count'] >= 1) & (df['outlier_count'] < 3), '평가'] = 'warning'
+    return df
+
+
+class IncrementalScorer:
+    """
+    학생 결과가 하나씩 도착하거나 바뀔 때 코호트 기준을 누적 갱신하고,
+    판정(이상치 플래그/평가)이 바뀔 수 있는 학생 키를 알려 줍니다.
+
+    채점 결과는 따로 보관하지 않습니다. 보고서는 다시 만들 때 stats()의 현재 기준으로 채점하므로,
+    update가 돌려준 학생만 다시 만들면 플래그와 평가는 항상 현재 기준과 일치합니다.
+    다시 만들지 않은 학생 보고서의 Z-score 숫자는 마지막으로 만든 시점의 기준으로 계산된 값이라 조금 다를 수 있습니다.
+    """
+
+    def __init__(self, robust=False):
+        self.engine = CohortStatsEngine(robust=robust)
+
+    def update(self, key, df):
+        """
+        key의 행을 df로 바꾸고, 보고서를 다시 만들어야 하는 키 집합을 반환합니다 (key 자신 포함).
+        """
+        old_stats = self.engine.stats() if self.engine.keys() else {}
+        if df is None or df.empty:
+            self.engine.remove(key)
+            rescored = set()
+        else:
+            self.engine.update(key, df)
+            rescored = {key}
+        new_stats = self.engine.stats()
+        if old_stats:
+            rescored |= self.engine.keys_near_boundary(old_stats, new_stats)
+        return rescored
+
+    def stats(self):
+        return self.engine.stats()
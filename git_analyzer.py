@@ -1,11 +1,81 @@
-import requests
-import pandas as pd
-import time
 import re
 import os
 import subprocess
-import difflib
-from datetime import datetime, timedelta
+import threading
+import atexit
+import hashlib
+import shutil
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from urllib.parse import urlencode
+
+from rate_limiter import RateLimitScheduler, RateLimitError
+from response_cache import ResponseCache, CachedResponse
+from watermark_store import WatermarkStore, merge_rows
+import git_mirror
+import graphql_collector
+import instrumentation
+from prettier_worker import PrettierWorker, PrettierWorkerError
+from similarity import SimilarityEngine, score_pairs
+from week_config import load_week_range, load_week_ranges, union_window
+
+# requests/numpy/pandas는 사용하는 함수 안에서 불러옵니다 (import git_analyzer만으로는 불러오지 않음).
+# 보고서 프로세스나 cli.py의 가벼운 명령처럼 네트워크/집계를 쓰지 않는 곳이 그 비용을 치르지 않도록 하기 위함입니다.
+
+# GitHub 주소. 환경 변수 또는 configure_base_urls로 바꾸면 GitHub Enterprise나 로컬 모의 서버에 연결할 수 있습니다.
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_RAW_URL = os.environ.get("GITHUB_RAW_URL", "https://raw.githubusercontent.com").rstrip("/")
+
+
+def _graphql_url_for(api_url):
+    """
+    REST API 주소에 대응하는 GraphQL 주소를 만듭니다.
+    GitHub Enterprise의 REST 주소(https://host/api/v3)는 https://host/api/graphql, 그 외에는 "{api_url}/graphql"입니다.
+    """
+    if api_url == "https://api.github.com":
+        return graphql_collector.GRAPHQL_URL
+    if api_url.endswith("/api/v3"):
+        return f"{api_url[:-len('/v3')]}/graphql"
+    return f"{api_url}/graphql"
+
+
+# GITHUB_GRAPHQL_URL을 따로 주지 않으면 GITHUB_API_URL에서 만듭니다 (모의 서버/GitHub Enterprise에서도 같은 서버로 보내도록).
+GITHUB_GRAPHQL_URL = os.environ.get("GITHUB_GRAPHQL_URL") or _graphql_url_for(GITHUB_API_URL)
+
+# 커밋 상세 조회를 동시에 수행할 때 한 번에 진행할 최대 요청 수 (1이면 기존처럼 순차 처리)
+DEFAULT_DETAIL_CONCURRENCY = 1
+
+# 모든 GitHub 요청이 함께 쓰는 keep-alive Session과 커밋 상세 조회용 스레드 풀 (처음 사용할 때 만듦)
+# POOL_CONNECTIONS: 호스트(api, raw) 별 연결 풀 수, _pool_size: 호스트 하나에 유지할 최대 연결 수
+POOL_CONNECTIONS = 4
+_pool_size = 10
+_session = None
+_session_lock = threading.Lock()
+_executor = None
+_executor_size = 0
+_executor_lock = threading.Lock()
+
+# Prettier 포맷 결과 메모이즈 캐시 (코드 sha256 -> 포맷된 코드)
+FORMAT_CACHE_SIZE = 4096
+_format_cache = OrderedDict()
+_format_cache_lock = threading.Lock()
+
+# calculate_similarity가 사용하는 유사도 엔진 (기본값: 기존과 같은 문자 단위 비교)
+_similarity_engine = SimilarityEngine("char")
+
+# 실행 중 한 번만 띄우는 Prettier worker
+_prettier_worker = None
+_prettier_worker_disabled = False
+_prettier_worker_lock = threading.Lock()
+
+
+# analyze_commits 결과 컬럼 (값은 모두 구조화된 형태이며, 표시용 문자열 변환은 html_parser에서 수행)
+SUMMARY_COLUMNS = [
+    "이름", "user", "파일명", "url", "총 커밋 수", "최근 커밋일시", "상태",
+    "평균 수정 라인 수", "평균 추가 라인 수", "평균 삭제 라인 수", "코드 유사도", "코딩 시간(분)", "평가"
+]
 
 
 class RepoNotFoundError(ValueError):
@@ -16,12 +86,9 @@ class RepoPermissionError(PermissionError):
     pass
 
 
-def extract_repo_info(url, token=None):
+def _parse_repo_url(url):
     """
-    GitHub 저장소 URL을 파싱하고, GitHub API로 실제 존재/권한 여부를 즉시 검증합니다.
-    - 존재하지 않으면 RepoNotFoundError
-    - 권한/인증 문제면 RepoPermissionError
-    - 네트워크/기타 API 오류면 RuntimeError/ConnectionError
+    GitHub 저장소 URL에서 (owner, repo)를 추출합니다. 네트워크 요청은 하지 않습니다.
     """
     match = re.match(r"https://github\.com/([^/]+)/([^/]+)", url)
     if not match:
@@ -32,16 +99,29 @@ def extract_repo_info(url, token=None):
     repo = repo.rstrip("/")
     if repo.endswith(".git"):
         repo = repo[:-4]
+    return owner, repo
 
-    api_url = f"https://api.github.com/repos/{owner}/{repo}"
+
+def extract_repo_info(url, token=None):
+    """
+    GitHub 저장소 URL을 파싱하고, GitHub API로 실제 존재/권한 여부를 즉시 검증합니다.
+    - 존재하지 않으면 RepoNotFoundError
+    - 권한/인증 문제면 RepoPermissionError
+    - 네트워크/기타 API 오류면 RuntimeError/ConnectionError
+    """
+    owner, repo = _parse_repo_url(url)
+
+    api_url = f"{GITHUB_API_URL}/repos/{owner}/{repo}"
     headers = {
         "Accept": "application/vnd.github.v3+json"
     }
     if token:
         headers["Authorization"] = f"token {token}"
 
+    import requests
     try:
-        resp = requests.get(api_url, headers=headers, timeout=10)
+        with instrumentation.stage("repo_lookup"):
+            resp = _scheduler.get(api_url, headers=headers, timeout=10)
     except requests.RequestException as e:
         raise ConnectionError(f"GitHub API 연결 실패: {e}")
 
@@ -68,6 +148,175 @@ def extract_repo_info(url, token=None):
     return owner, repo
 
 
+def configure_base_urls(api_url=None, raw_url=None, graphql_url=None):
+    """
+    REST API, 파일 원본(raw), GraphQL 요청을 보낼 기본 주소를 바꿉니다.
+    graphql_url을 생략하고 api_url만 주면 그 주소에 대응하는 GraphQL 주소(_graphql_url_for)를 사용합니다.
+    """
+    global GITHUB_API_URL, GITHUB_RAW_URL, GITHUB_GRAPHQL_URL
+    if api_url:
+        GITHUB_API_URL = api_url.rstrip("/")
+        GITHUB_GRAPHQL_URL = graphql_url or _graphql_url_for(GITHUB_API_URL)
+    elif graphql_url:
+        GITHUB_GRAPHQL_URL = graphql_url
+    if raw_url:
+        GITHUB_RAW_URL = raw_url.rstrip("/")
+
+
+def _get_session():
+    """
+    모든 스레드가 함께 쓰는 keep-alive requests.Session을 반환합니다.
+    연결 풀 크기는 configure_http_pool로 정하며, 학생/스레드가 바뀌어도 같은 연결을 재사용합니다.
+    """
+    global _session
+    session = _session
+    if session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _new_session(_pool_size)
+            session = _session
+    return session
+
+
+def _new_session(pool_size):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _detail_executor(concurrency):
+    """
+    커밋 상세/파일 내용 조회에 쓰는 실행 중 하나뿐인 스레드 풀을 반환합니다.
+    학생마다 새로 만들지 않고, concurrency보다 작으면 그만큼 큰 풀로 한 번만 바꿉니다.
+    """
+    global _executor, _executor_size
+    with _executor_lock:
+        if _executor is None or _executor_size < concurrency:
+            old_executor = _executor
+            _executor_size = max(concurrency, _pool_size)
+            _executor = ThreadPoolExecutor(max_workers=_executor_size, thread_name_prefix="github-detail")
+            if old_executor is not None:
+                # 진행 중인 작업은 이전 풀에서 끝까지 실행됩니다.
+                old_executor.shutdown(wait=False)
+        return _executor
+
+
+def _bounded_map(fn, items, concurrency):
+    """
+    공유 스레드 풀(_detail_executor)에서 fn(item)을 실행하여 결과를 items 순서대로 돌려줍니다.
+    공유 풀은 여러 학생이 함께 쓰므로 풀 크기만으로는 학생별 동시 요청 수가 제한되지 않습니다.
+    그래서 이 호출이 풀에 넣어 둔 작업은 항상 concurrency개 이하가 되도록, 결과를 하나 받을 때마다 다음 작업을 넣습니다.
+    """
+    executor = _detail_executor(concurrency)
+    items = iter(items)
+    pending = deque(executor.submit(fn, item) for item in islice(items, concurrency))
+    while pending:
+        result = pending.popleft().result()
+        for item in islice(items, 1):
+            pending.append(executor.submit(fn, item))
+        yield result
+
+
+def configure_http_pool(max_requests):
+    """
+    동시에 보낼 수 있는 최대 요청 수(예: 동시 분석 학생 수 x 학생별 concurrency)에 맞추어
+    공유 Session의 연결 풀과 상세 조회 스레드 풀 크기를 정합니다.
+    """
+    from requests.adapters import HTTPAdapter
+
+    global _pool_size, _session
+    with _session_lock:
+        if max_requests > _pool_size:
+            _pool_size = max_requests
+            if _session is not None:
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=_pool_size)
+                _session.mount("https://", adapter)
+                _session.mount("http://", adapter)
+
+
+# 모든 GitHub 요청(api.github.com, raw.githubusercontent.com)이 거쳐 가는 중앙 스케줄러
+_scheduler = RateLimitScheduler(session_factory=_get_session)
+
+
+def get_scheduler():
+    return _scheduler
+
+
+def set_scheduler(scheduler):
+    """
+    GitHub 요청에 사용할 RateLimitScheduler를 교체합니다 (속도/재시도 설정 변경용).
+    """
+    global _scheduler
+    _scheduler = scheduler
+
+
+# 영구 응답 캐시 (configure_cache로 켜기 전에는 사용하지 않음)
+_cache = None
+
+
+def configure_cache(path=".github_cache.sqlite3", max_bytes=512 * 1024 * 1024):
+    """
+    GitHub 응답을 SQLite 파일에 캐싱하도록 설정하고 ResponseCache를 반환합니다.
+    path가 None이면 캐시를 끕니다. 이전 캐시와 종료 시점의 캐시는 모아 둔 사용 시각을 기록한 뒤 닫습니다.
+    """
+    global _cache
+    _close_cache()
+    _cache = ResponseCache(path, max_bytes=max_bytes) if path else None
+    return _cache
+
+
+@atexit.register
+def _close_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+
+def get_cache():
+    return _cache
+
+
+def _github_get(url, headers=None, params=None, immutable=False, **kwargs):
+    """
+    스케줄러를 거쳐 GET 요청을 보내되, 캐시가 켜져 있으면 캐시를 먼저 확인합니다.
+    - immutable=True: 캐시에 있으면 네트워크 요청 없이 그대로 사용합니다.
+    - 그 외: 저장된 ETag로 If-None-Match 재검증을 하고, 304면 캐시 본문을 사용합니다.
+    """
+    if _cache is None:
+        return _scheduler.get(url, headers=headers, params=params, **kwargs)
+
+    key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    cached = _cache.get(key)
+    if cached is not None:
+        body, etag, cached_immutable = cached
+        if cached_immutable:
+            instrumentation.record_cache("hit")
+            _cache.mark_hit(key)
+            return CachedResponse(body)
+        if etag:
+            headers = dict(headers or {})
+            headers["If-None-Match"] = etag
+
+    resp = _scheduler.get(url, headers=headers, params=params, **kwargs)
+    if resp.status_code == 304 and cached is not None:
+        instrumentation.record_cache("revalidated")
+        _cache.touch(key)
+        return CachedResponse(cached[0])
+    instrumentation.record_cache("miss")
+    _cache.mark_miss()
+    if resp.status_code == 200:
+        etag = resp.headers.get("ETag")
+        if immutable or etag:
+            _cache.put(key, resp.content, etag=etag, immutable=immutable)
+    return resp
+
+
 def calculate_result(count):
     if count == 1:
         return "fail"
@@ -77,22 +326,111 @@ def calculate_result(count):
         return "success"
 
 
-def fetch_loc(repo_owner, repo_name, branch, filename, headers):
-    raw_url = f"https://raw.githubusercontent.com/{repo_owner}/{repo_name}/{branch}/{filename}"
+def _count_loc(code):
+    return code.count("\n") + 1
+
+
+def fetch_raw_file(repo_owner, repo_name, branch, filename, headers):
+    """
+    raw.githubusercontent.com 에서 파일 내용을 받아 옵니다. 실패하면 None을 반환합니다.
+    """
+    raw_url = f"{GITHUB_RAW_URL}/{repo_owner}/{repo_name}/{branch}/{filename}"
     try:
-        resp = requests.get(raw_url, headers=headers)
+        resp = _github_get(raw_url, headers=headers)
         if resp.status_code == 200:
-            return resp.text.count("\n") + 1
-        else:
-            return None
+            return resp.text
+        return None
+    except RateLimitError:
+        raise
     except:
         return None
 
 
-def format_javascript_code(code_string: str) -> str:
+def fetch_file_contents(repo_owner, repo_name, branch, filenames, headers, concurrency=DEFAULT_DETAIL_CONCURRENCY):
     """
-    Prettier를 사용하여 JavaScript 코드를 포맷합니다.
-    (Node.js 설치 및 프로젝트 루트에 'npm install prettier' 필요)
+    저장소의 여러 파일 내용을 파일마다 한 번씩만 받아 {파일명: 내용} 으로 반환합니다.
+
+    1. Git Trees API(recursive)로 브랜치의 경로별 blob SHA를 한 번에 조회하고
+    2. 필요한 blob만 (concurrency가 2 이상이면 동시에) 받아 옵니다. blob은 SHA로 식별되므로 캐시에서 영구 재사용됩니다.
+    트리 조회에 실패하거나 트리에 없는 파일은 raw.githubusercontent.com 에서 받아 옵니다.
+    받지 못한 파일은 결과에 포함되지 않습니다.
+    """
+    filenames = list(dict.fromkeys(filenames))
+    if not filenames:
+        return {}
+
+    blob_shas = {}
+    tree_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/git/trees/{branch}"
+    try:
+        with instrumentation.stage("file_tree"):
+            resp = _github_get(tree_url, headers=headers, params={"recursive": 1})
+        if resp.status_code == 200:
+            tree = resp.json()
+            if not tree.get("truncated"):
+                blob_shas = {item["path"]: item["sha"] for item in tree.get("tree", []) if item.get("type") == "blob"}
+    except RateLimitError:
+        raise
+    except Exception:
+        blob_shas = {}
+
+    raw_headers = dict(headers or {})
+    raw_headers["Accept"] = "application/vnd.github.raw"
+
+    @instrumentation.propagate
+    def fetch_one(filename):
+        with instrumentation.stage("file_contents"):
+            return _fetch_one(filename)
+
+    def _fetch_one(filename):
+        sha = blob_shas.get(filename)
+        if sha is not None:
+            blob_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/git/blobs/{sha}"
+            try:
+                blob_res = _github_get(blob_url, headers=raw_headers, immutable=True)
+                if blob_res.status_code == 200:
+                    return blob_res.content.decode("utf-8", errors="replace")
+            except RateLimitError:
+                raise
+            except Exception:
+                pass
+        return fetch_raw_file(repo_owner, repo_name, branch, filename, headers)
+
+    if concurrency > 1:
+        bodies = list(_bounded_map(fetch_one, filenames, concurrency))
+    else:
+        bodies = [fetch_one(filename) for filename in filenames]
+
+    return {filename: body for filename, body in zip(filenames, bodies) if body is not None}
+
+
+def _node_modules_dir():
+    # Prettier 실행 파일과 같은 위치(프로젝트 루트의 node_modules)를 사용합니다.
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, "..", "node_modules")
+
+
+def _get_prettier_worker():
+    """
+    실행 중 한 번만 띄우는 Prettier worker를 반환합니다. 사용할 수 없으면 None.
+    """
+    global _prettier_worker, _prettier_worker_disabled
+    with _prettier_worker_lock:
+        if _prettier_worker_disabled:
+            return None
+        if _prettier_worker is None:
+            node_modules_dir = _node_modules_dir()
+            if not os.path.isdir(os.path.join(node_modules_dir, "prettier")) or not shutil.which("node"):
+                _prettier_worker_disabled = True
+                return None
+            _prettier_worker = PrettierWorker(node_modules_dir)
+            atexit.register(_prettier_worker.close)
+        return _prettier_worker
+
+
+def _format_with_prettier_cli(code_string: str) -> str:
+    """
+    Prettier 실행 파일을 호출 한 번마다 새로 실행하여 코드를 포맷합니다.
+    (Prettier worker를 사용할 수 없을 때의 대체 경로)
     """
     # Get the directory of the current Python script
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -129,127 +467,503 @@ def format_javascript_code(code_string: str) -> str:
         return code_string
 
 
+def format_javascript_codes(code_strings):
+    """
+    여러 JavaScript 코드를 Prettier로 포맷합니다.
+    - 결과는 코드 내용의 sha256 으로 메모이즈되어, 같은 코드(예: 로컬 기준 파일)는 실행 중 한 번만 포맷합니다.
+    - 캐시에 없는 코드는 상주하는 Prettier worker에 한 번에 보내고,
+      worker를 쓸 수 없으면 기존처럼 호출마다 Prettier를 실행합니다.
+    - 포맷에 실패한 코드는 원래 코드를 그대로 반환합니다.
+    """
+    code_strings = list(code_strings)
+    keys = [hashlib.sha256(code.encode("utf-8")).hexdigest() for code in code_strings]
+
+    results = {}
+    with _format_cache_lock:
+        for key in keys:
+            if key in _format_cache:
+                _format_cache.move_to_end(key)
+                results[key] = _format_cache[key]
+
+    pending = {}
+    for key, code in zip(keys, code_strings):
+        if key not in results:
+            pending.setdefault(key, code)
+
+    if pending:
+        with instrumentation.stage("prettier"):
+            formatted = _format_pending(pending)
+
+        with _format_cache_lock:
+            for key, text in zip(pending.keys(), formatted):
+                results[key] = text
+                _format_cache[key] = text
+                _format_cache.move_to_end(key)
+            while len(_format_cache) > FORMAT_CACHE_SIZE:
+                _format_cache.popitem(last=False)
+
+    return [results[key] for key in keys]
+
+
+def _format_pending(pending):
+    """
+    캐시에 없는 코드({sha256: 코드})를 worker(없으면 호출별 Prettier 실행)로 포맷하여 같은 순서의 목록으로 반환합니다.
+    """
+    formatted = None
+    worker = _get_prettier_worker()
+    if worker is not None:
+        try:
+            formatted = worker.format_many(pending.values())
+            formatted = [text if text is not None else code for text, code in zip(formatted, pending.values())]
+        except PrettierWorkerError as e:
+            print(f"⚠️ Prettier worker 오류, 호출별 실행으로 대체합니다: {e}")
+    if formatted is None:
+        formatted = [_format_with_prettier_cli(code) for code in pending.values()]
+    return formatted
+
+
+def format_javascript_code(code_string: str) -> str:
+    """
+    Prettier를 사용하여 JavaScript 코드를 포맷합니다.
+    (Node.js 설치 및 프로젝트 루트에 'npm install prettier' 필요)
+    """
+    return format_javascript_codes([code_string])[0]
+
+
+def set_similarity_engine(engine):
+    """
+    calculate_similarity가 사용할 SimilarityEngine을 교체합니다.
+    """
+    global _similarity_engine
+    _similarity_engine = engine
+
+
+def get_similarity_engine():
+    return _similarity_engine
+
+
 def calculate_similarity(local_code: str, remote_code: str) -> float:
     """
         포맷팅된 JavaScript 코드의 유사도를 계산합니다.
         """
     # 1. 비교할 두 코드를 먼저 포맷팅합니다.
     # Dart 포매터 대신 JavaScript 포매터를 사용합니다.
-    formatted_local_code = format_javascript_code(local_code)
-    formatted_remote_code = format_javascript_code(remote_code)
-
-    # 2. 포맷팅된 코드를 SequenceMatcher로 비교합니다.
-    matcher = difflib.SequenceMatcher(None, formatted_local_code, formatted_remote_code)
+    # (변하지 않는 로컬 기준 파일은 포맷 캐시 덕분에 실행 중 한 번만 포맷됩니다.)
+    formatted_local_code, formatted_remote_code = format_javascript_codes([local_code, remote_code])
 
-    # 3. 유사도 점수를 반환합니다.
-    return round(matcher.ratio() * 100, 2)
+    # 2. 포맷팅된 코드를 설정된 유사도 엔진(기본값: 문자 단위 SequenceMatcher)으로 비교하여
+    # 3. 0~100 점수를 반환합니다.
+    with instrumentation.stage("similarity"):
+        return _similarity_engine.score(formatted_local_code, formatted_remote_code)
 
 
-def fetch_similarity(repo_owner, repo_name, branch, filename, headers, local_base_dir="lib"):
+def _local_reference_path(filename, local_base_dir="lib"):
     # JS 파일 경로에 맞게 local_path 생성 (JS 파일은 'lib' 대신 'src'나 'js' 등의 디렉토리에 있을 수 있음)
     # 기존 코드에서는 'lib/' 디렉토리 하위로 가정하고 있습니다.
-    local_path = os.path.join(local_base_dir, filename[len(local_base_dir) + 1:])
+    # local_base_dir이 'lib/'처럼 슬래시로 끝나도 경로 앞부분을 올바르게 잘라냅니다.
+    base = local_base_dir.rstrip("/")
+    return os.path.join(base, filename[len(base) + 1:])
+
+
+def _read_local_reference(filename, local_base_dir="lib"):
+    """
+    제출 파일에 대응하는 로컬 기준 파일 내용을 반환합니다. 없거나 읽을 수 없으면 None.
+    """
+    local_path = _local_reference_path(filename, local_base_dir)
     if not os.path.exists(local_path):
         return None
     try:
         with open(local_path, "r", encoding="utf-8") as f:
-            local_code = f.read()
-        raw_url = f"https://raw.githubusercontent.com/{repo_owner}/{repo_name}/{branch}/{filename}"
-        resp = requests.get(raw_url, headers=headers)
-        if resp.status_code == 200:
-            remote_code = resp.text
-            return calculate_similarity(local_code, remote_code)
-        else:
-            return None
+            return f.read()
     except:
         return None
 
 
+def similarity_to_local(filename, remote_code, local_base_dir="lib"):
+    """
+    이미 받아 둔 제출 파일 내용(remote_code)과 로컬 기준 파일의 유사도를 계산합니다.
+    로컬 기준 파일이 없거나 읽을 수 없으면 None을 반환합니다.
+    """
+    local_code = _read_local_reference(filename, local_base_dir)
+    if local_code is None:
+        return None
+    try:
+        return calculate_similarity(local_code, remote_code)
+    except:
+        return None
+
+
+def score_cohort_similarity(results, directory="lib/", workers=None):
+    """
+    defer_similarity=True로 분석한 학생별 결과(DataFrame 목록)의 '코드 유사도'를 한 번에 계산하여 채웁니다.
+
+    모든 학생의 (기준 파일, 제출 파일) 쌍을 모아 Prettier 포맷을 한 번에 요청하고,
+    내용이 같은 쌍은 한 번만 계산하면서 workers개 프로세스에서 나누어 비교합니다(similarity.score_pairs).
+    점수는 학생별 (파일명 -> 점수)로 되돌려 넣으므로 결과는 학생별로 계산했을 때와 같습니다.
+    attrs["sources"]가 없는 결과(이미 유사도를 계산한 결과 등)는 그대로 둡니다.
+    """
+    references = {}
+    items = []  # (결과 위치, 파일명, 기준 코드, 제출 코드)
+    for position, df in enumerate(results):
+        sources = df.attrs.get("sources")
+        if not sources:
+            continue
+        for filename in df["파일명"].unique().tolist():
+            if filename not in references:
+                references[filename] = _read_local_reference(filename, directory)
+            if filename in sources and references[filename] is not None:
+                items.append((position, filename, references[filename], sources[filename]))
+    if not items:
+        return results
+
+    formatted = format_javascript_codes([code for item in items for code in item[2:]])
+    pairs = list(zip(formatted[0::2], formatted[1::2]))
+    with instrumentation.stage("similarity"):
+        scores = score_pairs(pairs, engine=_similarity_engine, workers=workers)
+
+    by_result = defaultdict(dict)
+    for (position, filename, _, _), score in zip(items, scores):
+        by_result[position][filename] = score
+    for position, df in enumerate(results):
+        if df.attrs.get("sources"):
+            df["코드 유사도"] = df["파일명"].map(by_result.get(position, {})).astype(float)
+    return results
+
+
 def calculate_duration(start_time, end_time):
     duration = end_time - start_time
     total_minutes = int(duration.total_seconds() / 60)
     return f"{total_minutes}분"
 
 
-def load_week_range(file_path="week_information.txt"):
-    with open(file_path, "r", encoding="utf-8") as f:
-        line = f.readline().strip()
-        label, start_str, end_str = line.split(",")
-        start = datetime.strptime(start_str.strip(), "%Y-%m-%d")
-        # end_str은 자정(00:00:00)을 의미하므로, 하루를 더해서 다음날 자정 직전(23:59:59)으로 간주합니다.
-        # 이렇게 하지 않으면 마지막 날에 커밋한 내용이 필터링되지 않을 수 있습니다.
-        end = datetime.strptime(end_str.strip(), "%Y-%m-%d") + timedelta(days=1, microseconds=-1)
-        return label, start, end
+def assign_weeks(df, week_ranges):
+    """
+    커밋-파일 행의 date(KST)가 속한 주차 라벨을 week_label 컬럼으로 붙이고, 어느 주차에도 속하지 않는 행은 버립니다.
+    주차 시작일 배열에 대한 searchsorted 한 번으로 모든 행을 나눕니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    labels = np.array([label for label, _, _ in week_ranges], dtype=object)
+    starts = np.array([start for _, start, _ in week_ranges], dtype="datetime64[us]")
+    ends = np.array([end for _, _, end in week_ranges], dtype="datetime64[us]")
+    order = np.argsort(starts, kind="stable")
+
+    dates = df["date"].to_numpy(dtype="datetime64[us]")
+    position = np.searchsorted(starts[order], dates, side="right") - 1
+    week_index = order[np.clip(position, 0, None)]
+    in_week = (position >= 0) & (dates <= ends[week_index])
+
+    df = df[in_week].copy()
+    # 주차 파일에 적힌 순서대로 정렬되도록 범주형으로 둡니다.
+    df["week_label"] = pd.Categorical(labels[week_index[in_week]], categories=list(dict.fromkeys(labels)))
+    return df
 
 
 def analyze_commits(github_url, token, username, directory="lib/", branch="main", start_date=None, end_date=None,
-                    exclude_first_commit=False, user_actual_name=None):
-    repo_owner, repo_name = extract_repo_info(github_url)
-    week_label, start_filter, end_filter = load_week_range()
+                    exclude_first_commit=False, user_actual_name=None,
+                    concurrency=DEFAULT_DETAIL_CONCURRENCY, incremental_store=None,
+                    backend="rest", mirror_root=".mirrors", remote_template=git_mirror.DEFAULT_REMOTE_TEMPLATE,
+                    collect_sources=False, commit_histories=None, collect_rows=False, week_ranges=None,
+                    defer_similarity=False):
+    """
+    GitHub 저장소에서 주차 범위 내 사용자의 커밋을 조회하여 파일별 요약 DataFrame을 반환합니다.
+
+    incremental_store(WatermarkStore)가 주어지면 이미 처리한 커밋은 상세 조회를 건너뛰고 새 커밋만 조회하여,
+    저장된 파일별 커밋 행에 병합한 뒤 다시 집계합니다.
+    backend="git"이면 REST API 대신 mirror_root 아래의 bare mirror clone(git fetch로 갱신)에서
+    커밋 통계와 파일 내용을 읽습니다 (incremental_store는 사용하지 않음).
+    backend="graphql"이면 주차 범위의 커밋 기록을 GraphQL로 조회하고(commit_histories에 prefetch_commit_histories로
+    미리 모아 둔 결과가 있으면 그것을 사용), 해당 커밋의 파일별 통계만 REST 상세 조회로 채웁니다.
+    collect_sources=True이면 제출 파일 내용을 결과의 attrs["sources"]({파일명: 코드})에 담아
+    학생 간 표절 검사(plagiarism.find_suspicious_pairs)에 사용할 수 있게 합니다.
+    collect_rows=True이면 집계 전 파일별 커밋 행(raw_data)을 attrs["rows"]에 담아
+    주차별 기록 저장소(history_store.HistoryStore)에 저장할 수 있게 합니다.
+    week_ranges(load_week_ranges 결과)를 주면 모든 주차를 포함하는 범위의 커밋을 한 번만 조회한 뒤
+    행을 주차별로 나누어 집계하고, 결과에 week_label 컬럼을 붙입니다.
+    defer_similarity=True이면 코드 유사도를 비워 두고 제출 파일 내용을 attrs["sources"]에 담아,
+    전체 학생을 모은 뒤 score_cohort_similarity로 한 번에 계산할 수 있게 합니다.
+    """
+    if week_ranges is not None:
+        start_filter, end_filter = union_window(week_ranges)
+    else:
+        week_label, start_filter, end_filter = load_week_range()
+
+    if backend == "git":
+        repo_owner, repo_name = _parse_repo_url(github_url)
+        with instrumentation.stage("mirror_fetch"):
+            mirror_path = git_mirror.ensure_mirror(repo_owner, repo_name, token, mirror_root=mirror_root,
+                                                   remote_template=remote_template)
+        with instrumentation.stage("commit_list"):
+            raw_data = git_mirror.fetch_commits_from_mirror(mirror_path, repo_owner, repo_name, branch, directory,
+                                                            start_filter, end_filter, username)
+        return _summarize_commits(raw_data, directory, username, exclude_first_commit, user_actual_name,
+                                  lambda filenames: git_mirror.read_files(
+                                      mirror_path, f"refs/heads/{branch}", filenames),
+                                  collect_sources=collect_sources, collect_rows=collect_rows,
+                                  week_ranges=week_ranges, defer_similarity=defer_similarity)
+    elif backend == "graphql":
+        repo_owner, repo_name = _parse_repo_url(github_url)
+        headers = _rest_headers(token)
+        repo_key = (repo_owner, repo_name, branch)
+        if commit_histories is None or repo_key not in commit_histories:
+            with instrumentation.stage("commit_list"):
+                commit_histories = graphql_collector.collect_histories(
+                    [repo_key], _kst_to_utc_iso(start_filter), _kst_to_utc_iso(end_filter), directory.rstrip("/"),
+                    _graphql_post(token))
+        nodes = commit_histories[repo_key]
+        if nodes is None:
+            raise RepoNotFoundError(f"존재하지 않는 저장소(또는 브랜치)입니다: {repo_owner}/{repo_name} ({branch}). URL을 확인하세요.")
+        base_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/commits"
+        raw_data = _raw_data_from_history(nodes, base_url, headers, directory, start_filter, end_filter, username,
+                                          concurrency)
+        return _summarize_commits(raw_data, directory, username, exclude_first_commit, user_actual_name,
+                                  lambda filenames: fetch_file_contents(repo_owner, repo_name, branch, filenames,
+                                                                        headers, concurrency=concurrency),
+                                  collect_sources=collect_sources, collect_rows=collect_rows,
+                                  week_ranges=week_ranges, defer_similarity=defer_similarity)
+    elif backend != "rest":
+        raise ValueError(f"지원하지 않는 backend입니다: {backend} (rest, git 또는 graphql)")
+
+    repo_owner, repo_name = extract_repo_info(github_url, token)
+
+    base_url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/commits"
+    headers = _rest_headers(token)
+
+    state = None
+    if incremental_store is not None:
+        store_key = WatermarkStore.make_key(repo_owner, repo_name, branch, username, directory,
+                                            start_filter, end_filter)
+        state = incremental_store.load(store_key)
+
+    # 주차 범위와 디렉토리를 서버 측에서 먼저 걸러 불필요한 목록/상세 조회를 줄입니다.
+    window_params = {
+        "since": _kst_to_utc_iso(start_filter),
+        "until": _kst_to_utc_iso(end_filter),
+        "path": directory.rstrip("/"),
+    }
 
-    base_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/commits"
-    headers = {
+    watermark = {}
+    known_shas = set()
+    if state is not None:
+        # 증분 모드: 주차 범위 전체의 목록을 다시 조회하되, 이미 처리한 커밋은 상세 조회 없이 건너뛰고
+        # 새 커밋의 행만 저장된 행에 병합합니다. 병합(merge)으로 들어온 브랜치 커밋은 committer 날짜가
+        # 워터마크보다 오래되었을 수 있으므로, since를 워터마크로 올리거나 이전 최신 커밋에서 멈추지 않습니다.
+        mode = state["mode"]
+        known_shas = _known_shas(state)
+        params = {"per_page": 100, **window_params}
+        if mode == "author":
+            params["author"] = username
+        new_rows = _fetch_commits(base_url, headers, params, directory, start_filter, end_filter, username,
+                                  concurrency=concurrency, watermark=watermark, known_shas=known_shas)
+        print(f"♻️ 증분 분석: 새 커밋 행 {len(new_rows)}개를 저장된 {len(state['rows'])}개 행에 병합합니다.")
+        raw_data = merge_rows(state["rows"], new_rows)
+        if not watermark:
+            watermark = {"sha": state["newest_sha"], "date": state["newest_date"]}
+    else:
+        # 1차 시도: GitHub username으로 검색
+        mode = "author"
+        params = {
+            "per_page": 100,
+            "author": username,
+            **window_params
+        }
+        raw_data = _fetch_commits(base_url, headers, params, directory, start_filter, end_filter, username,
+                                  concurrency=concurrency, watermark=watermark, known_shas=known_shas)
+
+        # 2차 시도: 1차 시도에서 결과가 없으면 전체 커밋을 가져와 commit author 이름으로 필터링
+        if not raw_data:
+            print(f"⚠️ GitHub username '{username}'으로 커밋을 찾을 수 없습니다. Git commit author 이름으로 재시도합니다.")
+            mode = "name"
+            watermark = {}
+            known_shas = set()
+            params = {"per_page": 100, **window_params}  # author 필터 제거
+            raw_data = _fetch_commits(base_url, headers, params, directory, start_filter, end_filter, username,
+                                      concurrency=concurrency, watermark=watermark, known_shas=known_shas)
+
+    if incremental_store is not None and raw_data and watermark:
+        incremental_store.save(store_key, mode, watermark["sha"], watermark["date"], raw_data, known_shas=known_shas)
+
+    return _summarize_commits(raw_data, directory, username, exclude_first_commit, user_actual_name,
+                              lambda filenames: fetch_file_contents(repo_owner, repo_name, branch, filenames,
+                                                                    headers, concurrency=concurrency),
+                              collect_sources=collect_sources, collect_rows=collect_rows,
+                              week_ranges=week_ranges, defer_similarity=defer_similarity)
+
+
+def _known_shas(state):
+    """
+    워터마크 상태에서 이미 처리한 커밋 SHA 집합을 꺼냅니다.
+    known_shas가 없는 예전 상태 파일은 저장된 행의 커밋 URL(.../commit/<sha>)로 대신합니다.
+    """
+    if state.get("known_shas") is not None:
+        return set(state["known_shas"])
+    return {row["url"].rsplit("/", 1)[-1] for row in state["rows"] if row.get("url")}
+
+
+def _rest_headers(token):
+    return {
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json"
     }
 
-    # 1차 시도: GitHub username으로 검색
-    params = {
-        "per_page": 100,
-        "author": username
-    }
-    raw_data = _fetch_commits(base_url, headers, params, directory, start_filter, end_filter, username)
 
-    # 2차 시도: 1차 시도에서 결과가 없으면 전체 커밋을 가져와 commit author 이름으로 필터링
-    if not raw_data:
-        print(f"⚠️ GitHub username '{username}'으로 커밋을 찾을 수 없습니다. Git commit author 이름으로 재시도합니다.")
-        params = {"per_page": 100}  # author 필터 제거
-        raw_data = _fetch_commits(base_url, headers, params, directory, start_filter, end_filter, username)
+def _graphql_post(token):
+    """
+    GraphQL 쿼리를 스케줄러를 거쳐 보내는 함수(graphql_collector.collect_histories 의 post 인자)를 만듭니다.
+    """
+    headers = {"Authorization": f"bearer {token}"}
 
-    if not raw_data:
-        print(f"⚠️ No commits found in directory '{directory}' for user '{username}' in selected week.")
-        return pd.DataFrame()
+    def post(query, variables):
+        resp = _scheduler.request("POST", GITHUB_GRAPHQL_URL, headers=headers,
+                                  json={"query": query, "variables": variables})
+        if resp.status_code != 200:
+            raise graphql_collector.GraphQLError(f"GitHub GraphQL 요청 실패 (status {resp.status_code})")
+        return resp.json()
 
-    df = pd.DataFrame(raw_data)
+    return post
 
-    if exclude_first_commit:
-        df["rank"] = df.groupby("filename")["date"].rank(method="first")
-        df = df[~((df["rank"] == 1) & (df.groupby("filename")["filename"].transform("count") > 1))]
-        df.drop(columns=["rank"], inplace=True)
 
-    grouped_time = df.groupby("filename").agg(
-        first_date=("date", "min"),
-        last_date=("date", "max")
-    ).reset_index()
-    grouped_time["코딩 시간"] = grouped_time.apply(lambda row: calculate_duration(row["first_date"], row["last_date"]),
-                                               axis=1)
+def prefetch_commit_histories(accounts, branch="main", directory="lib/",
+                              batch_size=graphql_collector.DEFAULT_BATCH_SIZE, week_ranges=None):
+    """
+    여러 학생 저장소의 주차 범위 커밋 기록을 GraphQL 별칭 쿼리로 한꺼번에 모읍니다.
+    같은 토큰을 쓰는 저장소끼리 batch_size개씩 한 쿼리로 묶습니다.
 
-    latest_info = df.sort_values("date").groupby("filename").last().reset_index()
+    accounts: (github_url, token) 목록
+    week_ranges가 주어지면 모든 주차를 포함하는 범위를 조회합니다.
+    반환값: analyze_commits(backend="graphql", commit_histories=...)에 넘길 dict
+    """
+    if week_ranges is not None:
+        start_filter, end_filter = union_window(week_ranges)
+    else:
+        _, start_filter, end_filter = load_week_range()
+    repos_by_token = defaultdict(list)
+    for github_url, token in accounts:
+        owner, repo = _parse_repo_url(github_url)
+        repos_by_token[token].append((owner, repo, branch))
+
+    histories = {}
+    for token, repos in repos_by_token.items():
+        histories.update(graphql_collector.collect_histories(
+            repos, _kst_to_utc_iso(start_filter), _kst_to_utc_iso(end_filter), directory.rstrip("/"),
+            _graphql_post(token), batch_size=batch_size))
+    return histories
 
-    summary = df.groupby("filename").agg(
-        user=("user", "first"),
-        date=("date", "max"),
+
+def _raw_data_from_history(nodes, base_url, headers, directory, start_filter, end_filter, username, concurrency):
+    """
+    GraphQL 커밋 노드 중 사용자의 주차 범위 커밋을 골라 파일별 raw_data 행으로 바꿉니다.
+    GraphQL은 커밋의 파일별 통계를 제공하지 않으므로, 고른 커밋만 REST 상세 조회(SHA 기준 영구 캐시)로 채웁니다.
+    """
+    in_window = [node for node in nodes if start_filter <= _to_kst(node["authoredDate"]) <= end_filter]
+    matched = _select_user_commits(in_window, username,
+                                   lambda node: ((node.get("author") or {}).get("user") or {}).get("login"),
+                                   lambda node: (node.get("author") or {}).get("name"))
+
+    detail_urls = [f"{base_url}/{node['oid']}" for node in matched]
+    if concurrency > 1:
+        details = list(_bounded_map(instrumentation.propagate(lambda url: _fetch_commit_detail(url, headers)),
+                                    detail_urls, concurrency))
+    else:
+        details = list(_iter_details_sequentially(detail_urls, headers))
+
+    raw_data = []
+    for detail in details:
+        if detail is not None:
+            raw_data.extend(_parse_commit_detail(detail, directory, start_filter, end_filter, username))
+    return raw_data
+
+
+def _select_user_commits(commits, username, login_of, name_of):
+    """
+    커밋 목록에서 사용자의 커밋만 고릅니다. (REST 흐름과 동일한 2단계 규칙)
+    1차: GitHub username(로그인, login_of)이 같은 커밋, 1차 결과가 없으면 2차: commit author 이름(name_of)이 같은 커밋
+    """
+    matched = [commit for commit in commits if login_of(commit) == username]
+    if not matched:
+        matched = [commit for commit in commits if name_of(commit) == username]
+    return matched
+
+
+def aggregate_commit_rows(df, exclude_first_commit=False, keys=("user", "filename")):
+    """
+    커밋-파일 행(user, date, filename, total_changes, additions, deletions, status, url)을
+    keys(기본값: user, filename)별 요약 행으로 집계합니다.
+
+    한 번 정렬한 뒤 groupby 집계 한 번과 벡터 연산만 사용하므로,
+    여러 학생의 행을 한꺼번에 넣어도 학생별로 따로 호출한 것과 같은 결과가 나옵니다.
+    keys에 week_label을 넣으면 주차별로 따로 실행한 것과 같은 결과를 한 번에 얻습니다.
+    """
+    keys = list(keys)
+    # 같은 시각의 커밋은 수집 순서를 유지하도록 안정 정렬을 사용합니다.
+    df = df.sort_values(keys + ["date"], kind="mergesort", ignore_index=True)
+
+    if exclude_first_commit:
+        # 커밋이 2개 이상인 파일의 첫 커밋(파일 생성 커밋)은 제외합니다.
+        same_as_prev = (df[keys] == df[keys].shift(1)).all(axis=1)
+        same_as_next = (df[keys] == df[keys].shift(-1)).all(axis=1)
+        df = df[same_as_prev | ~same_as_next]
+
+    summary = df.groupby(keys, sort=False, observed=True).agg(
+        first_date=("date", "first"),
+        date=("date", "last"),
         total_changes_mean=("total_changes", "mean"),
         additions_mean=("additions", "mean"),
         deletions_mean=("deletions", "mean"),
-        commit_count=("filename", "count")
+        commit_count=("date", "size"),
+        status=("status", "last"),
+        url=("url", "last"),
     ).reset_index()
+    summary["coding_minutes"] = ((summary["date"] - summary["first_date"]).dt.total_seconds() // 60).astype(int)
+    return summary.drop(columns=["first_date"])
+
 
-    summary = summary.merge(latest_info[["filename", "status", "url"]], on="filename", how="left")
-    summary = summary.merge(grouped_time[["filename", "코딩 시간"]], on="filename", how="left")
+def _summarize_commits(raw_data, directory, username, exclude_first_commit, user_actual_name, content_loader,
+                       collect_sources=False, collect_rows=False, week_ranges=None, defer_similarity=False):
+    """
+    파일별 커밋 행(raw_data)을 파일별 요약 DataFrame으로 집계합니다.
+    content_loader(파일명 목록 -> {파일명: 내용})로 각 파일을 한 번만 받아 두고,
+    LOC와 코드 유사도를 모두 그 내용으로 계산합니다.
+    week_ranges가 주어지면 행을 주차별로 나누어 (주차, 파일)별로 집계하고 week_label 컬럼을 맨 앞에 붙입니다.
+    파일 내용과 유사도는 주차와 상관없이 파일마다 한 번만 계산합니다.
+    defer_similarity=True이면 유사도는 비워 두고(NaN) 파일 내용을 attrs["sources"]에 담습니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not raw_data:
+        print(f"⚠️ No commits found in directory '{directory}' for user '{username}' in selected week.")
+        return pd.DataFrame()
 
-    summary["loc"] = summary["filename"].apply(lambda f: fetch_loc(repo_owner, repo_name, branch, f, headers))
+    df = pd.DataFrame(raw_data)
+    keys = ["user", "filename"]
+    if week_ranges is not None:
+        df = assign_weeks(df, week_ranges)
+        if df.empty:
+            print(f"⚠️ No commits found in directory '{directory}' for user '{username}' in selected weeks.")
+            return pd.DataFrame()
+        keys = ["user", "week_label", "filename"]
+
+    with instrumentation.stage("aggregate"):
+        summary = aggregate_commit_rows(df, exclude_first_commit=exclude_first_commit, keys=keys)
+
+    filenames = summary["filename"].unique().tolist()
+    sources = content_loader(filenames)
+    summary["loc"] = summary["filename"].map({f: _count_loc(sources[f]) for f in filenames if f in sources})
     summary = summary[summary["loc"].notnull()]
     summary["loc"] = summary["loc"].astype(int)
 
-    summary["code_similarity"] = summary["filename"].apply(
-        lambda f: fetch_similarity(repo_owner, repo_name, branch, f, headers, directory)) # local_base_dir을 directory 변수로 설정
-    summary["date"] = pd.to_datetime(summary["date"]).dt.strftime("%Y-%m-%d %H:%M")
+    if defer_similarity:
+        summary["code_similarity"] = np.nan
+    else:
+        similarities = {f: similarity_to_local(f, sources[f], directory)  # local_base_dir을 directory 변수로 설정
+                        for f in summary["filename"].unique().tolist()}
+        summary["code_similarity"] = summary["filename"].map(similarities).astype(float)
+    # 분 단위까지만 비교/표시하므로 최근 커밋일시를 분 단위로 내립니다. (문자열 변환은 보고서 렌더링 단계에서 수행)
+    summary["date"] = pd.to_datetime(summary["date"]).dt.floor("min")
     summary["result"] = summary["commit_count"].apply(calculate_result)
 
-    summary["파일명 (총 커밋 수)"] = summary.apply(
-        lambda row: f'<a href="{row["url"]}" target="_blank">{row["filename"]} ({row["commit_count"]})</a>', axis=1)
-
     summary = summary.round({
         "total_changes_mean": 2,
         "additions_mean": 2,
@@ -257,42 +971,190 @@ def analyze_commits(github_url, token, username, directory="lib/", branch="main"
         "code_similarity": 2
     })
 
-    summary["평균 수정 라인 수 (+/-)"] = summary.apply(
-        lambda row: f'{row["total_changes_mean"]} ({row["additions_mean"]}/{row["deletions_mean"]})', axis=1
-    )
-
-    summary.drop(columns=["filename", "url", "commit_count", "total_changes_mean", "additions_mean", "deletions_mean", "loc"],
-                 inplace=True)
-
     # 실제 이름이 있으면 'user' 컬럼 앞에 '이름' 컬럼 추가
     if user_actual_name:
         summary.insert(0, "이름", user_actual_name)
 
-    summary.rename(columns={
+    summary = summary.rename(columns={
+        "filename": "파일명",
+        "commit_count": "총 커밋 수",
         "date": "최근 커밋일시",
         "status": "상태",
+        "total_changes_mean": "평균 수정 라인 수",
+        "additions_mean": "평균 추가 라인 수",
+        "deletions_mean": "평균 삭제 라인 수",
         "code_similarity": "코드 유사도",
+        "coding_minutes": "코딩 시간(분)",
         "result": "평가"
-    }, inplace=True)
-
-    # '이름' 컬럼이 있는 경우에만 순서 조정
-    if "이름" in summary.columns:
-        summary = summary[[
-            "이름", "user", "파일명 (총 커밋 수)", "최근 커밋일시", "상태",
-            "평균 수정 라인 수 (+/-)", "코드 유사도", "코딩 시간", "평가"
-        ]]
-    else:
-        summary = summary[[
-            "user", "파일명 (총 커밋 수)", "최근 커밋일시", "상태",
-            "평균 수정 라인 수 (+/-)", "코드 유사도", "코딩 시간", "평가"
-        ]]
+    })
 
+    # '이름' 컬럼이 있는 경우에만 포함
+    columns = SUMMARY_COLUMNS if "이름" in summary.columns else SUMMARY_COLUMNS[1:]
+    if week_ranges is not None:
+        summary = summary.sort_values("week_label", kind="stable")
+        summary["week_label"] = summary["week_label"].astype(str)
+        columns = ["week_label"] + columns
+    summary = summary[columns].reset_index(drop=True)
+
+    if collect_sources or defer_similarity:
+        summary.attrs["sources"] = {f: sources[f] for f in summary["파일명"].unique()}
+    if collect_rows:
+        # 여러 주차를 분석했으면 행마다 week_label이 붙어 있습니다.
+        summary.attrs["rows"] = raw_data if week_ranges is None else df.assign(
+            week_label=df["week_label"].astype(str)).to_dict("records")
     return summary
 
 
-def _fetch_commits(base_url, headers, params, directory, start_filter, end_filter, username):
+def summarize_commit_rows(raw_data, username, content_loader, directory="lib/", exclude_first_commit=False,
+                          user_actual_name=None, collect_sources=False, week_ranges=None):
+    """
+    이미 가지고 있는 파일별 커밋 행(raw_data)을 analyze_commits 와 같은 형식의 요약 DataFrame으로 집계합니다.
+    content_loader(파일명 목록 -> {파일명: 내용})로 LOC와 코드 유사도에 쓸 파일 내용을 받아 옵니다.
+    (webhook_daemon처럼 커밋 목록을 다시 조회하지 않고 행만 갱신하는 경우에 사용)
+    """
+    return _summarize_commits(raw_data, directory, username, exclude_first_commit, user_actual_name, content_loader,
+                              collect_sources=collect_sources, week_ranges=week_ranges)
+
+
+def rows_from_push_payload(payload, username, start_filter, end_filter, directory="lib/", detail_loader=None):
+    """
+    GitHub push 웹훅 payload의 커밋/변경 파일 목록을 raw_data 행 목록으로 변환합니다.
+
+    push payload에는 파일별 추가/삭제 라인 수가 없으므로, detail_loader(커밋 SHA -> 커밋 상세 JSON 또는 None)가
+    주어지면 커밋 상세 정보로 행을 만들고(REST 조회와 같은 결과), 없거나 실패하면 payload의 파일 목록만으로
+    라인 수 0인 행을 만듭니다. 삭제된 파일과 주차 범위 밖의 커밋은 REST 조회와 마찬가지로 제외합니다.
+    협업자의 커밋이나 병합된 upstream 커밋은 REST 흐름과 같은 2단계 규칙(author.username, 없으면 author.name)으로 걸러내고,
+    커밋 상세 정보를 받았으면 그 작성자(author.login 또는 commit.author.name)도 사용자와 같은지 한 번 더 확인합니다.
+    """
+    in_window = [commit for commit in payload.get("commits", [])
+                 if start_filter <= _to_kst(commit["timestamp"]) <= end_filter]
+    matched = _select_user_commits(in_window, username,
+                                   lambda commit: (commit.get("author") or {}).get("username"),
+                                   lambda commit: (commit.get("author") or {}).get("name"))
+
+    rows = []
+    for commit in matched:
+        date = _to_kst(commit["timestamp"])
+        detail = detail_loader(commit["id"]) if detail_loader is not None else None
+        if detail is not None:
+            if _detail_author_matches(detail, username):
+                rows.extend(_parse_commit_detail(detail, directory, start_filter, end_filter, username))
+            continue
+
+        for status, filepaths in (("added", commit.get("added", [])), ("modified", commit.get("modified", []))):
+            for filepath in filepaths:
+                if filepath.startswith(directory) and filepath.endswith(".js"):
+                    rows.append({
+                        "user": username,
+                        "date": date,
+                        "filename": filepath,
+                        "total_changes": 0,
+                        "additions": 0,
+                        "deletions": 0,
+                        "status": status,
+                        "url": commit.get("url")
+                    })
+    return rows
+
+
+def _to_kst(date_raw):
+    """
+    GitHub의 UTC 시각 문자열('2025-10-30T01:02:03Z')을 KST(naive datetime)로 변환합니다.
+    웹훅 payload처럼 시간대가 붙은 시각('2025-10-30T10:02:03+09:00')도 받습니다.
+    """
+    if date_raw.endswith("Z"):
+        utc_date = datetime.strptime(date_raw, "%Y-%m-%dT%H:%M:%SZ")
+    else:
+        utc_date = datetime.fromisoformat(date_raw).astimezone(timezone.utc).replace(tzinfo=None)
+    return utc_date + timedelta(hours=9)
+
+
+def _kst_to_utc_iso(date):
+    """
+    KST(naive datetime)를 GitHub API 파라미터용 UTC 시각 문자열로 변환합니다.
+    """
+    return (date - timedelta(hours=9)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _list_author_date(commit):
+    """
+    커밋 목록 응답에 포함된 author 날짜(KST)를 반환합니다. 없으면 None.
+    """
+    date_raw = commit.get("commit", {}).get("author", {}).get("date")
+    return _to_kst(date_raw) if date_raw else None
+
+
+def _parse_commit_detail(detail, directory, start_filter, end_filter, username):
+    """
+    커밋 상세 응답(JSON)을 raw_data 행 목록으로 변환합니다.
+    주차 범위를 벗어난 커밋이면 빈 목록을 반환합니다.
+    """
+    date = _to_kst(detail["commit"]["author"]["date"])
+
+    if not (start_filter <= date <= end_filter):
+        return []
+
+    html_url = detail.get("html_url")
+
+    rows = []
+    for f in detail.get("files", []):
+        filepath = f["filename"]
+        status = f.get("status", "")
+
+        # **JS 파일만 분석하도록 조건 변경 (.dart -> .js)**
+        if filepath.startswith(directory) and filepath.endswith(".js") and status != "removed":
+            rows.append({
+                "user": username,
+                "date": date,
+                "filename": filepath,
+                "total_changes": f.get("changes", 0),
+                "additions": f.get("additions", 0),
+                "deletions": f.get("deletions", 0),
+                "status": status,
+                "url": html_url
+            })
+    return rows
+
+
+def _detail_author_matches(detail, username):
+    """
+    커밋 상세 응답의 작성자가 사용자인지 확인합니다. (GitHub 로그인 또는 commit author 이름)
+    """
+    login = (detail.get("author") or {}).get("login")
+    name = detail.get("commit", {}).get("author", {}).get("name")
+    return username in (login, name)
+
+
+def _fetch_commit_detail(detail_url, headers):
+    """
+    커밋 하나의 상세 정보를 조회합니다. 실패하면 None을 반환합니다.
+    """
+    # SHA로 식별되는 커밋 상세 정보는 바뀌지 않으므로 캐시에서 영구히 재사용합니다.
+    with instrumentation.stage("commit_detail"):
+        detail_res = _github_get(detail_url, headers=headers, immutable=True)
+    if detail_res.status_code != 200:
+        return None
+    return detail_res.json()
+
+
+def fetch_commit_detail(repo_owner, repo_name, sha, headers):
+    """
+    커밋 SHA 하나의 상세 정보(파일별 추가/삭제 라인 수 포함)를 조회합니다. 실패하면 None을 반환합니다.
+    """
+    return _fetch_commit_detail(f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/commits/{sha}", headers)
+
+
+def _fetch_commits(base_url, headers, params, directory, start_filter, end_filter, username,
+                   concurrency=DEFAULT_DETAIL_CONCURRENCY, watermark=None, known_shas=None):
     """
     내부에서 재사용되는 커밋 데이터 추출 함수
+
+    concurrency가 2 이상이면 각 페이지의 커밋 상세 정보를 공유 스레드 풀에서 최대 concurrency개씩(_bounded_map)
+    동시에 조회합니다. 결과 행의 순서는 순차 처리와 동일합니다.
+    known_shas(set)가 주어지면 그 안의 커밋은 상세 조회를 건너뛰고, 상세 조회에 성공한 커밋의 SHA를 추가합니다.
+    목록 단계의 author 날짜가 주차 범위를 벗어난 커밋은 상세 조회를 생략하고,
+    한 페이지의 커밋이 모두 주차 시작 이전이면 더 이상 페이지를 넘기지 않습니다.
+    watermark(dict)가 주어지면 목록의 가장 최신 커밋 {"sha", "date"}(UTC 문자열)를 채워 넣습니다.
     """
     raw_data = []
     page = 1
@@ -302,8 +1164,11 @@ def _fetch_commits(base_url, headers, params, directory, start_filter, end_filte
 
     while True:
         params["page"] = page
-        res = requests.get(base_url, headers=headers, params=params)
+        with instrumentation.stage("commit_list"):
+            res = _github_get(base_url, headers=headers, params=params)
 
+        # rate limit은 스케줄러가 기다렸다가 재시도하며, 끝내 실패하면 RateLimitError가 발생하여
+        # 해당 학생이 조용히 누락되지 않고 오류로 보고됩니다.
         if res.status_code != 200:
             print(f"❌ 커밋 조회 실패 (status code: {res.status_code})")
             return []
@@ -312,46 +1177,51 @@ def _fetch_commits(base_url, headers, params, directory, start_filter, end_filte
         if not commits:
             break
 
-        for commit in commits:
+        if watermark is not None and not watermark:
+            newest = commits[0]
+            commit_info = newest.get("commit", {})
+            newest_date = (commit_info.get("committer") or commit_info.get("author") or {}).get("date")
+            watermark.update({"sha": newest["sha"], "date": newest_date})
+
+        detail_shas = []
+        list_dates = [_list_author_date(commit) for commit in commits]
+        for commit, list_date in zip(commits, list_dates):
+            # 상세 응답의 날짜와 같은 값이므로, 범위 밖이면 상세 조회 없이 건너뛰어도 결과가 같습니다.
+            if list_date is not None and not (start_filter <= list_date <= end_filter):
+                continue
+
             # name_filter가 true이면 커밋 author 이름을 확인
             if name_filter:
                 commit_author_name = commit.get("commit", {}).get("author", {}).get("name", "")
                 if commit_author_name != username:
                     continue
-
-            sha = commit["sha"]
-            detail_url = f"{base_url}/{sha}"
-            detail_res = requests.get(detail_url, headers=headers)
-            if detail_res.status_code != 200:
-                continue
-
-            detail = detail_res.json()
-            date_raw = detail["commit"]["author"]["date"]
-            utc_date = datetime.strptime(date_raw, "%Y-%m-%dT%H:%M:%SZ")
-            date = utc_date + timedelta(hours=9)
-
-            if not (start_filter <= date <= end_filter):
+            if known_shas is not None and commit["sha"] in known_shas:
                 continue
+            detail_shas.append(commit["sha"])
+        detail_urls = [f"{base_url}/{sha}" for sha in detail_shas]
 
-            html_url = detail.get("html_url")
-
-            for f in detail.get("files", []):
-                filepath = f["filename"]
-                status = f.get("status", "")
+        if concurrency > 1:
+            details = _bounded_map(instrumentation.propagate(lambda url: _fetch_commit_detail(url, headers)),
+                                   detail_urls, concurrency)
+        else:
+            details = _iter_details_sequentially(detail_urls, headers)
+
+        for sha, detail in zip(detail_shas, details):
+            if detail is not None:
+                raw_data.extend(_parse_commit_detail(detail, directory, start_filter, end_filter, username))
+                if known_shas is not None:
+                    known_shas.add(sha)
+        if all(d is not None and d < start_filter for d in list_dates):
+            break
+        page += 1
+    return raw_data
 
-                # **JS 파일만 분석하도록 조건 변경 (.dart -> .js)**
-                if filepath.startswith(directory) and filepath.endswith(".js") and status != "removed":
-                    raw_data.append({
-                        "user": username,
-                        "date": date,
-                        "filename": filepath,
-                        "total_changes": f.get("changes", 0),
-                        "additions": f.get("additions", 0),
-                        "deletions": f.get("deletions", 0),
-                        "status": status,
-                        "url": html_url
-                    })
 
-            time.sleep(0.2)
-        page += 1
-    return raw_data
\ No newline at end of file
+def _iter_details_sequentially(detail_urls, headers):
+    """
+    커밋 상세 정보를 하나씩 조회합니다. 요청 간격은 RateLimitScheduler가 맞추므로 따로 쉬지 않습니다.
+    """
+    for detail_url in detail_urls:
+        detail = _fetch_commit_detail(detail_url, headers)
+        if detail is not None:
+            yield detail
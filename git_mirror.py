@@ -0,0 +1,199 @@
+import base64
+import os
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+# 미러를 만들 원격 저장소 주소 형식 (테스트 시 로컬 경로 형식으로 바꿀 수 있음)
+DEFAULT_REMOTE_TEMPLATE = "https://github.com/{owner}/{repo}.git"
+
+# git --raw 상태 문자를 GitHub API의 files[].status 값으로 변환
+_STATUS_MAP = {
+    "A": "added",
+    "M": "modified",
+    "D": "removed",
+    "R": "renamed",
+    "C": "copied",
+    "T": "changed",
+}
+
+
+class GitMirrorError(RuntimeError):
+    pass
+
+
+def _run_git(args, token=None, input_bytes=None):
+    command = ["git"]
+    if token:
+        # 토큰을 원격 주소나 미러 설정에 남기지 않도록 요청 헤더로만 전달합니다.
+        credential = base64.b64encode(f"x-access-token:{token}".encode("utf-8")).decode("ascii")
+        command += ["-c", f"http.extraHeader=Authorization: Basic {credential}"]
+    command += args
+
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    try:
+        result = subprocess.run(command, input=input_bytes, capture_output=True, check=True, env=env)
+    except FileNotFoundError:
+        raise GitMirrorError("git 실행 파일을 찾을 수 없습니다. git이 설치되어 있는지 확인하세요.")
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode("utf-8", errors="replace").strip()
+        raise GitMirrorError(f"git {args[0]} 실패: {stderr}")
+    return result.stdout
+
+
+def ensure_mirror(repo_owner, repo_name, token=None, mirror_root=".mirrors",
+                  remote_template=DEFAULT_REMOTE_TEMPLATE):
+    """
+    저장소의 bare mirror clone을 mirror_root 아래에 만들거나, 이미 있으면 git fetch로 갱신합니다.
+    미러 디렉토리 경로를 반환합니다.
+    """
+    mirror_path = os.path.join(mirror_root, repo_owner, f"{repo_name}.git")
+    remote_url = remote_template.format(owner=repo_owner, repo=repo_name)
+
+    if os.path.isdir(mirror_path):
+        _run_git(["--git-dir", mirror_path, "fetch", "--prune", "--quiet", "origin"], token=token)
+    else:
+        os.makedirs(os.path.dirname(mirror_path), exist_ok=True)
+        _run_git(["clone", "--mirror", "--quiet", remote_url, mirror_path], token=token)
+    return mirror_path
+
+
+def _to_kst(date_iso):
+    """
+    git의 strict ISO 8601 날짜(%aI)를 KST(naive datetime)로 변환합니다.
+    """
+    date = datetime.fromisoformat(date_iso)
+    utc_date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    return utc_date + timedelta(hours=9)
+
+
+def _matches_login(author_name, author_email, username):
+    """
+    GitHub의 author=username 필터를 로컬에서 흉내 냅니다.
+    (author 이름, 이메일 아이디, users.noreply.github.com 이메일의 로그인 부분 비교)
+    """
+    email = author_email.lower()
+    login = username.lower()
+    local_part = email.split("@", 1)[0]
+    if email.endswith("@users.noreply.github.com"):
+        local_part = local_part.split("+", 1)[-1]
+    return author_name == username or local_part == login
+
+
+def _parse_log_record(record):
+    """
+    'git log --raw --numstat -z' 출력의 커밋 하나를 (헤더 필드 목록, {경로: 파일 정보}) 로 파싱합니다.
+    """
+    tokens = record.split("\0")
+    header = tokens[0].split("\x1f")
+    files = {}
+    statuses = {}
+
+    i = 1
+    while i < len(tokens):
+        token = tokens[i].lstrip("\n")
+        i += 1
+        if not token:
+            continue
+        if token.startswith(":"):
+            # raw 항목: ':100644 100644 <sha> <sha> M' 다음 토큰이 경로 (R/C는 원래 경로, 새 경로)
+            letter = token.split(" ")[-1][:1]
+            if letter in ("R", "C"):
+                path = tokens[i + 1]
+                i += 2
+            else:
+                path = tokens[i]
+                i += 1
+            statuses[path] = _STATUS_MAP.get(letter, "modified")
+        elif "\t" in token:
+            # numstat 항목: 'add\tdel\tpath' (rename이면 path가 비고 다음 두 토큰이 원래/새 경로)
+            additions, deletions, path = token.split("\t", 2)
+            if not path:
+                path = tokens[i + 1]
+                i += 2
+            # 바이너리 파일은 '-'로 표시됩니다.
+            additions = int(additions) if additions.isdigit() else 0
+            deletions = int(deletions) if deletions.isdigit() else 0
+            files[path] = {"additions": additions, "deletions": deletions}
+
+    for path, info in files.items():
+        info["status"] = statuses.get(path, "modified")
+    return header, files
+
+
+def fetch_commits_from_mirror(mirror_path, repo_owner, repo_name, branch, directory, start_filter, end_filter,
+                              username):
+    """
+    미러의 git log에서 _fetch_commits 와 같은 형식의 raw_data 행 목록을 만듭니다.
+
+    GitHub API의 username 검색과 author 이름 재시도를 한 번에 처리하기 위해,
+    커밋 author 이름이나 이메일 아이디(GitHub noreply 이메일 포함)가 username 과 같은 커밋을 사용합니다.
+    """
+    output = _run_git([
+        "--git-dir", mirror_path, "log", f"refs/heads/{branch}",
+        "--format=%x1e%H%x1f%an%x1f%ae%x1f%aI",
+        "--raw", "--numstat", "-z", "-M", "--diff-merges=first-parent",
+        "--", directory,
+    ]).decode("utf-8", errors="replace")
+
+    commits = []
+    for record in output.split("\x1e"):
+        if not record.strip():
+            continue
+        header, files = _parse_log_record(record)
+        sha, author_name, author_email, author_date = header
+        date = _to_kst(author_date.strip("\0\n"))
+        if not (start_filter <= date <= end_filter):
+            continue
+        commits.append((sha, author_name, author_email, date, files))
+
+    def to_rows(matcher):
+        rows = []
+        for sha, author_name, author_email, date, files in commits:
+            if not matcher(author_name, author_email):
+                continue
+            html_url = f"https://github.com/{repo_owner}/{repo_name}/commit/{sha}"
+            for filepath, info in files.items():
+                status = info["status"]
+                if filepath.startswith(directory) and filepath.endswith(".js") and status != "removed":
+                    rows.append({
+                        "user": username,
+                        "date": date,
+                        "filename": filepath,
+                        "total_changes": info["additions"] + info["deletions"],
+                        "additions": info["additions"],
+                        "deletions": info["deletions"],
+                        "status": status,
+                        "url": html_url
+                    })
+        return rows
+
+    return to_rows(lambda name, email: _matches_login(name, email, username))
+
+
+def read_files(mirror_path, rev, paths):
+    """
+    git cat-file --batch 로 rev 시점의 여러 파일 내용을 한 번에 읽어 {경로: 내용} 으로 반환합니다.
+    존재하지 않는 경로는 결과에 포함되지 않습니다.
+    """
+    paths = list(paths)
+    if not paths:
+        return {}
+    request = "".join(f"{rev}:{path}\n" for path in paths).encode("utf-8")
+    output = _run_git(["--git-dir", mirror_path, "cat-file", "--batch"], input_bytes=request)
+
+    contents = {}
+    offset = 0
+    for path in paths:
+        newline = output.index(b"\n", offset)
+        header = output[offset:newline].decode("utf-8", errors="replace")
+        offset = newline + 1
+        # 찾은 객체: '<oid> <type> <size>', 없는 경로: '<rev>:<path> missing' (경로에 공백이 있을 수 있으므로 끝에서부터 나눔)
+        name, _, status = header.rpartition(" ")
+        if status in ("missing", "ambiguous"):
+            continue
+        kind = name.rpartition(" ")[2]
+        size = int(status)
+        if kind == "blob":
+            contents[path] = output[offset:offset + size].decode("utf-8", errors="replace")
+        offset += size + 1
+    return contents
@@ -0,0 +1,79 @@
+import json
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# 한 쿼리에 별칭(alias)으로 묶을 저장소 수와 저장소당 한 번에 가져올 커밋 수
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_PAGE_SIZE = 100
+
+
+class GraphQLError(RuntimeError):
+    pass
+
+
+def build_history_query(entries, page_size=DEFAULT_PAGE_SIZE):
+    """
+    여러 저장소의 브랜치 커밋 기록을 별칭으로 묶어 한 번에 조회하는 GraphQL 쿼리를 만듭니다.
+    entries: (alias, owner, name, branch, cursor) 목록
+    """
+    blocks = []
+    for alias, owner, name, branch, cursor in entries:
+        after = json.dumps(cursor) if cursor else "null"
+        blocks.append(f"""
+  {alias}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{
+    ref(qualifiedName: {json.dumps(f"refs/heads/{branch}")}) {{
+      target {{
+        ... on Commit {{
+          history(first: {page_size}, since: $since, until: $until, path: $path, after: {after}) {{
+            pageInfo {{ hasNextPage endCursor }}
+            nodes {{ oid url authoredDate author {{ name email user {{ login }} }} }}
+          }}
+        }}
+      }}
+    }}
+  }}""")
+    return ("query($since: GitTimestamp, $until: GitTimestamp, $path: String) {"
+            + "".join(blocks)
+            + "\n  rateLimit { cost remaining resetAt }\n}")
+
+
+def collect_histories(repos, since, until, path, post, batch_size=DEFAULT_BATCH_SIZE,
+                      page_size=DEFAULT_PAGE_SIZE):
+    """
+    저장소 목록의 주차 범위 커밋 기록을 batch_size개씩 묶은 GraphQL 쿼리로 수집합니다.
+
+    repos: (owner, name, branch) 목록
+    since, until: UTC ISO 8601 문자열
+    post: (query, variables) -> 응답 JSON(dict) 을 돌려주는 함수 (토큰/스케줄러 처리는 호출 측 담당)
+    반환값: {(owner, name, branch): [커밋 노드, ...]} (저장소나 브랜치를 찾을 수 없으면 None)
+    """
+    histories = {repo: [] for repo in repos}
+    # 다음 페이지가 남은 저장소만 커서와 함께 다시 묶어 조회합니다.
+    pending = [(repo, None) for repo in dict.fromkeys(repos)]
+    variables = {"since": since, "until": until, "path": path}
+
+    while pending:
+        batch, pending = pending[:batch_size], pending[batch_size:]
+        entries = [(f"r{i}", owner, name, branch, cursor) for i, ((owner, name, branch), cursor) in enumerate(batch)]
+        response = post(build_history_query(entries, page_size=page_size), variables)
+
+        data = response.get("data") or {}
+        if not data and response.get("errors"):
+            messages = "; ".join(error.get("message", "") for error in response["errors"])
+            raise GraphQLError(f"GitHub GraphQL 오류: {messages}")
+
+        for i, (repo, _) in enumerate(batch):
+            repository = data.get(f"r{i}")
+            ref = (repository or {}).get("ref")
+            if repository is None or ref is None:
+                histories[repo] = None
+                continue
+            history = (ref.get("target") or {}).get("history")
+            if not history:
+                continue
+            histories[repo].extend(history.get("nodes") or [])
+            page_info = history.get("pageInfo") or {}
+            if page_info.get("hasNextPage"):
+                pending.append((repo, page_info.get("endCursor")))
+
+    return histories
@@ -0,0 +1,248 @@
+import argparse
+import os
+import time
+import uuid
+
+import pandas as pd
+
+# pyarrow는 선택 의존성입니다 (main.py --history 또는 이 모듈을 쓸 때만 필요: pip install pyarrow).
+
+# 주차/학생 파티션 컬럼 이름 (저장소 디렉토리 구조: {root}/{kind}/week=.../student=.../part-*.parquet)
+WEEK_COLUMN = "week"
+STUDENT_COLUMN = "student"
+RUN_COLUMN = "run_id"
+
+RAW = "raw"
+SUMMARY = "summary"
+
+# 주차별 추이 표로 만들 지표: 지표 이름 -> (요약 컬럼, 학생·주차별 집계 방법)
+# "commits"/"span_minutes"는 파일별 값을 더하면 여러 파일을 고친 커밋과 겹치는 시간이 중복되므로
+# 저장된 파일별 커밋 행(raw)으로 계산하고, raw가 없는 학생·주차만 요약 컬럼의 합을 사용합니다.
+TREND_METRICS = {
+    "총 커밋 수": ("총 커밋 수", "commits"),
+    "코딩 시간(분)": ("코딩 시간(분)", "span_minutes"),
+    "코드 유사도": ("코드 유사도", "mean"),
+    "파일 수": ("파일명", "count"),
+}
+
+
+class HistoryStoreError(RuntimeError):
+    pass
+
+
+def _union_minutes(spans):
+    """
+    (시작, 끝) 구간 목록의 합집합 길이를 분 단위(내림)로 반환합니다.
+    """
+    total_seconds = 0.0
+    start = end = None
+    for span_start, span_end in sorted(spans):
+        if end is not None and span_start <= end:
+            end = max(end, span_end)
+            continue
+        if end is not None:
+            total_seconds += (end - start).total_seconds()
+        start, end = span_start, span_end
+    if end is not None:
+        total_seconds += (end - start).total_seconds()
+    return int(total_seconds // 60)
+
+
+def _raw_trend_values(raw, summary):
+    """
+    파일별 커밋 행으로 학생·주차별 고유 커밋 수(commits)와 파일별 작업 구간의 합집합 길이(span_minutes)를 계산합니다.
+    요약에 남은 파일의 행만 사용하고, 요약과 같이 커밋이 2개 이상인 파일의 첫 커밋(파일 생성 커밋)은 제외합니다.
+    """
+    keys = [STUDENT_COLUMN, WEEK_COLUMN]
+    files = summary[keys + ["파일명"]].drop_duplicates().rename(columns={"파일명": "filename"})
+    raw = raw.merge(files, on=keys + ["filename"])
+    if raw.empty:
+        return pd.DataFrame(columns=["commits", "span_minutes"])
+
+    file_keys = keys + ["filename"]
+    raw = raw.sort_values(file_keys + ["date"], kind="mergesort", ignore_index=True)
+    position = raw.groupby(file_keys).cumcount()
+    size = raw.groupby(file_keys)["date"].transform("size")
+    raw = raw[(position > 0) | (size == 1)]
+
+    spans = raw.groupby(file_keys)["date"].agg(["min", "max"]).reset_index()
+    span_minutes = spans.groupby(keys).apply(
+        lambda group: _union_minutes(zip(group["min"], group["max"])), include_groups=False)
+    commits = raw.groupby(keys)["url"].nunique()
+    return pd.DataFrame({"commits": commits, "span_minutes": span_minutes})
+
+
+def _arrow():
+    """
+    pyarrow는 이 기능을 쓸 때만 필요하므로 여기서 불러옵니다.
+    """
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError:
+        raise HistoryStoreError("주차별 기록 저장소를 사용하려면 pyarrow가 필요합니다: pip install pyarrow")
+    return pyarrow, pyarrow.dataset
+
+
+class HistoryStore:
+    """
+    파일별 커밋 행(raw)과 파일별 요약(summary)을 주차·학생으로 나눈 Parquet 파일로 쌓아 두는 저장소입니다.
+
+    - 쓰기는 항상 새 파일을 추가하기만 하며(append-only) 기존 파일을 고치지 않습니다.
+      같은 주차/학생을 다시 저장하면 읽을 때 가장 최근 실행(run_id)의 행만 사용합니다.
+    - 읽기는 주차/학생 조건으로 파티션 디렉토리를 건너뛰고, 나머지 조건은 Parquet 통계로 걸러 냅니다.
+    """
+
+    def __init__(self, root=".history"):
+        self.root = root
+
+    def _path(self, kind):
+        return os.path.join(self.root, kind)
+
+    def _write(self, kind, df, week_label, student_column):
+        pa, ds = _arrow()
+        if df is None or df.empty:
+            return 0
+        run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        df = df.copy()
+        df[WEEK_COLUMN] = week_label
+        df[STUDENT_COLUMN] = df[student_column].astype(str)
+        df[RUN_COLUMN] = run_id
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        partitioning = ds.partitioning(
+            pa.schema([(WEEK_COLUMN, pa.string()), (STUDENT_COLUMN, pa.string())]), flavor="hive")
+        ds.write_dataset(table, self._path(kind), format="parquet", partitioning=partitioning,
+                         basename_template=f"part-{run_id}-{{i}}.parquet",
+                         existing_data_behavior="overwrite_or_ignore")
+        return len(df)
+
+    def append_raw(self, week_label, student, rows):
+        """
+        학생 한 명의 파일별 커밋 행(analyze_commits 의 raw_data 형식 dict 목록 또는 DataFrame)을 추가합니다.
+        student에는 append_summary와 같은 파티션이 되도록 GitHub 사용자명을 넘깁니다.
+        """
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if df.empty:
+            return 0
+        df = df.assign(**{STUDENT_COLUMN: student})
+        return self._write(RAW, df, week_label, STUDENT_COLUMN)
+
+    def append_summary(self, week_label, summary):
+        """
+        analyze_commits 결과(여러 학생을 합친 DataFrame도 가능)를 GitHub 사용자명('user')별 파티션으로 추가합니다.
+        (실제 이름은 학생끼리 겹칠 수 있어 파티션 키로 쓰지 않습니다)
+        """
+        return self._write(SUMMARY, summary, week_label, "user")
+
+    def _read(self, kind, weeks=None, students=None, columns=None, where=None):
+        pa, ds = _arrow()
+        path = self._path(kind)
+        if not os.path.isdir(path):
+            return pd.DataFrame()
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+
+        # 주차/학생 조건은 파티션 디렉토리 단위로 적용되어 해당하지 않는 파일은 열지 않습니다.
+        partition_filter = None
+        for column, values in ((WEEK_COLUMN, weeks), (STUDENT_COLUMN, students)):
+            if values is not None:
+                clause = ds.field(column).isin([str(value) for value in values])
+                partition_filter = clause if partition_filter is None else partition_filter & clause
+
+        # 같은 주차/학생을 여러 번 저장했으면 가장 최근 실행(run_id)의 행만 사용합니다.
+        # where 조건과 상관없이 정해야 하므로 run_id 컬럼만 먼저 읽어 최신 실행을 고릅니다.
+        runs = dataset.to_table(columns=[WEEK_COLUMN, STUDENT_COLUMN, RUN_COLUMN],
+                                filter=partition_filter).to_pandas()
+        if runs.empty:
+            return pd.DataFrame()
+        latest_runs = runs.groupby([WEEK_COLUMN, STUDENT_COLUMN], observed=True)[RUN_COLUMN].max().unique().tolist()
+
+        condition = ds.field(RUN_COLUMN).isin(latest_runs)
+        if partition_filter is not None:
+            condition = condition & partition_filter
+        if where is not None:
+            condition = condition & where
+
+        if columns is not None:
+            columns = list(dict.fromkeys(list(columns) + [WEEK_COLUMN, STUDENT_COLUMN, RUN_COLUMN]))
+        df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+        for column in (WEEK_COLUMN, STUDENT_COLUMN):
+            df[column] = df[column].astype(str)
+        # 한 실행이 여러 학생을 저장했을 수 있으므로, 다른 학생에게는 최신인 실행 ID의 예전 행을 한 번 더 거릅니다.
+        latest = df.groupby([WEEK_COLUMN, STUDENT_COLUMN])[RUN_COLUMN].transform("max")
+        return df[df[RUN_COLUMN] == latest].reset_index(drop=True)
+
+    def read_raw(self, weeks=None, students=None, columns=None, where=None):
+        """
+        저장된 파일별 커밋 행을 읽습니다.
+        where에는 pyarrow.dataset 식(예: pyarrow.dataset.field("additions") > 10)을 넘길 수 있으며,
+        Parquet 행 그룹 통계로 해당하지 않는 부분을 건너뜁니다.
+        """
+        return self._read(RAW, weeks, students, columns, where)
+
+    def read_summary(self, weeks=None, students=None, columns=None, where=None):
+        return self._read(SUMMARY, weeks, students, columns, where)
+
+    def weeks(self):
+        """
+        저장된 주차 라벨 목록을 반환합니다 (파티션 디렉토리 이름만 읽음).
+        """
+        path = self._path(SUMMARY)
+        if not os.path.isdir(path):
+            return []
+        prefix = f"{WEEK_COLUMN}="
+        return sorted(name[len(prefix):] for name in os.listdir(path) if name.startswith(prefix))
+
+    def trend(self, weeks=None, students=None, metrics=None):
+        """
+        학생별 주차 추이 표를 만듭니다. 네트워크 요청 없이 저장된 요약(과 총 커밋 수/코딩 시간은 파일별 커밋 행)만 읽습니다.
+        반환값: {지표 이름: 학생 x 주차 DataFrame}
+        """
+        metrics = metrics or list(TREND_METRICS)
+        columns = [TREND_METRICS[metric][0] for metric in metrics] + ["파일명"]
+        df = self.read_summary(weeks=weeks, students=students, columns=columns)
+        if df.empty:
+            return {metric: pd.DataFrame() for metric in metrics}
+
+        raw_values = None
+        if any(TREND_METRICS[metric][1] in ("commits", "span_minutes") for metric in metrics):
+            raw = self.read_raw(weeks=weeks, students=students, columns=["filename", "date", "url"])
+            if not raw.empty:
+                raw_values = _raw_trend_values(raw, df)
+
+        grouped = df.groupby([STUDENT_COLUMN, WEEK_COLUMN])
+        tables = {}
+        for metric in metrics:
+            column, how = TREND_METRICS[metric]
+            if how in ("commits", "span_minutes"):
+                values = grouped[column].sum()
+                if raw_values is not None:
+                    values = raw_values[how].combine_first(values).astype(values.dtype)
+            else:
+                values = grouped[column].agg(how)
+            table = values.unstack(WEEK_COLUMN).sort_index(axis=1)
+            tables[metric] = table.round(2) if how == "mean" else table
+        return tables
+
+
+if __name__ == "__main__":
+    # 사용법: python history_store.py [--root .history] [--weeks week08 week09] [--students hong-gildong] [--html trend.html]
+    parser = argparse.ArgumentParser(description="저장된 주차별 기록으로 학생별 추이 표를 만듭니다 (네트워크 사용 안 함)")
+    parser.add_argument("--root", default=".history", help="기록 저장소 디렉토리 (기본값: .history)")
+    parser.add_argument("--weeks", nargs="+", default=None, help="포함할 주차 라벨 (기본값: 전체)")
+    parser.add_argument("--students", nargs="+", default=None, help="포함할 학생의 GitHub 사용자명 (기본값: 전체)")
+    parser.add_argument("--html", metavar="PATH", default=None, help="추이 표를 HTML로 저장할 경로")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.root)
+    trend_tables = store.trend(weeks=args.weeks, students=args.students)
+    if all(table.empty for table in trend_tables.values()):
+        print(f"❗ {args.root} 에 저장된 요약 기록이 없습니다.")
+    else:
+        with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", 200):
+            for metric_name, trend_table in trend_tables.items():
+                print(f"\n📈 {metric_name}")
+                print(trend_table.fillna("-").to_string())
+        if args.html:
+            from html_parser import save_trend_tables_as_html
+            save_trend_tables_as_html(trend_tables, args.html)
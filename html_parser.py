@@ -1,159 +1,96 @@
-import pandas as pd
-import numpy as np
-import re
 import os
-from git_analyzer import load_week_range
+from concurrent.futures import ProcessPoolExecutor
 
+import instrumentation
+from week_config import load_week_range
 
-def _split_filename_and_count(cell: str):
-    """
-    '<a href="...">path/to/file.py (3)</a>' 형태나 'path/to/file.py (3)' 형태에서
-    파일명(anchor 유지)과 정수 커밋 수를 분리합니다.
-    """
-    if pd.isna(cell):
-        return cell, None
-
-    s = str(cell)
-    href = None
-    # href 추출 (있을 경우)
-    m_href = re.search(r'href="([^"]+)"', s)
-    if m_href:
-        href = m_href.group(1)
-
-    # 앵커 안에 '파일명 (숫자)' 형태
-    m = re.search(r'>(.*?)\s*\((\d+)\)\s*</a>\s*$', s)
-    if m:
-        filename_text = m.group(1).strip()
-        count = int(m.group(2))
-        anchor = f'<a href="{href}" target="_blank">{filename_text}</a>' if href else filename_text
-        return anchor, count
-
-    # 일반 텍스트 '파일명 (숫자)' 형태
-    m2 = re.search(r'^(.*?)\s*\((\d+)\)\s*$', s)
-    if m2:
-        filename_text = m2.group(1).strip()
-        count = int(m2.group(2))
-        anchor = f'<a href="{href}" target="_blank">{filename_text}</a>' if href else filename_text
-        return anchor, count
-
-    # 숫자를 못 찾으면 앵커 안의 텍스트만 파일명으로
-    m3 = re.search(r'>(.*?)</a>', s)
-    if m3:
-        filename_text = m3.group(1).strip()
-        anchor = f'<a href="{href}" target="_blank">{filename_text}</a>' if href else filename_text
-        return anchor, None
-
-    return s, None
-
-
-def _parse_minutes(duration_str: str):
+# pandas/numpy(와 그것을 쓰는 cohort_stats)는 실제로 보고서를 만드는 함수 안에서 불러옵니다.
+# main.py/cli.py가 Z_SCOPES만 쓰려고 이 모듈을 불러올 때 시작 시간이 늘지 않도록 하기 위함입니다.
+
+Z_SCOPES = ("cohort", "student")
+
+
+def _from_legacy_columns(df):
     """
-    '50분' 형태의 문자열을 정수(분)로 변환합니다.
+    이전 형식(파일명/URL/커밋 수를 HTML 앵커 문자열 하나에, 평균 수정 라인 수와 코딩 시간을 텍스트에 담은)
+    DataFrame을 구조화된 컬럼으로 변환합니다. 예전에 저장한 CSV를 다시 렌더링할 때 사용합니다.
     """
-    try:
-        match = re.search(r'(\d+)', duration_str)
-        if match:
-            return int(match.group(1))
-        return 0
-    except:
-        return 0
+    import pandas as pd
 
+    df = df.copy()
+    cells = df["파일명 (총 커밋 수)"]
+    text = cells.astype(str)
+    url = text.str.extract(r'href="([^"]+)"')[0]
+    anchor = text.str.extract(r'>(.*?)\s*\((\d+)\)\s*</a>\s*$')      # <a ...>파일명 (숫자)</a>
+    plain = text.str.extract(r'^(.*?)\s*\((\d+)\)\s*$')              # 파일명 (숫자)
+    anchor_only = text.str.extract(r'>(.*?)</a>')[0]                  # <a ...>파일명</a>
+    filename = anchor[0].fillna(plain[0]).fillna(anchor_only).fillna(text).str.strip()
 
-def save_dataframe_as_html(df, output_path="commit_summary.html", title="파일별 커밋 통계"):
-    week_label, start_date, end_date = load_week_range()
+    df["파일명"] = filename.where(cells.notna())
+    df["url"] = url
+    df["총 커밋 수"] = anchor[1].fillna(plain[1]).fillna(0).astype(int)
+    df.drop(columns=["파일명 (총 커밋 수)"], inplace=True)
 
-    # 입력 df에 '파일명 (총 커밋 수)'가 있다면 '파일명', '총 커밋 수'로 분리
-    if "파일명 (총 커밋 수)" in df.columns:
-        filenames = []
-        counts = []
-        for val in df["파일명 (총 커밋 수)"]:
-            name_anchor, cnt = _split_filename_and_count(val)
-            filenames.append(name_anchor)
-            counts.append(cnt if cnt is not None else 0)
-        df["파일명"] = filenames
-        df["총 커밋 수"] = pd.Series(counts, index=df.index).astype(int)
-        df.drop(columns=["파일명 (총 커밋 수)"], inplace=True)
-    else:
-        if "파일명" in df.columns and "총 커밋 수" not in df.columns:
-            df["총 커밋 수"] = 0
-
-    # '총 커밋 수'에 대한 Z-score 계산 및 이상치 플래그 생성
-    commit_counts = df["총 커밋 수"].to_numpy()
-    mean_commit = np.mean(commit_counts)
-    std_commit = np.std(commit_counts)
-    if std_commit != 0:
-        z_scores_commit = (commit_counts - mean_commit) / std_commit
-    else:
-        z_scores_commit = np.zeros(len(commit_counts))
-    df["z_score_commit"] = np.round(z_scores_commit, 2)
-    df['commit_count_is_outlier'] = z_scores_commit < -1.0
-    df["z_score_commit_style"] = ""
-    df.loc[df[
-        'commit_count_is_outlier'], "z_score_commit_style"] = "color: red; text-decoration: underline; font-weight: bold;"
-
-    # '평균 수정 라인 수'에 대한 Z-score 계산 및 이상치 플래그 생성
-    avg_changes = df["평균 수정 라인 수 (+/-)"].apply(lambda x: float(x.split(' ')[0])).to_numpy()
-    mean_changes = np.mean(avg_changes)
-    std_changes = np.std(avg_changes)
-    if std_changes != 0:
-        z_scores_changes = (avg_changes - mean_changes) / std_changes
-    else:
-        z_scores_changes = np.zeros(len(avg_changes))
-    df["z_score_changes"] = np.round(z_scores_changes, 2)
-    df['avg_changes_is_outlier'] = z_scores_changes > 2.0
-    df["z_score_changes_style"] = ""
-    df.loc[df[
-        'avg_changes_is_outlier'], "z_score_changes_style"] = "color: red; text-decoration: underline; font-weight: bold;"
+    changes = df["평균 수정 라인 수 (+/-)"].astype(str).str.extract(r'^(\S+)\s*\(([^/]*)/([^)]*)\)')
+    df["평균 수정 라인 수"] = changes[0].astype(float)
+    df["평균 추가 라인 수"] = pd.to_numeric(changes[1], errors="coerce")
+    df["평균 삭제 라인 수"] = pd.to_numeric(changes[2], errors="coerce")
+    df.drop(columns=["평균 수정 라인 수 (+/-)"], inplace=True)
 
-    # 코드 유사도에 대한 이상치 플래그 생성 및 HTML 처리
-    df['code_similarity_is_outlier'] = df['코드 유사도'].isna() | (df['코드 유사도'] < 85.0)
+    df["코딩 시간(분)"] = df["코딩 시간"].astype(str).str.extract(r'(\d+)')[0].fillna(0).astype(int)
+    df.drop(columns=["코딩 시간"], inplace=True)
 
-    # NaN 값과 85% 미만 값 모두에 동일한 스타일 적용
-    df['code_similarity_html'] = df["코드 유사도"].astype(str) + "%"
-    df.loc[df['코드 유사도'].isna(), 'code_similarity_html'] = "NaN%"
-    df['code_similarity_style'] = ""
-    df.loc[df[
-        'code_similarity_is_outlier'], 'code_similarity_style'] = "color:red; font-weight:bold; text-decoration: underline;"
-
-    # '코딩 시간'에 대한 Z-score 계산 및 이상치 플래그 생성
-    coding_minutes = df["코딩 시간"].apply(_parse_minutes).to_numpy()
-    mean_minutes = np.mean(coding_minutes)
-    std_minutes = np.std(coding_minutes)
-    if std_minutes != 0:
-        z_scores_minutes = (coding_minutes - mean_minutes) / std_minutes
-    else:
-        z_scores_minutes = np.zeros(len(coding_minutes))
-    df["z_score_minutes"] = np.round(z_scores_minutes, 2)
-    df['coding_minutes_is_outlier'] = z_scores_minutes < -1.0
-    df["z_score_minutes_style"] = ""
-    df.loc[df[
-        'coding_minutes_is_outlier'], "z_score_minutes_style"] = "color: red; font-weight: bold; text-decoration: underline;"
-
-    # 새로운 평가 로직: 이상치 개수 기반
-    df['outlier_count'] = df['commit_count_is_outlier'].astype(int) + \
-                          df['avg_changes_is_outlier'].astype(int) + \
-                          df['code_similarity_is_outlier'].astype(int) + \
-                          df['coding_minutes_is_outlier'].astype(int)
-
-    df['평가'] = 'success'
-    df.loc[df['outlier_count'] >= 3, '평가'] = 'fail'
-    df.loc[(df['outlier_count'] >= 1) & (df['outlier_count'] < 3), '평가'] = 'warning'
+    return df
 
-    df["result_color"] = df["평가"].map({
-        "fail": "background-color: #ffdddd;",
-        "warning": "background-color: #fffacc;",
-        "success": "background-color: #ddffdd;"
-    })
 
-    df["최근 커밋일시(dt)"] = pd.to_datetime(df["최근 커밋일시"])
-    df["week_label"] = df["최근 커밋일시(dt)"].apply(lambda d: week_label if start_date <= d <= end_date else "")
-    df.drop(columns=["최근 커밋일시(dt)"], inplace=True)
+def compute_cohort_stats(df, robust=False):
+    """
+    전체 학생 DataFrame에서 Z-score 기준이 되는 컬럼별 (평균, 모집단 표준편차)를 한 번에 계산합니다.
+    robust=True이면 (중앙값, 1.4826 x MAD)를 사용합니다.
+    반환값은 save_dataframe_as_html(cohort_stats=...)에 그대로 넘길 수 있습니다.
+    학생이 하나씩 도착하는 경우에는 cohort_stats.CohortStatsEngine 으로 누적 계산하세요.
+    """
+    from cohort_stats import CohortStatsEngine, Z_SCORE_COLUMNS
+
+    if "파일명 (총 커밋 수)" in df.columns:
+        df = _from_legacy_columns(df)
+    engine = CohortStatsEngine(Z_SCORE_COLUMNS, robust=robust)
+    engine.update(None, df)
+    return engine.stats()
 
-    # '이름'과 'user'를 기준으로 정렬하여 그룹화 준비
-    df = df.sort_values(by=["이름", "user"]).reset_index(drop=True)
 
-    # 첫 번째 테이블 (파일별 상세 통계) HTML 생성
+def _suspicious_pairs_html(title, suspicious_pairs):
+    """
+    학생 간 의심 유사 제출 쌍(plagiarism.find_suspicious_pairs 결과) 테이블 HTML을 만듭니다.
+    """
     html = f"""
+    <h2>{title} (학생 간 의심 유사 제출)</h2>
+    <table>
+    <thead>
+    <tr>
+        <th>순번</th>
+        <th>파일</th>
+        <th>이름 A</th>
+        <th>이름 B</th>
+        <th>유사도 (%)</th>
+    </tr>
+    </thead>
+    <tbody>
+    """
+    for i, row in enumerate(suspicious_pairs.itertuples(index=False), start=1):
+        html += "<tr>"
+        html += f"<td>{i}</td>"
+        html += f"<td class='filename-col'>{row[0]}</td>"
+        html += f"<td>{row[1]}</td>"
+        html += f"<td>{row[2]}</td>"
+        html += f"<td style='color: red; font-weight: bold;'>{row[3]}%</td>"
+        html += "</tr>"
+    html += "</tbody></table>"
+    return html
+
+
+# 문서 시작 부분 (스타일 포함)
+_HTML_HEAD = """
     <!DOCTYPE html>
     <html lang="ko">
     <head>
@@ -180,7 +117,10 @@ def save_dataframe_as_html(df, output_path="commit_summary.html", title="파일
     </style>
     </head>
     <body>
-    <h2>{title} (파일별)</h2>
+    """
+
+# 파일별 상세 통계 테이블 머리 부분 (문서 시작 포함)
+_FILE_TABLE_HEADER = _HTML_HEAD + """<h2>{title} (파일별)</h2>
     <table>
     <thead>
     <tr>
@@ -201,34 +141,180 @@ def save_dataframe_as_html(df, output_path="commit_summary.html", title="파일
     <tbody>
     """
 
-    # '이름'과 'user'를 기준으로 그룹화하여 HTML 행 생성
-    row_number = 1
-    for (name, user), group in df.groupby(['이름', 'user']):
-        rowspan = len(group)
-        for idx, row in group.iterrows():
-            html += "<tr>"
-            # 첫 번째 행에만 순번, 주차, 이름, user 셀 병합
-            if idx == group.index[0]:
-                html += f"<td rowspan='{rowspan}'>{row_number}</td>"
-                html += f"<td rowspan='{rowspan}'>{row['week_label']}</td>"
-                html += f"<td rowspan='{rowspan}'>{row['이름']}</td>"
-                html += f"<td rowspan='{rowspan}'>{row['user']}</td>"
-
-            html += f"<td class='filename-col'>{row['파일명']}</td>"
-            html += f"<td>{row['최근 커밋일시']}</td>"
-            html += f"<td>{row['상태']}</td>"
-            html += f"<td style='{row['z_score_commit_style']}'>{row['총 커밋 수']} ({row['z_score_commit']})</td>"
-            html += f"<td style='{row['z_score_changes_style']}'>{row['평균 수정 라인 수 (+/-)']} ({row['z_score_changes']})</td>"
-            html += f"<td style='{row['code_similarity_style']}'>{row['code_similarity_html']}</td>"
-            html += f"<td style='{row['z_score_minutes_style']}'>{row['코딩 시간']} ({row['z_score_minutes']})</td>"
-            html += f"<td style='{row['result_color']}'>{row['평가']}</td>"
-            html += "</tr>"
-
-        row_number += 1
+# 사용자별 종합 통계 테이블 머리 부분
+_USER_TABLE_HEADER = """
+    <h2>{title} (사용자별 종합)</h2>
+    <table>
+    <thead>
+    <tr>
+        <th>순번</th>
+        <th>이름</th>
+        <th>user</th>
+        <th>조회한 파일의 총 갯수</th>
+        <th>최근 커밋일시가 같은 파일 수</th>
+        <th>success 수</th>
+        <th>warning 수</th>
+        <th>fail 수</th>
+    </tr>
+    </thead>
+    <tbody>
+    """
+
+# HTML 행을 파일에 쓸 때 한 번에 묶어 쓰는 행 수
+_WRITE_CHUNK_ROWS = 5000
+
+
+def _write_chunked(f, rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= _WRITE_CHUNK_ROWS:
+            f.write("".join(chunk))
+            chunk.clear()
+    if chunk:
+        f.write("".join(chunk))
 
-    html += "</tbody></table>"
 
-    # --- 두 번째 테이블 (사용자별 종합 통계) 생성 ---
+def _write_file_rows(f, df):
+    """
+    파일별 상세 통계 테이블의 행을 컬럼 단위로 만든 뒤 순서대로 씁니다.
+    '이름'과 'user'가 같은 행은 그룹 첫 행에서 순번/주차/이름/user 셀을 rowspan으로 병합합니다.
+    """
+    import numpy as np
+
+    # groupby와 같은 규칙(정렬된 키 순서, 키가 NaN인 행 제외)으로 그룹 번호를 매깁니다.
+    group_ids = df.groupby(['이름', 'user']).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    order = np.argsort(group_ids, kind="stable")
+    order = order[group_ids[order] >= 0]
+    rowspans = np.bincount(group_ids[group_ids >= 0]) if len(order) else np.array([], dtype=int)
+
+    cells = [
+        f"<td class='filename-col'>{filename}</td>"
+        f"<td>{date}</td>"
+        f"<td>{status}</td>"
+        f"<td style='{commit_style}'>{commit_count} ({z_commit})</td>"
+        f"<td style='{changes_style}'>{changes} ({z_changes})</td>"
+        f"<td style='{similarity_style}'>{similarity}</td>"
+        f"<td style='{minutes_style}'>{minutes} ({z_minutes})</td>"
+        f"<td style='{result_color}'>{result}</td>"
+        "</tr>"
+        for filename, date, status, commit_style, commit_count, z_commit, changes_style, changes, z_changes,
+        similarity_style, similarity, minutes_style, minutes, z_minutes, result_color, result in zip(
+            df['파일명_html'].tolist(), df['최근 커밋일시_text'].tolist(), df['상태'].tolist(),
+            df['z_score_commit_style'].tolist(), df['총 커밋 수'].tolist(), df['z_score_commit'].tolist(),
+            df['z_score_changes_style'].tolist(), df['평균 수정 라인 수_text'].tolist(), df['z_score_changes'].tolist(),
+            df['code_similarity_style'].tolist(), df['code_similarity_html'].tolist(),
+            df['z_score_minutes_style'].tolist(), df['코딩 시간_text'].tolist(), df['z_score_minutes'].tolist(),
+            df['result_color'].tolist(), df['평가'].tolist())
+    ]
+    week_labels = df['week_label'].tolist()
+    names = df['이름'].tolist()
+    users = df['user'].tolist()
+
+    def rows():
+        previous_group = -1
+        for pos in order:
+            group = group_ids[pos]
+            if group != previous_group:
+                # 첫 번째 행에만 순번, 주차, 이름, user 셀 병합
+                previous_group = group
+                rowspan = rowspans[group]
+                yield (f"<tr><td rowspan='{rowspan}'>{group + 1}</td>"
+                       f"<td rowspan='{rowspan}'>{week_labels[pos]}</td>"
+                       f"<td rowspan='{rowspan}'>{names[pos]}</td>"
+                       f"<td rowspan='{rowspan}'>{users[pos]}</td>" + cells[pos])
+            else:
+                yield "<tr>" + cells[pos]
+
+    _write_chunked(f, rows())
+
+
+def _write_user_rows(f, user_summary):
+    """
+    사용자별 종합 통계 테이블의 행을 씁니다.
+    """
+    _write_chunked(f, (
+        "<tr>"
+        f"<td>{i}</td>"
+        f"<td>{name}</td>"
+        f"<td>{user}</td>"
+        f"<td>{total_files}</td>"
+        f"<td style='{latest_style}'>{latest_count}</td>"
+        f"<td>{success}</td>"
+        f"<td>{warning}</td>"
+        f"<td>{fail}</td>"
+        "</tr>"
+        for i, (name, user, total_files, latest_style, latest_count, success, warning, fail) in enumerate(zip(
+            user_summary['이름'].tolist(), user_summary['user'].tolist(), user_summary['total_files'].tolist(),
+            user_summary['latest_commit_style'].tolist(), user_summary['latest_commit_file_count'].tolist(),
+            user_summary['success_count'].tolist(), user_summary['warning_count'].tolist(),
+            user_summary['fail_count'].tolist()), start=1)
+    ))
+
+
+@instrumentation.stage("html_render")
+def save_dataframe_as_html(df, output_path="commit_summary.html", title="파일별 커밋 통계", suspicious_pairs=None,
+                           cohort_stats=None, week_range=None):
+    """
+    파일별 커밋 통계 DataFrame을 HTML 보고서로 저장합니다.
+    suspicious_pairs(DataFrame)가 주어지면 학생 간 의심 유사 제출 쌍 테이블을 마지막에 추가합니다.
+    cohort_stats(compute_cohort_stats 결과)가 주어지면 df 자체 대신 그 평균/표준편차로 Z-score를 계산하고,
+    week_range(load_week_range 결과)가 주어지면 week_information.txt 를 다시 읽지 않습니다.
+    """
+    import numpy as np
+    import pandas as pd
+    from cohort_stats import score_rows
+
+    week_label, start_date, end_date = week_range if week_range is not None else load_week_range()
+    if "파일명 (총 커밋 수)" in df.columns:
+        df = _from_legacy_columns(df)
+    else:
+        df = df.copy()
+    df["최근 커밋일시"] = pd.to_datetime(df["최근 커밋일시"])
+
+    outlier_style = "color: red; text-decoration: underline; font-weight: bold;"
+
+    # Z-score, 지표별 이상치 플래그와 이상치 개수 기반 평가
+    df = score_rows(df, cohort_stats)
+    df["z_score_commit_style"] = np.where(df['commit_count_is_outlier'], outlier_style, "")
+    df["z_score_changes_style"] = np.where(df['avg_changes_is_outlier'], outlier_style, "")
+
+    # NaN 값과 85% 미만 값 모두에 동일한 스타일 적용
+    df['code_similarity_html'] = df["코드 유사도"].astype(str) + "%"
+    df.loc[df['코드 유사도'].isna(), 'code_similarity_html'] = "NaN%"
+    df['code_similarity_style'] = np.where(df['code_similarity_is_outlier'],
+                                           "color:red; font-weight:bold; text-decoration: underline;", "")
+
+    df["z_score_minutes_style"] = np.where(df['coding_minutes_is_outlier'],
+                                           "color: red; font-weight: bold; text-decoration: underline;", "")
+
+    df["result_color"] = df["평가"].map({
+        "fail": "background-color: #ffdddd;",
+        "warning": "background-color: #fffacc;",
+        "success": "background-color: #ddffdd;"
+    })
+
+    if "week_label" in df.columns:
+        # 여러 주차를 한 번에 분석한 결과는 행마다 주차 라벨이 이미 붙어 있습니다.
+        df["week_label"] = df["week_label"].fillna("").astype(str)
+    else:
+        in_week = (df["최근 커밋일시"] >= start_date) & (df["최근 커밋일시"] <= end_date)
+        df["week_label"] = np.where(in_week, week_label, "")
+
+    # '이름'과 'user'를 기준으로 정렬하여 그룹화 준비
+    df = df.sort_values(by=["이름", "user"]).reset_index(drop=True)
+
+    # 구조화된 값은 여기(렌더링 단계)에서만 표시용 문자열로 바꿉니다.
+    df["파일명_html"] = np.where(
+        df["url"].notna(),
+        '<a href="' + df["url"].astype(str) + '" target="_blank">' + df["파일명"].astype(str) + '</a>',
+        df["파일명"].astype(str))
+    df["최근 커밋일시_text"] = df["최근 커밋일시"].dt.strftime("%Y-%m-%d %H:%M")
+    df["평균 수정 라인 수_text"] = [
+        f"{total} ({additions}/{deletions})" for total, additions, deletions in zip(
+            df["평균 수정 라인 수"].tolist(), df["평균 추가 라인 수"].tolist(), df["평균 삭제 라인 수"].tolist())
+    ]
+    df["코딩 시간_text"] = df["코딩 시간(분)"].astype(str) + "분"
 
     # 사용자별로 그룹화하여 파일 수, 평가별 개수 및 최근 커밋 일시가 같은 파일 개수 집계
     user_summary = df.groupby(['이름', 'user']).agg(
@@ -244,39 +330,106 @@ def save_dataframe_as_html(df, output_path="commit_summary.html", title="파일
     user_summary['latest_commit_style'] = np.where(user_summary['latest_commit_file_ratio'] > 0.1,
                                                    'background-color: #ffdddd;', '')
 
-    html += f"""
-    <h2>{title} (사용자별 종합)</h2>
-    <table>
-    <thead>
-    <tr>
-        <th>순번</th>
-        <th>이름</th>
-        <th>user</th>
-        <th>조회한 파일의 총 갯수</th>
-        <th>최근 커밋일시가 같은 파일 수</th>
-        <th>success 수</th>
-        <th>warning 수</th>
-        <th>fail 수</th>
-    </tr>
-    </thead>
-    <tbody>
+    # 전체 HTML을 문자열로 이어 붙이지 않고, 테이블 행을 일정 개수씩 묶어 파일에 바로 씁니다.
+    with open(output_path, "w", encoding="utf-8") as f:
+        # 첫 번째 테이블 (파일별 상세 통계)
+        f.write(_FILE_TABLE_HEADER.format(title=title))
+        _write_file_rows(f, df)
+        f.write("</tbody></table>")
+
+        # --- 두 번째 테이블 (사용자별 종합 통계) ---
+        f.write(_USER_TABLE_HEADER.format(title=title))
+        _write_user_rows(f, user_summary)
+        f.write("</tbody></table>")
+
+        if suspicious_pairs is not None:
+            f.write(_suspicious_pairs_html(title, suspicious_pairs))
+
+        f.write("</body></html>")
+
+    print(f"✅ HTML 파일 저장 완료: {output_path}")
+
+
+def _render_student_report(task):
+    """
+    프로세스 풀 작업 함수: 학생 한 명의 보고서를 저장합니다.
     """
+    group_df, output_path, title, cohort_stats, week_range = task
+    save_dataframe_as_html(group_df, output_path=output_path, title=title,
+                           cohort_stats=cohort_stats, week_range=week_range)
+    return output_path
 
-    for i, row in user_summary.iterrows():
-        html += "<tr>"
-        html += f"<td>{i + 1}</td>"
-        html += f"<td>{row['이름']}</td>"
-        html += f"<td>{row['user']}</td>"
-        html += f"<td>{row['total_files']}</td>"
-        html += f"<td style='{row['latest_commit_style']}'>{row['latest_commit_file_count']}</td>"
-        html += f"<td>{row['success_count']}</td>"
-        html += f"<td>{row['warning_count']}</td>"
-        html += f"<td>{row['fail_count']}</td>"
-        html += "</tr>"
 
-    html += "</tbody></table></body></html>"
+def save_student_reports(df, output_template="commit_summary({name}).html", title_template="{name} 파일별 커밋 통계",
+                         z_scope="student", workers=None, week_range=None, names=None, robust=False,
+                         cohort_stats=None):
+    """
+    '이름'별로 학생 보고서 HTML을 프로세스 풀에서 나누어 생성합니다.
+    names가 주어지면 그 학생들의 보고서만 다시 생성합니다 (Z-score 기준은 여전히 df 전체로 계산).
+
+    z_scope="student"(기본값): 각 학생의 행만으로 Z-score를 계산합니다.
+    z_scope="cohort": 전체 학생 기준 평균/표준편차를 한 번만 계산하여 모든 학생 보고서에 사용합니다.
+                      (종합 보고서와 같은 기준이라 학생 보고서의 이상치 판정이 종합 보고서와 일치합니다)
+    robust=True이면 평균/표준편차 대신 중앙값/MAD를 기준으로 사용합니다.
+    cohort_stats가 주어지면(z_scope="cohort") df로 다시 계산하지 않고 그 기준을 사용합니다
+    (예: cohort_stats.IncrementalScorer 로 누적 계산한 기준).
+    workers가 1 이하이면 현재 프로세스에서 순서대로 생성합니다. (None이면 CPU 수)
+    반환값: {이름: 저장한 파일 경로}
+    """
+    if z_scope not in Z_SCOPES:
+        raise ValueError(f"지원하지 않는 Z-score 기준입니다: {z_scope} ({', '.join(Z_SCOPES)})")
+
+    week_range = week_range if week_range is not None else load_week_range()
+    if z_scope == "cohort" and cohort_stats is None:
+        cohort_stats = compute_cohort_stats(df, robust=robust)
+    tasks = []
+    selected = set(names) if names is not None else None
+    names = []
+    for name, group_df in df.groupby('이름'):
+        if selected is not None and name not in selected:
+            continue
+        names.append(name)
+        if z_scope == "cohort":
+            stats = cohort_stats
+        else:
+            stats = compute_cohort_stats(group_df, robust=True) if robust else None
+        tasks.append((group_df, output_template.format(name=name), title_template.format(name=name),
+                      stats, week_range))
+
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(tasks) > 1:
+        workers = min(workers, len(tasks))
+        # 학생 수가 많으면 여러 학생을 한 번에 넘겨 프로세스 간 왕복 횟수를 줄입니다.
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            paths = list(executor.map(_render_student_report, tasks, chunksize=chunksize))
+    else:
+        paths = [_render_student_report(task) for task in tasks]
+    return dict(zip(names, paths))
+
+
+def save_trend_tables_as_html(tables, output_path="trend_summary.html", title="주차별 추이"):
+    """
+    history_store.HistoryStore.trend 결과({지표 이름: 학생 x 주차 DataFrame})를 지표별 표로 저장합니다.
+    """
+    import pandas as pd
 
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+        f.write(_HTML_HEAD.format(title=title))
+        f.write(f"<h2>{title}</h2>\n")
+        for metric, table in tables.items():
+            if table.empty:
+                continue
+            weeks = [str(week) for week in table.columns]
+            f.write(f"<h3>{metric}</h3>\n<table>\n<thead>\n<tr><th>이름</th>")
+            f.write("".join(f"<th>{week}</th>" for week in weeks))
+            f.write("</tr>\n</thead>\n<tbody>\n")
+            _write_chunked(f, (
+                f"<tr><td>{name}</td>" + "".join("<td>-</td>" if pd.isna(value) else f"<td>{value}</td>"
+                                                  for value in values) + "</tr>"
+                for name, values in zip(table.index.tolist(), table.itertuples(index=False, name=None))
+            ))
+            f.write("</tbody></table>\n")
+        f.write("</body></html>")
 
     print(f"✅ HTML 파일 저장 완료: {output_path}")
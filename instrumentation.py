@@ -0,0 +1,281 @@
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# 현재 분석 중인 학생 키(GitHub 사용자명). 스레드 풀 작업에는 propagate()로 감싸서 넘겨야 이어집니다.
+_current_student = contextvars.ContextVar("current_student", default=None)
+
+# enable()을 호출하기 전에는 None이며, 이때 모든 기록 함수는 아무 일도 하지 않습니다.
+_recorder = None
+
+# 학생 밖(공통 단계)에서 기록된 값을 모으는 이름
+RUN_SCOPE = "(run)"
+
+# 저장소 이름/커밋 SHA 등을 뺀 엔드포인트 분류 규칙 (앞에서부터 먼저 맞는 규칙 사용)
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"/graphql$"), "graphql"),
+    (re.compile(r"/repos/[^/]+/[^/]+/commits/[^/]+$"), "repos/:repo/commits/:sha"),
+    (re.compile(r"/repos/[^/]+/[^/]+/commits$"), "repos/:repo/commits"),
+    (re.compile(r"/repos/[^/]+/[^/]+/git/trees/[^/]+$"), "repos/:repo/git/trees/:ref"),
+    (re.compile(r"/repos/[^/]+/[^/]+/git/blobs/[^/]+$"), "repos/:repo/git/blobs/:sha"),
+    (re.compile(r"/repos/[^/]+/[^/]+$"), "repos/:repo"),
+]
+
+
+def endpoint_of(url):
+    """
+    요청 URL을 통계용 엔드포인트 이름으로 바꿉니다. (쿼리 문자열과 저장소/SHA 구분 없이 묶음)
+    """
+    parsed = urlparse(url)
+    if parsed.netloc.startswith("raw.") or parsed.path.startswith("/raw/"):
+        return "raw"
+    path = parsed.path.rstrip("/")
+    for pattern, name in _ENDPOINT_PATTERNS:
+        if pattern.search(path):
+            return name
+    return "other"
+
+
+class RunRecorder:
+    """
+    한 번의 실행 동안 단계별 소요 시간, HTTP 요청, 캐시 사용을 학생별로 모읍니다.
+    단계 시간은 중첩될 수 있고(예: similarity 안의 prettier), 스레드 풀에서 동시에 진행된 시간은 합산됩니다.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self.stages = defaultdict(lambda: [0, 0.0])          # (학생, 단계) -> [횟수, 초]
+        self.http = defaultdict(lambda: [0, 0, 0.0])         # (학생, 엔드포인트, 상태 코드) -> [횟수, 바이트, 초]
+        self.cache = defaultdict(int)                        # (학생, 결과) -> 횟수
+        self.student_seconds = {}                            # 학생 -> 분석 경과 시간(초)
+        self.student_names = {}                              # 학생 -> 표시 이름 (실제 이름)
+
+    def add_stage(self, student, stage, seconds):
+        with self._lock:
+            entry = self.stages[(student, stage)]
+            entry[0] += 1
+            entry[1] += seconds
+
+    def add_http(self, student, endpoint, status, nbytes, seconds):
+        with self._lock:
+            entry = self.http[(student, endpoint, status)]
+            entry[0] += 1
+            entry[1] += nbytes
+            entry[2] += seconds
+
+    def add_cache(self, student, outcome):
+        with self._lock:
+            self.cache[(student, outcome)] += 1
+
+    def add_student(self, student, seconds, name=None):
+        with self._lock:
+            self.student_seconds[student] = self.student_seconds.get(student, 0.0) + seconds
+            if name is not None:
+                self.student_names[student] = name
+
+    def slowest_students(self, n=5):
+        with self._lock:
+            items = sorted(self.student_seconds.items(), key=lambda item: item[1], reverse=True)
+        return items[:n]
+
+    def report(self, rate_limit=None, cache_stats=None):
+        """
+        JSON으로 저장할 수 있는 실행 보고서(dict)를 만듭니다.
+        rate_limit: RateLimitScheduler.budget_report() 결과, cache_stats: ResponseCache.stats() 결과
+        """
+        with self._lock:
+            students = defaultdict(lambda: {"name": None, "seconds": None, "stages": {}, "http": {}, "cache": {}})
+            totals = {"stages": defaultdict(lambda: {"count": 0, "seconds": 0.0}),
+                      "http": defaultdict(lambda: {"count": 0, "bytes": 0, "seconds": 0.0, "statuses": {}}),
+                      "cache": defaultdict(int)}
+
+            for (student, stage), (count, seconds) in self.stages.items():
+                students[student]["stages"][stage] = {"count": count, "seconds": round(seconds, 4)}
+                totals["stages"][stage]["count"] += count
+                totals["stages"][stage]["seconds"] += seconds
+            for (student, endpoint, status), (count, nbytes, seconds) in self.http.items():
+                entry = students[student]["http"].setdefault(
+                    endpoint, {"count": 0, "bytes": 0, "seconds": 0.0, "statuses": {}})
+                for target in (entry, totals["http"][endpoint]):
+                    target["count"] += count
+                    target["bytes"] += nbytes
+                    target["seconds"] += seconds
+                    target["statuses"][str(status)] = target["statuses"].get(str(status), 0) + count
+            for (student, outcome), count in self.cache.items():
+                students[student]["cache"][outcome] = count
+                totals["cache"][outcome] += count
+            for student, seconds in self.student_seconds.items():
+                students[student]["seconds"] = round(seconds, 4)
+                students[student]["name"] = self.student_names.get(student)
+
+        for entry in list(totals["http"].values()) + [e for s in students.values() for e in s["http"].values()]:
+            entry["seconds"] = round(entry["seconds"], 4)
+        for entry in totals["stages"].values():
+            entry["seconds"] = round(entry["seconds"], 4)
+
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "wall_seconds": round(time.time() - self.started_at, 4),
+            "totals": {key: dict(value) for key, value in totals.items()},
+            "students": dict(students),
+            "rate_limit": rate_limit or {},
+            "cache": cache_stats or {},
+        }
+
+
+def enable():
+    """
+    계측을 켜고 새 RunRecorder를 반환합니다.
+    """
+    global _recorder
+    _recorder = RunRecorder()
+    return _recorder
+
+
+def disable():
+    global _recorder
+    _recorder = None
+
+
+def get_recorder():
+    return _recorder
+
+
+def current_student():
+    return _current_student.get() or RUN_SCOPE
+
+
+@contextmanager
+def student(key, name=None):
+    """
+    이 블록에서 기록되는 값을 key 학생에게 귀속시키고, 블록 전체 시간을 학생의 분석 시간으로 기록합니다.
+    key는 학생마다 달라야 하므로 GitHub 사용자명을 넘기고, 실제 이름(name)은 보고서의 표시용으로만 씁니다.
+    """
+    token = _current_student.set(key)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _recorder is not None:
+            _recorder.add_student(key, time.perf_counter() - started, name=name)
+        _current_student.reset(token)
+
+
+@contextmanager
+def stage(name):
+    """
+    블록의 소요 시간을 현재 학생의 name 단계로 기록합니다. 계측이 꺼져 있으면 아무것도 하지 않습니다.
+    """
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_stage(current_student(), name, time.perf_counter() - started)
+
+
+def propagate(func):
+    """
+    현재 컨텍스트(학생 이름)를 스레드 풀 작업에도 이어지도록 func를 감쌉니다.
+    """
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        # 같은 Context를 여러 스레드가 동시에 실행할 수 없으므로 호출마다 복사합니다.
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+def record_http(url, status, nbytes, seconds):
+    recorder = _recorder
+    if recorder is not None:
+        recorder.add_http(current_student(), endpoint_of(url), status, nbytes, seconds)
+
+
+def record_cache(outcome):
+    """
+    outcome: "hit"(네트워크 없이 사용), "revalidated"(304), "miss"
+    """
+    recorder = _recorder
+    if recorder is not None:
+        recorder.add_cache(current_student(), outcome)
+
+
+def write_json_report(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def write_prometheus_textfile(report, path, prefix="commit_analyzer"):
+    """
+    node_exporter textfile collector 형식으로 보고서를 저장합니다.
+    수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다.
+    """
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{_label(val)}"' for key, val in labels.items())
+            lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+    students = report["students"]
+    metric("stage_seconds_total", "counter", "Time spent per stage and student (nested stages overlap).",
+           [({"student": s, "stage": stage}, info["seconds"])
+            for s, data in students.items() for stage, info in data["stages"].items()])
+    metric("http_requests_total", "counter", "HTTP requests per endpoint, status and student.",
+           [({"student": s, "endpoint": endpoint, "status": status}, count)
+            for s, data in students.items() for endpoint, info in data["http"].items()
+            for status, count in info["statuses"].items()])
+    metric("http_response_bytes_total", "counter", "Response bytes per endpoint and student.",
+           [({"student": s, "endpoint": endpoint}, info["bytes"])
+            for s, data in students.items() for endpoint, info in data["http"].items()])
+    metric("cache_lookups_total", "counter", "Response cache lookups per outcome and student.",
+           [({"student": s, "outcome": outcome}, count)
+            for s, data in students.items() for outcome, count in data["cache"].items()])
+    metric("student_seconds", "gauge", "Wall time spent analyzing each student.",
+           [({"student": s, "name": data["name"] or s}, data["seconds"])
+            for s, data in students.items() if data["seconds"] is not None])
+    metric("rate_limit_remaining", "gauge", "Remaining GitHub API budget per token (last 4 characters).",
+           [({"token": token}, info["remaining"]) for token, info in report["rate_limit"].items()
+            if info.get("remaining") is not None])
+    metric("run_wall_seconds", "gauge", "Wall time of the whole run.", [({}, report["wall_seconds"])])
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(temp_path, path)
+
+
+def print_slowest_students(n=5):
+    recorder = _recorder
+    if recorder is None:
+        return
+    slowest = recorder.slowest_students(n)
+    if not slowest:
+        return
+    students = recorder.report()["students"]
+    print(f"🐢 가장 오래 걸린 학생 {len(slowest)}명:")
+    for rank, (key, seconds) in enumerate(slowest, start=1):
+        data = students.get(key, {})
+        name = f"{data['name']} ({key})" if data.get("name") and data["name"] != key else key
+        stages = sorted(data.get("stages", {}).items(), key=lambda item: item[1]["seconds"], reverse=True)[:3]
+        detail = "".join(f", {stage} {info['seconds']:.1f}s" for stage, info in stages)
+        requests_count = sum(info["count"] for info in data.get("http", {}).values())
+        print(f"   {rank}. {name}: {seconds:.1f}초 (요청 {requests_count}회{detail})")
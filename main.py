@@ -1,60 +1,388 @@
-import pandas as pd
-from git_analyzer import analyze_commits, RepoNotFoundError
-from html_parser import save_dataframe_as_html
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
+import instrumentation
+from html_parser import Z_SCOPES
+from run_journal import RunJournal
+from similarity import MODES as SIMILARITY_MODES
+from week_config import load_week_ranges
 
-def analyze_multiple_users(account_file, branch="main"):
+# pandas/numpy/requests는 git_analyzer/html_parser의 함수 안에서, plagiarism/history_store는 필요한 함수 안에서
+# 불러옵니다. 그래야 cli.py의 가벼운 명령과 --help가 과학 계산 라이브러리를 기다리지 않습니다.
+
+
+def _account_fields(line):
+    """
+    users_account.txt 의 한 줄을 (저장소 URL, GitHub 사용자명, 토큰, 실제 이름)으로 나눕니다.
+    실제 이름이 없으면 사용자명을 사용합니다.
+    """
+    parts = line.strip().split(",")
+    github_url, token, username = parts[0], parts[1], parts[2]
+    return github_url, username, token, parts[3] if len(parts) > 3 else username
+
+
+def _analyze_account_line(line, branch="main", journal=None, journal_key=None, **analyze_options):
+    """
+    users_account.txt 의 한 줄을 분석하여 DataFrame(또는 None)을 반환합니다.
+    오류는 해당 줄에서만 출력하고 삼켜서, 다른 학생의 분석에 영향을 주지 않습니다.
+    analyze_options는 analyze_commits에 그대로 전달됩니다 (concurrency, incremental_store 등).
+    journal(RunJournal)이 주어지면 분석이 끝나는 즉시 결과를 journal_key로 저장합니다 (오류가 난 경우 제외).
+    """
+    from git_analyzer import analyze_commits, RepoNotFoundError
+
+    try:
+        github_url, username, token, actual_name = _account_fields(line)
+
+        print(f"🔍 분석 중: {actual_name} ({github_url})")
+
+        # 실제 이름을 analyze_commits 함수로 전달 (계측이 켜져 있으면 이 학생의 시간/요청으로 기록)
+        # 계측은 실제 이름이 겹치는 학생끼리 섞이지 않도록 GitHub 사용자명으로 모으고, 실제 이름은 표시용으로만 남깁니다.
+        with instrumentation.student(username, name=actual_name):
+            df = analyze_commits(github_url, token, username, directory="lib/", branch=branch,
+                                 exclude_first_commit=True, user_actual_name=actual_name, **analyze_options)
+        if journal is not None and journal_key is not None:
+            journal.save(journal_key, None if df.empty else df)
+
+        if not df.empty:
+            return df
+        print(f"⚠️  {actual_name} 에 대한 커밋 데이터 없음.")
+    except RepoNotFoundError as e:
+        print(f"❌ 오류 발생: {e}")
+    except Exception as e:
+        print(f"❌ 오류 발생 (줄 내용: {line.strip()}): {e}")
+    return None
+
+
+def _student_labels(all_results):
+    """
+    학생별 결과 DataFrame 목록으로 {GitHub 사용자명: 보고서에 표시할 이름}을 만듭니다.
+    실제 이름이 같은 학생이 여럿이면 "이름 (사용자명)"으로 구분합니다.
+    """
+    names = {df["user"].iloc[0]: df["이름"].iloc[0] for df in all_results}
+    counts = Counter(names.values())
+    return {user: f"{name} ({user})" if counts[name] > 1 else name for user, name in names.items()}
+
+
+def _write_week_reports(df, week_range, suspicious_pairs, z_scope, report_workers, history_store, rows_by_user,
+                        suffix="", names=None, robust=False, cohort_stats=None):
+    """
+    한 주차의 분석 결과로 기록 저장소 추가, 종합 HTML, 학생별 HTML 보고서를 생성합니다.
+    suffix는 여러 주차를 한 번에 분석할 때 파일 이름을 구분하는 데 사용합니다 (예: "_week09").
+    names가 주어지면 학생별 보고서는 그 학생들만 다시 생성합니다.
+    cohort_stats(이 주차의 Z-score 기준)가 없으면 df로 계산하며, robust=True이면 중앙값/MAD를 사용합니다.
+    """
+    from html_parser import save_dataframe_as_html, save_student_reports, compute_cohort_stats
+
+    if cohort_stats is None and robust:
+        cohort_stats = compute_cohort_stats(df, robust=True)
+    week_label = week_range[0]
+    if history_store is not None:
+        for user, rows in rows_by_user.items():
+            history_store.append_raw(week_label, user, rows)
+        history_store.append_summary(week_label, df)
+        print(f"🗄️ {week_label} 기록을 {history_store.root}에 추가했습니다.")
+
+    # 전체 사용자를 합한 종합 HTML 파일 생성
+    output_path = f"commit_summary{suffix}.html"
+    title = f"{week_label} 전체 파일별 커밋 통계" if suffix else "전체 파일별 커밋 통계"
+    save_dataframe_as_html(df, output_path=output_path, title=title,
+                           suspicious_pairs=suspicious_pairs, cohort_stats=cohort_stats, week_range=week_range)
+    print(f"✅ 전체 사용자의 종합 HTML 보고서가 {output_path}로 생성되었습니다.")
+
+    # 사용자별로 HTML 파일 생성
+    with instrumentation.stage("student_reports"):
+        reports = save_student_reports(df, output_template=f"commit_summary{suffix}({{name}}).html",
+                                       title_template=f"{week_label} {{name}} 파일별 커밋 통계" if suffix
+                                       else "{name} 파일별 커밋 통계",
+                                       z_scope=z_scope, workers=report_workers, week_range=week_range,
+                                       names=names, robust=robust, cohort_stats=cohort_stats)
+    for name, output_filename in reports.items():
+        print(f"✅ {name}의 HTML 보고서가 {output_filename}으로 생성되었습니다.")
+
+
+def write_reports(combined_df, week_ranges, suspicious_pairs=None, z_scope="student", report_workers=None,
+                  history_store=None, rows_by_user=None, names=None, robust=False, cohort_stats_by_week=None):
+    """
+    전체 학생 결과(combined_df)로 종합/학생별 HTML 보고서를 만들고, history_store가 있으면 기록을 추가합니다.
+    주차가 하나면 기존 파일 이름(commit_summary.html)을, 여러 개면 주차마다 따로(commit_summary_week09.html) 만듭니다.
+    names가 주어지면 학생별 보고서는 그 학생들만 다시 생성합니다 (종합 보고서는 항상 생성).
+    robust=True이면 Z-score 기준으로 중앙값/MAD를 사용하고, cohort_stats_by_week({주차 라벨: 기준})가 주어지면
+    주차별 기준을 다시 계산하지 않고 그 값을 사용합니다.
+    rows_by_user는 {GitHub 사용자명: 파일별 커밋 행 목록}입니다 (실제 이름은 학생끼리 겹칠 수 있으므로 쓰지 않음).
+    """
+    rows_by_user = rows_by_user or {}
+    cohort_stats_by_week = cohort_stats_by_week or {}
+    if len(week_ranges) == 1:
+        _write_week_reports(combined_df, week_ranges[0], suspicious_pairs, z_scope, report_workers,
+                            history_store, rows_by_user, names=names, robust=robust,
+                            cohort_stats=cohort_stats_by_week.get(week_ranges[0][0]))
+        return
+
+    for week_range in week_ranges:
+        week_df = combined_df[combined_df["week_label"] == week_range[0]]
+        if week_df.empty:
+            print(f"⚠️ {week_range[0]} 에 해당하는 커밋 데이터가 없습니다.")
+            continue
+        week_rows = {user: [{key: value for key, value in row.items() if key != "week_label"}
+                            for row in rows if row["week_label"] == week_range[0]]
+                     for user, rows in rows_by_user.items()}
+        _write_week_reports(week_df.reset_index(drop=True), week_range, suspicious_pairs, z_scope,
+                            report_workers, history_store, week_rows, suffix=f"_{week_range[0]}", names=names,
+                            robust=robust, cohort_stats=cohort_stats_by_week.get(week_range[0]))
+
+
+def analyze_multiple_users(account_file, branch="main", workers=1, plagiarism_threshold=None, report_workers=None,
+                           z_scope="student", history_store=None, journal=None, resume=False, robust_z=False,
+                           similarity_workers=None, write_html=True, **analyze_options):
     """
     users_account.txt 파일에서 정보를 읽어와 여러 사용자의 Git 커밋을 분석하고,
     사용자별 및 전체 HTML 요약 보고서를 생성합니다.
+
+    workers가 2 이상이면 최대 workers명의 학생을 동시에 분석합니다.
+    결과는 어떤 작업이 먼저 끝나든 users_account.txt 의 줄 순서대로 합쳐집니다.
+    analyze_options는 학생별 analyze_commits 호출에 그대로 전달됩니다
+    (예: concurrency=학생 한 명의 커밋 상세 정보를 동시에 조회할 최대 요청 수).
+    plagiarism_threshold(0~1)가 주어지면 같은 연습 파일에 대한 학생 간 제출 코드를 비교하여
+    의심 쌍을 suspicious_pairs.csv 와 종합 HTML 보고서에 추가합니다.
+    학생별 HTML 보고서는 최대 report_workers개 프로세스에서 생성하며(None이면 CPU 수),
+    z_scope("cohort" 또는 "student")에 따라 Z-score 기준을 전체 학생 또는 학생 본인으로 정합니다.
+    history_store(HistoryStore)가 주어지면 이번 주차의 파일별 커밋 행과 요약을 주차·학생별로 추가 저장합니다.
+    week_information.txt 에 주차가 여러 줄이면 커밋은 한 번만 조회하고, 보고서와 기록은 주차별로 따로 만듭니다
+    (all_users_summary.csv 는 week_label 컬럼을 포함한 한 파일).
+    journal(RunJournal)이 주어지면 학생별 결과를 끝나는 대로 저장하고, resume=True이면 저장된 학생은 다시 분석하지 않습니다.
+    robust_z=True이면 Z-score 기준으로 평균/표준편차 대신 중앙값/MAD를 사용합니다.
+    similarity_workers가 주어지면 학생별로 코드 유사도를 계산하지 않고, 모든 학생의 제출 파일을 모은 뒤
+    최대 similarity_workers개 프로세스에서 한 번에 계산합니다.
+    write_html=False이면 all_users_summary.csv 까지만 만들고 HTML 보고서와 기록 저장은 건너뜁니다
+    (cli.py fetch 후 cli.py render 로 따로 생성).
     """
+    import pandas as pd
+    from git_analyzer import (get_cache, get_scheduler, get_similarity_engine, prefetch_commit_histories,
+                              score_cohort_similarity)
+
+    if plagiarism_threshold is not None:
+        analyze_options["collect_sources"] = True
+    if history_store is not None:
+        analyze_options["collect_rows"] = True
+    if similarity_workers is not None:
+        analyze_options["defer_similarity"] = True
+
+    # week_information.txt 에 여러 주차가 있으면 모든 주차를 포함하는 범위를 한 번만 조회한 뒤 주차별로 나눕니다.
+    week_ranges = load_week_ranges()
+    multi_week = len(week_ranges) > 1
+    if multi_week:
+        analyze_options["week_ranges"] = week_ranges
+        print(f"📅 {len(week_ranges)}개 주차({', '.join(label for label, _, _ in week_ranges)})를 한 번에 분석합니다.")
+
     with open(account_file, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+        lines = [line for line in f.readlines() if line.strip()]
 
-    all_results = []
+    # 실행 일지: 저장소 URL/브랜치/주차 범위와 결과에 영향을 주는 분석 옵션이 같은 학생의 결과만 이어서 사용합니다.
+    # (예: 유사도 계산을 미룬 실행의 결과를 유사도를 채우지 않는 실행에서 그대로 쓰지 않도록)
+    finished = {}
+    journal_keys = {}
+    if journal is not None:
+        engine = get_similarity_engine()
+        journal_options = {
+            "backend": analyze_options.get("backend", "rest"),
+            "similarity": (engine.mode, engine.cutoff),
+            "defer_similarity": analyze_options.get("defer_similarity", False),
+            "collect_sources": analyze_options.get("collect_sources", False),
+            "collect_rows": analyze_options.get("collect_rows", False),
+        }
+        # 필드가 부족한 줄은 일지에 남기지 않습니다 (분석 단계에서 오류로 보고됨).
+        journal_keys = {line: RunJournal.make_key(*_account_fields(line)[:2], branch, week_ranges, journal_options)
+                        for line in lines if len(line.split(",")) >= 3}
+        # 계정 목록에서 빠졌거나 URL/사용자명이 바뀐 학생, 옵션이 다른 실행의 항목은 남겨 두지 않습니다.
+        journal.prune(journal_keys.values())
+        for line, key in journal_keys.items():
+            if not resume:
+                journal.discard(key)
+                continue
+            found, df = journal.load(key)
+            if found:
+                if df is not None:
+                    # 실제 이름은 키에 들어가지 않으므로 계정 목록의 현재 이름으로 맞춥니다.
+                    df["이름"] = _account_fields(line)[3]
+                finished[line] = df
+        if resume:
+            print(f"⏭️ 실행 일지에서 {len(finished)}명의 결과를 불러왔습니다. 남은 {len(lines) - len(finished)}명을 분석합니다.")
+    pending = [line for line in lines if line not in finished]
 
-    for line in lines:
-        if not line.strip():
-            continue
+    def analyze_line(line):
+        return _analyze_account_line(line, branch, journal=journal, journal_key=journal_keys.get(line),
+                                     **analyze_options)
+
+    if pending and analyze_options.get("backend") == "graphql" and "commit_histories" not in analyze_options:
+        # 모든 학생 저장소의 커밋 기록을 GraphQL 별칭 쿼리 몇 번으로 미리 모읍니다.
+        # 실패하면 학생별로 각자 조회하도록 그냥 넘어갑니다.
         try:
-            parts = line.strip().split(",")
-            github_url, token, username = parts[0], parts[1], parts[2]
-            actual_name = parts[3] if len(parts) > 3 else username  # 실제 이름을 가져옴
-
-            print(f"🔍 분석 중: {actual_name} ({github_url})")
-
-            # 실제 이름을 analyze_commits 함수로 전달
-            df = analyze_commits(github_url, token, username, directory="lib/", exclude_first_commit=True,
-                                 user_actual_name=actual_name)
-
-            if not df.empty:
-                all_results.append(df)
-            else:
-                print(f"⚠️  {actual_name} 에 대한 커밋 데이터 없음.")
-        except RepoNotFoundError as e:
-            print(f"❌ 오류 발생: {e}")
+            accounts = [tuple(line.strip().split(",")[:2]) for line in pending]
+            analyze_options["commit_histories"] = prefetch_commit_histories(
+                accounts, branch=branch, week_ranges=week_ranges if multi_week else None)
         except Exception as e:
-            print(f"❌ 오류 발생 (줄 내용: {line.strip()}): {e}")
+            print(f"⚠️ GraphQL 일괄 조회 실패, 학생별로 조회합니다: {e}")
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # executor.map은 입력 순서대로 결과를 돌려주므로 완료 순서와 무관하게 결정적입니다.
+            pending_results = list(executor.map(analyze_line, pending))
+    else:
+        pending_results = [analyze_line(line) for line in pending]
+
+    # 일지에서 불러온 결과와 새로 분석한 결과를 users_account.txt 의 줄 순서대로 합칩니다.
+    results = dict(finished)
+    results.update(zip(pending, pending_results))
+    all_results = [results[line] for line in lines if results[line] is not None]
+
+    if similarity_workers is not None:
+        print(f"🧮 전체 학생의 코드 유사도를 최대 {similarity_workers}개 프로세스에서 계산합니다.")
+        score_cohort_similarity(all_results, workers=similarity_workers)
+
+    # 토큰별 남은 GitHub API 예산 출력
+    get_scheduler().print_budget_report()
+    cache = get_cache()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"📦 캐시: 적중 {stats['hits']}회, 미적중 {stats['misses']}회, 304 재검증 {stats['revalidated']}회, "
+              f"{stats['entries']}개 항목 ({stats['bytes'] / 1024 / 1024:.1f} MB)")
+
+    suspicious_pairs = None
+    if plagiarism_threshold is not None:
+        submissions = [
+            (df["user"].iloc[0], filename, code)
+            for df in all_results
+            for filename, code in df.attrs.get("sources", {}).items()
+        ]
+        from plagiarism import find_suspicious_pairs
+        with instrumentation.stage("plagiarism"):
+            suspicious_pairs = find_suspicious_pairs(submissions, threshold=plagiarism_threshold,
+                                                     labels=_student_labels(all_results))
+        suspicious_pairs.to_csv("suspicious_pairs.csv", index=False)
+        print(f"🕵️ 학생 간 의심 유사 제출 {len(suspicious_pairs)}쌍을 suspicious_pairs.csv에 저장했습니다.")
 
     if all_results:
+        rows_by_user = {df["user"].iloc[0]: df.attrs.pop("rows", []) for df in all_results} \
+            if history_store is not None else {}
+
         combined_df = pd.concat(all_results, ignore_index=True)
         combined_df.to_csv("all_users_summary.csv", index=False)
         print("✅ 모든 사용자의 분석 데이터가 all_users_summary.csv에 저장되었습니다.")
 
-        # 전체 사용자를 합한 종합 HTML 파일 생성
-        save_dataframe_as_html(combined_df, output_path="commit_summary.html", title="전체 파일별 커밋 통계")
-        print("✅ 전체 사용자의 종합 HTML 보고서가 commit_summary.html로 생성되었습니다.")
-
-        # 사용자별로 HTML 파일 생성
-        grouped_by_name = combined_df.groupby('이름')
-        for name, group_df in grouped_by_name:
-            output_filename = f"commit_summary({name}).html"
-            save_dataframe_as_html(group_df, output_path=output_filename, title=f"{name} 파일별 커밋 통계")
-            print(f"✅ {name}의 HTML 보고서가 {output_filename}으로 생성되었습니다.")
+        if not write_html:
+            print("ℹ️ HTML 보고서는 생성하지 않았습니다. python cli.py render 로 생성할 수 있습니다.")
+            return
+        write_reports(combined_df, week_ranges, suspicious_pairs=suspicious_pairs, z_scope=z_scope,
+                      report_workers=report_workers, history_store=history_store, rows_by_user=rows_by_user,
+                      robust=robust_z)
     else:
         print("❗ 분석할 커밋 데이터가 없습니다.")
 
 
+def add_arguments(parser):
+    """
+    분석 실행 옵션을 parser에 추가합니다 (main.py 와 cli.py fetch/analyze 가 같은 옵션을 사용).
+    """
+    parser.add_argument("account_file", nargs="?", default="users_account.txt",
+                        help="분석할 계정 목록 파일 (기본값: users_account.txt)")
+    parser.add_argument("--branch", default="main", help="분석할 브랜치 (기본값: main)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="동시에 분석할 학생 수 (기본값: 1, 순차 처리)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="학생별 커밋 상세 정보를 동시에 조회할 최대 요청 수 (기본값: 1, 순차 처리)")
+    parser.add_argument("--cache", metavar="PATH", default=None,
+                        help="GitHub 응답을 저장할 SQLite 캐시 파일 경로 (지정하지 않으면 캐시 사용 안 함)")
+    parser.add_argument("--cache-size-mb", type=int, default=512,
+                        help="캐시 최대 크기(MB). 넘으면 오래 사용하지 않은 항목부터 삭제 (기본값: 512)")
+    parser.add_argument("--incremental", metavar="DIR", default=None,
+                        help="저장소별 워터마크를 저장할 디렉토리. 지정하면 새 커밋만 조회하여 병합합니다.")
+    parser.add_argument("--backend", choices=["rest", "git", "graphql"], default="rest",
+                        help="커밋 수집 방식: rest(GitHub REST API), git(로컬 bare mirror clone) "
+                             "또는 graphql(GraphQL 일괄 조회 + 필요한 커밋만 REST 상세 조회)")
+    parser.add_argument("--mirror-root", default=".mirrors",
+                        help="--backend git 사용 시 mirror clone을 보관할 디렉토리 (기본값: .mirrors)")
+    parser.add_argument("--similarity-mode", choices=SIMILARITY_MODES, default="char",
+                        help="코드 유사도 비교 단위: char(기존), line, token (기본값: char)")
+    parser.add_argument("--similarity-cutoff", type=float, default=None,
+                        help="상한 추정치가 이 값(0~100) 미만이면 정밀 비교를 생략하고 유사도를 NaN(기준 미달)으로 "
+                             "표시합니다. 보고서의 유사도 기준(85) 이하로 지정하세요 (예: 85)")
+    parser.add_argument("--similarity-workers", type=int, default=None,
+                        help="지정하면 코드 유사도를 학생별로 계산하지 않고 전체 학생을 모아 이 수만큼의 프로세스에서 "
+                             "한 번에 계산합니다 (같은 제출 내용은 한 번만 비교)")
+    parser.add_argument("--plagiarism-threshold", type=float, default=None,
+                        help="학생 간 표절 검사 기준 Jaccard 유사도(0~1, 예: 0.6). 지정하면 검사를 수행합니다.")
+    parser.add_argument("--report-workers", type=int, default=None,
+                        help="학생별 HTML 보고서를 생성할 프로세스 수 (기본값: CPU 수, 1이면 순차 처리)")
+    parser.add_argument("--z-scope", choices=Z_SCOPES, default="student",
+                        help="학생별 보고서의 Z-score 기준: cohort(전체 학생, 종합 보고서와 동일) "
+                             "또는 student(학생 본인의 파일만) (기본값: student)")
+    parser.add_argument("--robust-z", action="store_true",
+                        help="Z-score 기준으로 평균/표준편차 대신 중앙값/MAD를 사용합니다 (극단값에 덜 민감)")
+    parser.add_argument("--history", metavar="DIR", default=None,
+                        help="주차별 커밋 행과 요약을 Parquet으로 쌓아 둘 디렉토리 (선택 의존성 pyarrow 필요: pip install pyarrow). "
+                             "추이 표는 python history_store.py --root DIR 로 조회합니다.")
+    parser.add_argument("--journal", metavar="DIR", default=None,
+                        help="학생별 분석 결과를 끝나는 대로 저장할 실행 일지 디렉토리 "
+                             "(지정하지 않으면 일지를 쓰지 않음, --resume만 주면 .journal)")
+    parser.add_argument("--resume", action="store_true",
+                        help="실행 일지에 결과가 있는 학생(같은 저장소/브랜치/주차 범위/분석 옵션)은 "
+                             "다시 분석하지 않고 이어서 실행합니다")
+    parser.add_argument("--metrics-json", metavar="PATH", default=None,
+                        help="단계별 시간, 엔드포인트별 요청 수, 캐시/예산 현황을 학생별로 기록한 JSON 실행 보고서 경로 "
+                             "(지정하면 계측을 켭니다)")
+    parser.add_argument("--metrics-prom", metavar="PATH", default=None,
+                        help="같은 지표를 Prometheus textfile(node_exporter) 형식으로 저장할 경로")
+    parser.add_argument("--top-slowest", type=int, default=5,
+                        help="계측이 켜져 있을 때 마지막에 출력할 가장 느린 학생 수 (기본값: 5)")
+    return parser
+
+
+def run(args, write_html=True):
+    """
+    add_arguments로 만든 옵션(args)대로 전체 분석을 실행합니다.
+    """
+    from git_analyzer import configure_cache, configure_http_pool, get_cache, get_scheduler, set_similarity_engine
+    from history_store import HistoryStore
+    from similarity import SimilarityEngine
+    from watermark_store import WatermarkStore
+
+    set_similarity_engine(SimilarityEngine(args.similarity_mode, cutoff=args.similarity_cutoff))
+    # 동시에 분석하는 학생들의 상세 조회가 모두 같은 keep-alive 연결 풀을 쓰도록 크기를 맞춥니다.
+    configure_http_pool(args.workers * args.concurrency)
+
+    if args.cache:
+        configure_cache(args.cache, max_bytes=args.cache_size_mb * 1024 * 1024)
+
+    analyze_options = {"concurrency": args.concurrency, "backend": args.backend, "mirror_root": args.mirror_root}
+    if args.incremental:
+        analyze_options["incremental_store"] = WatermarkStore(args.incremental)
+
+    if args.metrics_json or args.metrics_prom:
+        instrumentation.enable()
+
+    journal_dir = args.journal or (".journal" if args.resume else None)
+
+    analyze_multiple_users(args.account_file, branch=args.branch, workers=args.workers,
+                           plagiarism_threshold=args.plagiarism_threshold, report_workers=args.report_workers,
+                           z_scope=args.z_scope, history_store=HistoryStore(args.history) if args.history else None,
+                           journal=RunJournal(journal_dir) if journal_dir else None, resume=args.resume,
+                           robust_z=args.robust_z, similarity_workers=args.similarity_workers, write_html=write_html,
+                           **analyze_options)
+
+    recorder = instrumentation.get_recorder()
+    if recorder is not None:
+        cache = get_cache()
+        run_report = recorder.report(rate_limit=get_scheduler().budget_report(),
+                                     cache_stats=cache.stats() if cache is not None else None)
+        if args.metrics_json:
+            instrumentation.write_json_report(run_report, args.metrics_json)
+            print(f"⏱️ 실행 계측 보고서를 {args.metrics_json}에 저장했습니다.")
+        if args.metrics_prom:
+            instrumentation.write_prometheus_textfile(run_report, args.metrics_prom)
+            print(f"⏱️ Prometheus 지표를 {args.metrics_prom}에 저장했습니다.")
+        instrumentation.print_slowest_students(args.top_slowest)
+
+
 if __name__ == "__main__":
-    users_account_file = "users_account.txt"
-    analyze_multiple_users(users_account_file)
+    run(add_arguments(argparse.ArgumentParser(description="GitHub 커밋 분석 보고서 생성")).parse_args())
@@ -0,0 +1,141 @@
+import zlib
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from similarity import tokenize
+
+# 이름을 바꿔도 같은 지문이 나오도록 식별자는 하나의 기호로 바꾸되, 키워드는 그대로 둡니다.
+JS_KEYWORDS = frozenset("""
+break case catch class const continue debugger default delete do else export extends false finally for
+function if import in instanceof let new null of return super switch this throw true try typeof undefined
+var void while with yield async await static get set
+""".split())
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_tokens(code):
+    """
+    주석을 버리고, 식별자/숫자/문자열을 각각 하나의 기호로 바꾼 토큰 목록을 반환합니다.
+    """
+    normalized = []
+    for token in tokenize(code):
+        if token.startswith("//") or token.startswith("/*"):
+            continue
+        first = token[0]
+        if first.isalpha() or first in "_$":
+            normalized.append(token if token in JS_KEYWORDS else "I")
+        elif first.isdigit():
+            normalized.append("N")
+        elif first in "\"'`":
+            normalized.append("S")
+        else:
+            normalized.append(token)
+    return normalized
+
+
+def winnow(code, k=5, window=4):
+    """
+    정규화된 토큰의 k-gram 해시에 winnowing(window 안의 최솟값 선택)을 적용한 지문 집합을 반환합니다.
+    """
+    tokens = normalize_tokens(code)
+    if len(tokens) < k:
+        if not tokens:
+            return set()
+        return {zlib.crc32("\x1f".join(tokens).encode("utf-8"))}
+
+    hashes = [zlib.crc32("\x1f".join(tokens[i:i + k]).encode("utf-8")) for i in range(len(tokens) - k + 1)]
+    if len(hashes) <= window:
+        return {min(hashes)}
+
+    fingerprints = set()
+    for i in range(len(hashes) - window + 1):
+        fingerprints.add(min(hashes[i:i + window]))
+    return fingerprints
+
+
+class MinHashLSH:
+    """
+    지문 집합의 MinHash 서명을 bands x rows 로 나누어 버킷에 넣고,
+    한 band 라도 같은 버킷에 들어간 항목 쌍을 후보로 돌려줍니다.
+    """
+
+    def __init__(self, num_perm=128, bands=32, seed=1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm은 bands로 나누어떨어져야 합니다.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._buckets = defaultdict(list)
+
+    def signature(self, fingerprints):
+        values = np.fromiter(fingerprints, dtype=np.uint64, count=len(fingerprints))
+        hashed = (self._a[:, None] * values[None, :] + self._b[:, None]) % np.uint64(_MERSENNE_PRIME)
+        return hashed.min(axis=1)
+
+    def insert(self, key, fingerprints):
+        if not fingerprints:
+            return
+        signature = self.signature(fingerprints)
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            self._buckets[(band, chunk.tobytes())].append(key)
+
+    def candidate_pairs(self):
+        pairs = set()
+        for keys in self._buckets.values():
+            if len(keys) > 1:
+                for a, b in combinations(sorted(set(keys)), 2):
+                    pairs.add((a, b))
+        return pairs
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def find_suspicious_pairs(submissions, threshold=0.5, k=5, window=4, num_perm=128, bands=32, labels=None):
+    """
+    학생 간 제출 코드를 연습 파일 경로별로 비교하여 의심스러운 쌍을 찾습니다.
+
+    submissions: (학생 키, 파일 경로, 코드) 목록. 학생 키는 학생마다 달라야 하므로
+                 실제 이름 대신 GitHub 사용자명이나 저장소 URL을 사용합니다.
+    labels: {학생 키: 보고서에 표시할 이름} (없는 키는 키를 그대로 표시)
+    LSH로 후보 쌍만 고른 뒤 실제 지문 집합의 Jaccard 유사도가 threshold 이상인 쌍을 반환합니다.
+    반환값: 파일, 이름 A, 이름 B, 유사도 (%) 컬럼의 DataFrame (유사도 내림차순)
+    """
+    labels = labels or {}
+    by_path = defaultdict(dict)
+    for student, path, code in submissions:
+        if code is None:
+            continue
+        by_path[path][student] = winnow(code, k=k, window=window)
+
+    records = []
+    for path, fingerprints in sorted(by_path.items()):
+        if len(fingerprints) < 2:
+            continue
+        index = MinHashLSH(num_perm=num_perm, bands=bands)
+        for student, prints in fingerprints.items():
+            index.insert(student, prints)
+        for a, b in index.candidate_pairs():
+            score = jaccard(fingerprints[a], fingerprints[b])
+            if score >= threshold:
+                label_a, label_b = sorted([labels.get(a, a), labels.get(b, b)])
+                records.append({"파일": path, "이름 A": label_a, "이름 B": label_b,
+                                "유사도 (%)": round(score * 100, 2)})
+
+    columns = ["파일", "이름 A", "이름 B", "유사도 (%)"]
+    if not records:
+        return pd.DataFrame(columns=columns)
+    result = pd.DataFrame(records, columns=columns)
+    return result.sort_values(["유사도 (%)", "파일", "이름 A", "이름 B"],
+                              ascending=[False, True, True, True]).reset_index(drop=True)
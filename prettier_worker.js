@@ -0,0 +1,43 @@
+// 한 번 실행된 Node 프로세스에서 Prettier로 여러 JavaScript 코드를 포맷합니다.
+// 사용법: node prettier_worker.js <node_modules 디렉토리>
+// 입력(stdin): 한 줄에 하나씩 {"id": 1, "code": "..."}
+// 출력(stdout): 요청 순서대로 한 줄에 하나씩 {"id": 1, "ok": true, "formatted": "..."}
+//               실패 시 {"id": 1, "ok": false, "error": "..."}
+"use strict";
+
+const path = require("path");
+const readline = require("readline");
+
+const nodeModulesDir = process.argv[2] || path.join(__dirname, "..", "node_modules");
+const prettier = require(path.join(nodeModulesDir, "prettier"));
+
+const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+
+// 응답 순서를 요청 순서와 맞추기 위해 하나씩 차례로 처리합니다.
+let queue = Promise.resolve();
+
+rl.on("line", (line) => {
+  if (!line.trim()) {
+    return;
+  }
+  queue = queue.then(async () => {
+    let request;
+    try {
+      request = JSON.parse(line);
+    } catch (e) {
+      process.stdout.write(JSON.stringify({ id: null, ok: false, error: String(e) }) + "\n");
+      return;
+    }
+    try {
+      // Prettier 2.x는 문자열을, 3.x는 Promise를 반환합니다.
+      const formatted = await prettier.format(request.code, { parser: "babel" });
+      process.stdout.write(JSON.stringify({ id: request.id, ok: true, formatted }) + "\n");
+    } catch (e) {
+      process.stdout.write(JSON.stringify({ id: request.id, ok: false, error: String(e && e.message) }) + "\n");
+    }
+  });
+});
+
+rl.on("close", () => {
+  queue.then(() => process.exit(0));
+});
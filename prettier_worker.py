@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prettier_worker.js")
+
+
+class PrettierWorkerError(RuntimeError):
+    pass
+
+
+class PrettierWorker:
+    """
+    prettier_worker.js 를 실행한 Node 프로세스 하나를 계속 띄워 두고,
+    stdin/stdout 으로 여러 코드를 주고받으며 포맷합니다 (호출마다 Node를 새로 띄우지 않음).
+    """
+
+    def __init__(self, node_modules_dir, node_executable=None):
+        self.node_modules_dir = node_modules_dir
+        self.node_executable = node_executable or shutil.which("node")
+        self._process = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._process is not None and self._process.poll() is None:
+            return
+        if not self.node_executable:
+            raise PrettierWorkerError("Node.js 실행 파일을 찾을 수 없습니다.")
+        self._process = subprocess.Popen(
+            [self.node_executable, WORKER_SCRIPT, self.node_modules_dir],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding="utf-8",
+            bufsize=1,
+        )
+
+    def format_many(self, codes):
+        """
+        여러 코드를 한 번에 보내고 요청 순서대로 포맷 결과를 받습니다.
+        포맷에 실패한 코드(문법 오류 등)는 None 으로 반환합니다.
+        """
+        codes = list(codes)
+        if not codes:
+            return []
+        with self._lock:
+            self._ensure_started()
+            ids = []
+            try:
+                for code in codes:
+                    self._next_id += 1
+                    ids.append(self._next_id)
+                    self._process.stdin.write(json.dumps({"id": self._next_id, "code": code}) + "\n")
+                self._process.stdin.flush()
+
+                results = []
+                for request_id in ids:
+                    line = self._process.stdout.readline()
+                    if not line:
+                        raise PrettierWorkerError("Prettier worker가 예기치 않게 종료되었습니다.")
+                    response = json.loads(line)
+                    if response.get("id") != request_id:
+                        raise PrettierWorkerError("Prettier worker 응답 순서가 맞지 않습니다.")
+                    results.append(response["formatted"] if response.get("ok") else None)
+                return results
+            except (OSError, ValueError, PrettierWorkerError):
+                # 통신이 꼬였으면 프로세스를 버리고 다음 호출에서 새로 띄웁니다.
+                self._kill()
+                raise
+
+    def format(self, code):
+        return self.format_many([code])[0]
+
+    def _kill(self):
+        if self._process is not None:
+            try:
+                self._process.kill()
+                self._process.wait(timeout=5)
+            except Exception:
+                pass
+            self._process = None
+
+    def close(self):
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                try:
+                    self._process.stdin.close()
+                    self._process.wait(timeout=5)
+                except Exception:
+                    self._kill()
+            self._process = None
@@ -0,0 +1,203 @@
+import threading
+import time
+
+import instrumentation
+
+
+class RateLimitError(PermissionError):
+    """
+    재시도를 모두 소진한 뒤에도 GitHub API rate limit에 막혀 있을 때 발생합니다.
+    """
+    pass
+
+
+class TokenBudget:
+    """
+    토큰 하나에 대한 GitHub API 예산(X-RateLimit-*)과 token bucket 상태를 보관합니다.
+    """
+
+    def __init__(self, rate, burst, clock):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = clock()
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.request_count = 0
+        self.retry_count = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def reserve(self, now, reserve_floor):
+        """
+        요청 하나를 보낼 수 있으면 0을, 아니면 기다려야 할 시간(초)을 반환합니다.
+        """
+        with self.lock:
+            # 남은 예산이 바닥이면 reset 시각까지 기다립니다.
+            if self.remaining is not None and self.reset_at is not None \
+                    and self.remaining <= reserve_floor and now < self.reset_at:
+                return self.reset_at - now
+
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.request_count += 1
+                if self.remaining is not None:
+                    self.remaining -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def update(self, response):
+        headers = response.headers
+        with self.lock:
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset" in headers:
+                self.reset_at = float(headers["X-RateLimit-Reset"])
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "requests": self.request_count,
+                "retries": self.retry_count,
+            }
+
+
+class RateLimitScheduler:
+    """
+    모든 GitHub 요청을 토큰별 예산에 맞춰 보내는 중앙 스케줄러입니다.
+
+    - 토큰별 token bucket(rate 초당 요청 수, burst 최대 연속 요청 수)으로 요청 간격을 조절합니다.
+    - 응답의 X-RateLimit-Remaining/X-RateLimit-Reset 을 읽어 예산이 바닥나면 reset 시각까지 기다립니다.
+    - 429 또는 rate limit으로 인한 403은 Retry-After(없으면 지수 백오프)만큼 쉰 뒤 재시도합니다.
+    """
+
+    def __init__(self, session_factory=None, rate=10.0, burst=20, max_retries=5, reserve_floor=0,
+                 secondary_backoff=60.0, max_wait=900.0, clock=time.time, sleep=time.sleep):
+        if session_factory is None:
+            import requests
+            session_factory = requests.Session
+        self.session_factory = session_factory
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.reserve_floor = reserve_floor
+        self.secondary_backoff = secondary_backoff
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self._budgets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _token_key(headers):
+        auth = (headers or {}).get("Authorization", "")
+        token = auth.split(" ", 1)[-1] if auth else ""
+        # 토큰 원문은 보관/출력하지 않고 끝 4자리만 식별자로 사용합니다.
+        return f"…{token[-4:]}" if token else "anonymous"
+
+    def _budget(self, key):
+        with self._lock:
+            budget = self._budgets.get(key)
+            if budget is None:
+                budget = TokenBudget(self.rate, self.burst, self.clock)
+                self._budgets[key] = budget
+            return budget
+
+    def _acquire(self, budget):
+        while True:
+            wait = budget.reserve(self.clock(), self.reserve_floor)
+            if wait <= 0:
+                return
+            if wait > 1:
+                print(f"⏳ GitHub API 예산 대기 중: {wait:.0f}초")
+            with instrumentation.stage("rate_limit_wait"):
+                self.sleep(min(wait, self.max_wait))
+
+    def _retry_delay(self, response, attempt):
+        """
+        rate limit 응답이면 기다릴 시간(초)을, 아니면 None을 반환합니다.
+        """
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining == "0" and reset is not None:
+            return max(1.0, float(reset) - self.clock())
+
+        message = ""
+        try:
+            message = response.json().get("message", "").lower()
+        except Exception:
+            pass
+        if response.status_code == 429 or "rate limit" in message:
+            # secondary rate limit: Retry-After가 없으면 지수적으로 늘려가며 기다립니다.
+            return self.secondary_backoff * (2 ** attempt)
+        return None
+
+    def request(self, method, url, headers=None, **kwargs):
+        budget = self._budget(self._token_key(headers))
+        kwargs.setdefault("timeout", 30)
+
+        attempt = 0
+        while True:
+            self._acquire(budget)
+            started = time.perf_counter()
+            response = self.session_factory().request(method, url, headers=headers, **kwargs)
+            instrumentation.record_http(url, response.status_code, len(response.content),
+                                        time.perf_counter() - started)
+            budget.update(response)
+
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                return response
+            if attempt >= self.max_retries:
+                raise RateLimitError(
+                    f"GitHub API rate limit으로 요청이 계속 거절되었습니다 (status {response.status_code}): {url}")
+
+            with budget.lock:
+                budget.retry_count += 1
+            delay = min(delay, self.max_wait)
+            print(f"⏳ GitHub API rate limit 감지 (status {response.status_code}). {delay:.0f}초 후 재시도합니다.")
+            with instrumentation.stage("rate_limit_wait"):
+                self.sleep(delay)
+            attempt += 1
+
+    def get(self, url, headers=None, **kwargs):
+        return self.request("GET", url, headers=headers, **kwargs)
+
+    def budget_report(self):
+        """
+        토큰별(끝 4자리) 남은 예산과 요청/재시도 횟수를 반환합니다.
+        """
+        with self._lock:
+            items = list(self._budgets.items())
+        return {key: budget.snapshot() for key, budget in items}
+
+    def print_budget_report(self):
+        for key, info in self.budget_report().items():
+            remaining = "?" if info["remaining"] is None else info["remaining"]
+            limit = "?" if info["limit"] is None else info["limit"]
+            reset = ""
+            if info["reset_at"] is not None:
+                reset = f", reset {time.strftime('%H:%M:%S', time.localtime(info['reset_at']))}"
+            print(f"📊 토큰 {key}: 남은 예산 {remaining}/{limit}{reset} "
+                  f"(요청 {info['requests']}회, 재시도 {info['retries']}회)")
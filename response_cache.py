@@ -0,0 +1,172 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class CachedResponse:
+    """
+    캐시에서 꺼낸 응답을 requests.Response 처럼 다룰 수 있게 감싼 객체입니다.
+    """
+
+    def __init__(self, body, status_code=200, headers=None):
+        self.content = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """
+    GitHub 응답 본문을 zlib으로 압축하여 SQLite 파일에 저장하는 영구 캐시입니다.
+
+    - immutable 항목(SHA로 식별되는 커밋 상세, blob 등)은 만료 없이 재사용합니다.
+    - 그 외 항목은 ETag와 함께 저장해 두었다가 If-None-Match 로 재검증합니다.
+    - 저장된 본문 크기의 합이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다(LRU).
+      사용 시각은 메모리에 모아 두었다가 flush_every건마다, 또는 항목 저장/통계 조회/close 때 한 번에 기록합니다.
+    - hits/misses/revalidated는 호출하는 쪽이 실제로 응답을 캐시에서 내주었는지에 따라
+      mark_hit/mark_miss/touch로 기록합니다 (get은 조회만 하고 세지 않음).
+    """
+
+    def __init__(self, path=".github_cache.sqlite3", max_bytes=512 * 1024 * 1024, flush_every=256):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        # 아직 기록하지 않은 사용 시각 {key: 마지막 사용 시각}
+        self._pending_access = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                immutable INTEGER NOT NULL DEFAULT 0,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key):
+        """
+        (본문 bytes, etag, immutable 여부)를 반환합니다. 없으면 None.
+        조회만 하며 적중 횟수나 사용 시각은 바꾸지 않습니다.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, immutable FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]), row[1], bool(row[2])
+
+    def mark_hit(self, key):
+        """
+        네트워크 요청 없이 캐시 본문을 그대로 내준 경우입니다.
+        """
+        with self._lock:
+            self.hits += 1
+            self._note_access(key)
+
+    def mark_miss(self):
+        """
+        캐시에 없었거나, 재검증 결과 새 본문을 받아 온 경우입니다.
+        """
+        with self._lock:
+            self.misses += 1
+
+    def put(self, key, body, etag=None, immutable=False):
+        compressed = zlib.compress(body)
+        size = len(compressed)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._flush_access()
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._total_bytes -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, etag, immutable, body, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, int(immutable), compressed, size, time.time()))
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key):
+        """
+        304 Not Modified 로 재검증된 항목의 사용 시각을 갱신합니다.
+        """
+        with self._lock:
+            self.revalidated += 1
+            self._note_access(key)
+
+    def _note_access(self, key):
+        self._pending_access[key] = time.time()
+        if len(self._pending_access) >= self.flush_every:
+            self._flush_access()
+            self._conn.commit()
+
+    def _flush_access(self):
+        if not self._pending_access:
+            return
+        self._conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?",
+                               [(accessed, key) for key, accessed in self._pending_access.items()])
+        self._pending_access.clear()
+
+    def flush(self):
+        """
+        모아 둔 사용 시각을 파일에 기록합니다.
+        """
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access ASC LIMIT 64").fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def stats(self):
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {
+                "entries": count,
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+            }
+
+    def close(self):
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._conn.close()
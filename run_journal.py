@@ -0,0 +1,122 @@
+import hashlib
+import json
+import math
+import os
+import threading
+from datetime import datetime
+
+
+def _frame_to_json(df):
+    """
+    analyze_commits 결과 DataFrame(attrs의 sources/rows 포함)을 JSON으로 저장할 수 있는 dict로 바꿉니다.
+    컬럼 dtype을 함께 저장하여 불러올 때 같은 dtype으로 되돌립니다. (datetime은 ISO 문자열, NaN은 null)
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if str(series.dtype).startswith("datetime64"):
+            values = [None if value is None or value != value else value.isoformat() for value in series]
+        else:
+            values = [None if isinstance(value, float) and math.isnan(value) else value for value in series.tolist()]
+        columns[column] = {"dtype": str(series.dtype), "values": values}
+    attrs = dict(df.attrs)
+    if "rows" in attrs:
+        attrs["rows"] = [dict(row, date=row["date"].isoformat()) for row in attrs["rows"]]
+    return {"columns": columns, "attrs": attrs}
+
+
+def _frame_from_json(data):
+    import pandas as pd
+
+    df = pd.DataFrame({column: info["values"] for column, info in data["columns"].items()})
+    for column, info in data["columns"].items():
+        if info["dtype"].startswith("datetime64"):
+            df[column] = pd.to_datetime(df[column]).astype(info["dtype"])
+        elif info["dtype"] in ("str", "object"):
+            continue
+        else:
+            df[column] = df[column].astype(info["dtype"])
+    attrs = dict(data["attrs"])
+    if "rows" in attrs:
+        attrs["rows"] = [dict(row, date=datetime.fromisoformat(row["date"])) for row in attrs["rows"]]
+    df.attrs.update(attrs)
+    return df
+
+
+class RunJournal:
+    """
+    학생 한 명의 분석이 끝날 때마다 그 결과(analyze_commits DataFrame, attrs의 sources/rows 포함)를 저장해 두는 실행 일지입니다.
+
+    항목은 키(저장소 URL/GitHub 사용자명/브랜치/주차 범위/분석 옵션) 하나당 JSON 파일 하나로 directory 아래에 저장되며,
+    실행이 중간에 멈춘 뒤 --resume 으로 다시 실행하면 이미 끝난 학생은 저장된 결과를 그대로 사용합니다.
+    커밋 데이터가 없던 학생도 기록하여 다시 조회하지 않고, 오류가 난 학생은 기록하지 않아 다음 실행에서 재시도합니다.
+    다른 사람이 만든 일지 파일을 불러와도 코드가 실행되지 않도록 pickle이 아닌 JSON으로 저장합니다.
+    """
+
+    def __init__(self, directory=".journal"):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(github_url, username, branch, week_ranges, options=None):
+        """
+        학생은 저장소 URL과 GitHub 사용자명으로 구분합니다 (실제 이름은 바뀌어도 같은 학생).
+        options({이름: 값})에는 저장되는 결과 자체를 바꾸는 분석 옵션(backend, 유사도 모드, 유사도 계산을 미뤘는지,
+        sources/rows를 담았는지 등)을 넣습니다. 옵션이 다른 실행의 결과는 이어서 사용하지 않습니다.
+        """
+        repo = github_url.strip().rstrip("/").lower().removesuffix(".git")
+        windows = ",".join(f"{label}:{start.isoformat()}~{end.isoformat()}" for label, start, end in week_ranges)
+        settings = ",".join(f"{name}={value!r}" for name, value in sorted((options or {}).items()))
+        return "|".join([repo, username.strip(), branch, windows, settings])
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, key):
+        """
+        저장된 항목을 (찾음 여부, DataFrame 또는 None)으로 반환합니다.
+        읽을 수 없는 파일(쓰다 만 파일 등)은 없는 것으로 취급합니다.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return False, None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("key") != key:
+                return False, None
+            result = entry["result"]
+            return True, None if result is None else _frame_from_json(result)
+        except Exception:
+            return False, None
+
+    def save(self, key, result):
+        """
+        result: analyze_commits 결과 DataFrame, 커밋 데이터가 없었으면 None
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        entry = {"key": key, "result": None if result is None else _frame_to_json(result)}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        with self._lock:
+            os.replace(tmp_path, path)
+
+    def discard(self, key):
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def prune(self, keys):
+        """
+        keys에 속하지 않는 항목(계정 목록에서 지우거나 URL/사용자명을 고친 학생, 옵션이 다른 실행 등)을 지웁니다.
+        """
+        keep = {os.path.basename(self._path(key)) for key in keys}
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith((".json", ".pickle")) and name not in keep:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+        return removed
@@ -0,0 +1,209 @@
+import difflib
+import hashlib
+import math
+import os
+import random
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# JavaScript 코드를 비교 단위(토큰)로 나누는 정규식: 식별자, 숫자, 문자열, 주석, 그 밖의 기호 한 글자
+TOKEN_PATTERN = re.compile(
+    r"[A-Za-z_$][\w$]*"
+    r"|\d+(?:\.\d+)?"
+    r"|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`"
+    r"|//[^\n]*|/\*[\s\S]*?\*/"
+    r"|\S"
+)
+
+MODES = ("char", "line", "token")
+
+
+def tokenize(code):
+    return TOKEN_PATTERN.findall(code)
+
+
+def split_lines(code):
+    """
+    앞뒤 공백을 없앤 비어 있지 않은 줄 목록을 반환합니다.
+    """
+    return [line.strip() for line in code.splitlines() if line.strip()]
+
+
+class SimilarityEngine:
+    """
+    두 코드의 유사도를 0~100 점수로 계산합니다.
+
+    - mode="char": 기존과 같이 문자 단위 difflib.SequenceMatcher (가장 느림)
+    - mode="line": 줄 단위 비교. 비교 원소 수가 문자 수보다 훨씬 적어 거의 선형 시간에 끝납니다.
+    - mode="token": JavaScript 토큰 단위 비교. 공백/줄바꿈 차이에 영향을 받지 않습니다.
+
+    cutoff(0~100)를 주면 real_quick_ratio → quick_ratio 순서의 값싼 상한을 먼저 계산하고,
+    상한이 cutoff 미만이면 비싼 ratio() 계산을 건너뛰고 NaN을 반환합니다.
+    (실제 점수는 모르고 cutoff 미만이라는 것만 알기 때문입니다. 보고서는 NaN 유사도를 기준 미달 이상치로 표시하므로,
+    cutoff가 보고서의 유사도 기준 이하이면 판정은 cutoff 없이 계산한 것과 같습니다.)
+    """
+
+    def __init__(self, mode="char", cutoff=None):
+        if mode not in MODES:
+            raise ValueError(f"지원하지 않는 유사도 모드입니다: {mode} ({', '.join(MODES)})")
+        self.mode = mode
+        self.cutoff = cutoff
+        self.skipped = 0
+        self.compared = 0
+
+    def _elements(self, code):
+        if self.mode == "line":
+            return split_lines(code)
+        if self.mode == "token":
+            return tokenize(code)
+        return code
+
+    def ratio(self, a, b):
+        """
+        0~1 사이의 유사도 비율을 반환합니다. cutoff로 정밀 비교를 생략했으면 NaN입니다.
+        """
+        seq_a = self._elements(a)
+        seq_b = self._elements(b)
+        if not seq_a and not seq_b:
+            return 1.0
+
+        # 문자 단위는 기존 점수와 같도록 autojunk 기본값을 유지합니다.
+        matcher = difflib.SequenceMatcher(None, seq_a, seq_b, autojunk=(self.mode == "char"))
+        if self.cutoff is not None:
+            limit = self.cutoff / 100
+            if matcher.real_quick_ratio() < limit or matcher.quick_ratio() < limit:
+                self.skipped += 1
+                return math.nan
+        self.compared += 1
+        return matcher.ratio()
+
+    def score(self, a, b):
+        return round(self.ratio(a, b) * 100, 2)
+
+
+def _score_chunk(task):
+    """
+    프로세스 풀 작업 함수: (모드, cutoff, 쌍 목록)을 점수 목록과 생략/비교 횟수로 바꿉니다.
+    """
+    mode, cutoff, pairs = task
+    engine = SimilarityEngine(mode, cutoff=cutoff)
+    scores = [engine.score(a, b) for a, b in pairs]
+    return scores, engine.skipped, engine.compared
+
+
+def _digest(code):
+    return hashlib.sha256(code.encode("utf-8")).digest()
+
+
+def score_pairs(pairs, engine=None, workers=None, chunksize=None):
+    """
+    (기준 코드, 제출 코드) 쌍 목록의 점수를 같은 순서의 목록으로 반환합니다.
+
+    내용이 같은 쌍(sha256 기준)은 한 번만 계산하고, 서로 다른 쌍은 chunksize개씩 묶어
+    workers개 프로세스에서 나누어 계산합니다. (workers가 1 이하이거나 쌍이 적으면 현재 프로세스에서 계산)
+    묶음 결과를 제출 순서대로 모으므로 workers와 상관없이 결과가 같습니다.
+    engine의 모드/cutoff를 사용하며, 생략/비교 횟수도 engine에 더합니다.
+    """
+    engine = engine or SimilarityEngine()
+    unique, index, positions = [], {}, []
+    for a, b in pairs:
+        key = (_digest(a), _digest(b))
+        if key not in index:
+            index[key] = len(unique)
+            unique.append((a, b))
+        positions.append(index[key])
+
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(unique) < 2:
+        scores = [engine.score(a, b) for a, b in unique]
+    else:
+        # 프로세스 간 왕복 횟수를 줄이되, 작업자마다 여러 묶음이 돌아가도록 나눕니다.
+        chunksize = chunksize or max(1, math.ceil(len(unique) / (workers * 4)))
+        tasks = [(engine.mode, engine.cutoff, unique[i:i + chunksize]) for i in range(0, len(unique), chunksize)]
+        scores = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            for chunk_scores, skipped, compared in executor.map(_score_chunk, tasks):
+                scores.extend(chunk_scores)
+                engine.skipped += skipped
+                engine.compared += compared
+    return [scores[position] for position in positions]
+
+
+def _mutate(code, rng, strength):
+    """
+    보정용 표본을 만들기 위해 코드 줄을 무작위로 지우거나, 복제하거나, 식별자를 바꿉니다.
+    """
+    lines = code.splitlines()
+    result = []
+    for line in lines:
+        roll = rng.random()
+        if roll < strength * 0.4:
+            continue
+        if roll < strength * 0.7:
+            line = re.sub(r"\b([a-z]\w*)\b", lambda m: m.group(1) + "_v", line, count=1)
+        result.append(line)
+        if rng.random() < strength * 0.3:
+            result.append(f"console.log({rng.randint(0, 99)});")
+    return "\n".join(result) + "\n"
+
+
+def calibrate(pairs, mode, threshold=85.0):
+    """
+    (기준 코드, 제출 코드) 쌍에 대해 mode 점수를 기존 문자 단위 점수와 비교합니다.
+
+    반환값: 평균/최대 절대 오차, 기존 threshold 판정 일치율, 그리고 일치율이 가장 높은
+    mode 쪽 기준값(equivalent_threshold)을 담은 dict
+    """
+    reference = SimilarityEngine("char")
+    engine = SimilarityEngine(mode)
+    char_scores = [reference.score(a, b) for a, b in pairs]
+    mode_scores = [engine.score(a, b) for a, b in pairs]
+
+    diffs = [abs(x - y) for x, y in zip(char_scores, mode_scores)]
+    expected = [score < threshold for score in char_scores]
+
+    def agreement(t):
+        return sum((score < t) == flag for score, flag in zip(mode_scores, expected)) / len(pairs)
+
+    candidates = sorted(set(mode_scores) | {threshold})
+    best = max(candidates, key=lambda t: (agreement(t), -abs(t - threshold)))
+    return {
+        "mode": mode,
+        "samples": len(pairs),
+        "mean_abs_diff": round(sum(diffs) / len(diffs), 2),
+        "max_abs_diff": round(max(diffs), 2),
+        "agreement_at_threshold": round(agreement(threshold), 4),
+        "equivalent_threshold": best,
+        "agreement_at_equivalent": round(agreement(best), 4),
+    }
+
+
+def build_calibration_pairs(base_dir="lib", seed=0, variants=6):
+    """
+    로컬 기준 파일마다 강도가 다른 변형본을 만들어 (기준, 변형) 쌍 목록을 반환합니다.
+    """
+    rng = random.Random(seed)
+    pairs = []
+    for root, _, files in os.walk(base_dir):
+        for name in sorted(files):
+            if not name.endswith(".js"):
+                continue
+            with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                code = f.read()
+            for i in range(variants):
+                pairs.append((code, _mutate(code, rng, strength=i / variants)))
+    return pairs
+
+
+if __name__ == "__main__":
+    # 사용법: python similarity.py [기준 파일 디렉토리]
+    # 기존 문자 단위 점수 대비 line/token 모드의 오차와 85% 기준 판정 일치율을 출력합니다.
+    base = sys.argv[1] if len(sys.argv) > 1 else "lib"
+    calibration_pairs = build_calibration_pairs(base)
+    if not calibration_pairs:
+        print(f"❗ {base} 아래에 .js 파일이 없습니다.")
+        sys.exit(1)
+    for calibration_mode in ("line", "token"):
+        report = calibrate(calibration_pairs, calibration_mode)
+        print(", ".join(f"{key}={value}" for key, value in report.items()))
@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# 저장소 루트의 모듈(git_analyzer 등)을 pytest 실행 위치와 상관없이 불러올 수 있게 합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubGitHub:
+    """
+    테스트용 로컬 HTTP 서버입니다. routes({경로: 함수(query) -> (status, body)})로 응답하고,
+    동시에 처리 중인 요청 수의 최댓값(peak)과 받은 요청 경로(paths)를 기록합니다.
+    """
+
+    def __init__(self, delay=0.0):
+        self.routes = {}
+        self.delay = delay
+        self.paths = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                with stub._lock:
+                    stub.paths.append(parsed.path)
+                    stub.in_flight += 1
+                    stub.peak = max(stub.peak, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    route = stub.routes.get(parsed.path)
+                    status, body = route(parse_qs(parsed.query)) if route else (404, {"message": "Not Found"})
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_github():
+    stub = StubGitHub()
+    yield stub
+    stub.close()
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cohort_stats import (CohortStatsEngine, IncrementalScorer, RunningStats, Z_SCORE_COLUMNS, score_rows)
+
+FLAG_COLUMNS = ["commit_count_is_outlier", "avg_changes_is_outlier", "coding_minutes_is_outlier"]
+
+
+def _student_rows(rng, n_rows):
+    return pd.DataFrame({
+        "총 커밋 수": rng.integers(1, 40, n_rows),
+        "평균 수정 라인 수": rng.gamma(2.0, 15.0, n_rows).round(1),
+        "코딩 시간(분)": rng.integers(5, 300, n_rows),
+        "코드 유사도": np.full(n_rows, 100.0),
+    })
+
+
+def test_running_stats_merge_matches_numpy_over_concatenated_batches():
+    rng = np.random.default_rng(7)
+    batches = [rng.normal(50, 20, size) for size in (1, 13, 0, 250, 2, 97)]
+
+    merged = RunningStats()
+    for batch in batches:
+        merged = merged.merge(RunningStats.from_values(batch))
+
+    values = np.concatenate(batches)
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(np.mean(values), rel=1e-12)
+    assert merged.m2 / merged.count == pytest.approx(np.var(values), rel=1e-12)
+    assert merged.std == pytest.approx(np.std(values), rel=1e-12)
+
+    # 합쳤던 배치를 다시 빼면 나머지 배치만의 평균/분산이 됩니다.
+    rest = merged.subtract(RunningStats.from_values(batches[3]))
+    remaining = np.concatenate(batches[:3] + batches[4:])
+    assert rest.mean == pytest.approx(np.mean(remaining), rel=1e-9)
+    assert rest.m2 / rest.count == pytest.approx(np.var(remaining), rel=1e-9)
+
+
+def test_engines_merged_from_workers_match_numpy():
+    rng = np.random.default_rng(11)
+    students = {f"student{i:02d}": _student_rows(rng, rng.integers(1, 6)) for i in range(30)}
+
+    # 작업자 세 명이 학생을 나눠 모은 엔진을 하나로 합칩니다.
+    workers = [CohortStatsEngine() for _ in range(3)]
+    for index, (key, df) in enumerate(students.items()):
+        workers[index % 3].update(key, df)
+    merged = workers[0].merge(workers[1]).merge(workers[2])
+
+    everything = pd.concat(students.values(), ignore_index=True)
+    for column in Z_SCORE_COLUMNS:
+        mean, std = merged.stats()[column]
+        values = everything[column].to_numpy(dtype=float)
+        assert mean == pytest.approx(np.mean(values), rel=1e-12)
+        assert std ** 2 == pytest.approx(np.var(values), rel=1e-12)
+
+    with pytest.raises(ValueError):
+        merged.merge(workers[1])
+
+
+def test_robust_engine_uses_median_and_mad():
+    rng = np.random.default_rng(3)
+    engine = CohortStatsEngine(robust=True)
+    frames = [_student_rows(rng, 4) for _ in range(9)]
+    for index, df in enumerate(frames):
+        engine.update(f"s{index}", df)
+
+    values = pd.concat(frames)["평균 수정 라인 수"].to_numpy(dtype=float)
+    median = np.median(values)
+    assert engine.stats()["평균 수정 라인 수"] == pytest.approx((median, 1.4826 * np.median(np.abs(values - median))))
+
+
+def _flags(frames, stats):
+    rows = pd.concat([df.assign(key=key) for key, df in frames.items()], ignore_index=True)
+    flags = {}
+    for key, row in zip(rows["key"], score_rows(rows, stats)[FLAG_COLUMNS].to_numpy()):
+        flags[key] = flags.get(key, ()) + tuple(row)
+    return flags
+
+
+@pytest.mark.parametrize("robust", [False, True])
+def test_incremental_scorer_returns_exactly_the_students_whose_verdict_changed(robust):
+    rng = np.random.default_rng(2024)
+    scorer = IncrementalScorer(robust=robust)
+    frames = {}
+    changed_any = False
+
+    for step in range(60):
+        # 새 학생이 도착하거나, 이미 있는 학생의 결과가 바뀌거나, 학생이 빠지는 경우를 섞습니다.
+        if frames and step % 7 == 0:
+            key = sorted(frames)[rng.integers(len(frames))]
+            df = None
+        elif frames and step % 3 == 0:
+            key = sorted(frames)[rng.integers(len(frames))]
+            df = _student_rows(rng, 1)
+        else:
+            key = f"student{step:03d}"
+            df = _student_rows(rng, 1)
+
+        before = _flags(frames, scorer.stats()) if frames else {}
+        rescored = scorer.update(key, df)
+        if df is None:
+            frames.pop(key)
+        else:
+            frames[key] = df
+        after = _flags(frames, scorer.stats())
+
+        # 판정이 바뀐 학생(과 바뀐 학생 자신)만 돌려주고, 판정이 그대로인 다른 학생은 돌려주지 않습니다.
+        changed = {other for other in after if other in before and before[other] != after[other]}
+        expected = changed | ({key} if df is not None else set())
+        assert rescored == expected, f"step {step}"
+        changed_any = changed_any or bool(changed - {key})
+
+    assert changed_any
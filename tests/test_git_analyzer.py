@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+import git_analyzer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _graphql_url_with_env(**env):
+    """
+    주어진 환경 변수만 설정한 새 프로세스에서 git_analyzer를 불러와 GITHUB_GRAPHQL_URL을 반환합니다.
+    """
+    clean_env = {key: value for key, value in os.environ.items() if not key.startswith("GITHUB_")}
+    clean_env.update(env)
+    result = subprocess.run([sys.executable, "-c", "import git_analyzer; print(git_analyzer.GITHUB_GRAPHQL_URL)"],
+                            cwd=REPO_ROOT, env=clean_env, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+@pytest.mark.parametrize("api_url, expected", [
+    ("http://127.0.0.1:8771/api", "http://127.0.0.1:8771/api/graphql"),
+    ("https://ghe.example.com/api/v3/", "https://ghe.example.com/api/graphql"),
+])
+def test_graphql_url_follows_api_url(api_url, expected):
+    assert _graphql_url_with_env(GITHUB_API_URL=api_url) == expected
+
+
+def test_graphql_url_defaults():
+    assert _graphql_url_with_env() == "https://api.github.com/graphql"
+    assert _graphql_url_with_env(GITHUB_API_URL="http://127.0.0.1:8771/api",
+                                 GITHUB_GRAPHQL_URL="http://other/graphql") == "http://other/graphql"
+
+
+@pytest.mark.parametrize("local_base_dir", ["lib", "lib/"])
+def test_local_reference_path_accepts_trailing_slash(local_base_dir):
+    filename = "lib/week08/nodescript/01_variable/var01.js"
+    assert git_analyzer._local_reference_path(filename, local_base_dir) == os.path.join(
+        "lib", "week08/nodescript/01_variable/var01.js")
+
+
+def test_read_local_reference_with_analyze_directory(monkeypatch):
+    """
+    analyze_commits는 directory="lib/"를 기준 디렉토리로 넘기므로, 이때도 기준 파일을 찾아야 합니다.
+    """
+    monkeypatch.chdir(REPO_ROOT)
+    filename = "lib/week08/nodescript/01_variable/var01.js"
+    with open(filename, "r", encoding="utf-8") as f:
+        expected = f.read()
+    assert git_analyzer._read_local_reference(filename, "lib/") == expected
+
+
+DATE = "2024-10-21T01:00:00Z"
+WEEK = (datetime(2024, 10, 20), datetime(2024, 10, 27, 23, 59, 59))
+
+
+def _sha(i):
+    return f"{i:040x}"
+
+
+def _serve_commits(stub, count):
+    """
+    stub 서버에 o/r 저장소의 커밋 목록(count개, 한 페이지)과 커밋별 상세 응답을 등록합니다.
+    """
+    commits = [{"sha": _sha(i), "commit": {"author": {"name": "kim", "date": DATE}}} for i in range(count)]
+    stub.routes["/repos/o/r/commits"] = lambda query: (200, commits if query.get("page") == ["1"] else [])
+    for i in range(count):
+        stub.routes[f"/repos/o/r/commits/{_sha(i)}"] = lambda query, i=i: (200, {
+            "sha": _sha(i), "html_url": f"https://github.com/o/r/commit/{_sha(i)}", "author": {"login": "kim"},
+            "commit": {"author": {"name": "kim", "date": DATE}},
+            "files": [{"filename": f"lib/{i}.js", "status": "added", "changes": 1, "additions": 1, "deletions": 0}],
+        })
+
+
+def test_fetch_commits_limits_in_flight_details(stub_github):
+    stub_github.delay = 0.05
+    _serve_commits(stub_github, 12)
+    git_analyzer.configure_http_pool(16)
+
+    rows = git_analyzer._fetch_commits(f"{stub_github.url}/repos/o/r/commits", {}, {"author": "kim"}, "lib/",
+                                       *WEEK, "kim", concurrency=2)
+    assert [row["filename"] for row in rows] == [f"lib/{i}.js" for i in range(12)]
+    assert stub_github.peak == 2
+
+
+def test_raw_data_from_history_limits_in_flight_details(stub_github):
+    stub_github.delay = 0.05
+    _serve_commits(stub_github, 9)
+    nodes = [{"oid": _sha(i), "authoredDate": DATE, "author": {"name": "kim", "user": {"login": "kim"}}}
+             for i in range(9)]
+
+    rows = git_analyzer._raw_data_from_history(nodes, f"{stub_github.url}/repos/o/r/commits", {}, "lib/",
+                                               *WEEK, "kim", concurrency=3)
+    assert len(rows) == 9
+    assert stub_github.peak == 3
+
+
+def test_fetch_file_contents_limits_in_flight_downloads(stub_github, monkeypatch):
+    stub_github.delay = 0.05
+    monkeypatch.setattr(git_analyzer, "GITHUB_API_URL", stub_github.url)
+    monkeypatch.setattr(git_analyzer, "GITHUB_RAW_URL", f"{stub_github.url}/raw")
+    filenames = [f"lib/{i}.js" for i in range(10)]
+    for filename in filenames:
+        stub_github.routes[f"/raw/o/r/main/{filename}"] = lambda query, filename=filename: (200, f"// {filename}\n")
+
+    contents = git_analyzer.fetch_file_contents("o", "r", "main", filenames, {}, concurrency=2)
+    assert contents == {filename: f"// {filename}\n" for filename in filenames}
+    assert stub_github.peak == 2
@@ -0,0 +1,28 @@
+import shutil
+import subprocess
+
+import pytest
+
+import git_mirror
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git이 설치되어 있지 않습니다")
+
+
+def _git(*args, cwd):
+    subprocess.run(["git", "-c", "user.name=student", "-c", "user.email=student@example.com", *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def test_read_files_skips_missing_paths_with_spaces(tmp_path):
+    work = tmp_path / "work"
+    (work / "lib").mkdir(parents=True)
+    (work / "lib" / "my file.js").write_text("let a = 1;\n", encoding="utf-8")
+    (work / "lib" / "b.js").write_text("let b = 2;\n", encoding="utf-8")
+    _git("init", "-q", cwd=work)
+    _git("add", ".", cwd=work)
+    _git("commit", "-qm", "init", cwd=work)
+    _git("clone", "-q", "--mirror", str(work), str(tmp_path / "mirror.git"), cwd=tmp_path)
+
+    contents = git_mirror.read_files(str(tmp_path / "mirror.git"), "HEAD",
+                                     ["lib/my file.js", "lib/gone file.js", "lib/b.js", "lib/nope.js"])
+    assert contents == {"lib/my file.js": "let a = 1;\n", "lib/b.js": "let b = 2;\n"}
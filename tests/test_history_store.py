@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from history_store import HistoryStore
+
+
+def _row(filename, minute, url):
+    return {"user": "kim", "date": datetime(2024, 10, 21, 10, minute), "filename": filename,
+            "total_changes": 1, "additions": 1, "deletions": 0, "status": "modified", "url": url}
+
+
+def test_trend_counts_unique_commits_and_union_of_spans(tmp_path):
+    store = HistoryStore(str(tmp_path / "history"))
+    # c1~c3은 두 파일을 함께 고친 커밋입니다. 파일별 첫 커밋(c0, c1)은 요약과 같이 제외됩니다.
+    rows = [
+        _row("lib/a.js", 0, "c0"),
+        _row("lib/a.js", 10, "c1"), _row("lib/b.js", 10, "c1"),
+        _row("lib/a.js", 20, "c2"), _row("lib/b.js", 20, "c2"),
+        _row("lib/a.js", 40, "c3"), _row("lib/b.js", 50, "c4"),
+    ]
+    summary = pd.DataFrame({
+        "이름": ["김학생", "김학생"],
+        "user": ["kim", "kim"],
+        "파일명": ["lib/a.js", "lib/b.js"],
+        "총 커밋 수": [3, 2],
+        "코딩 시간(분)": [30, 30],
+        "코드 유사도": [0.5, 0.7],
+    })
+    store.append_raw("week08", "kim", rows)
+    store.append_summary("week08", summary)
+
+    tables = store.trend()
+    assert tables["총 커밋 수"].loc["kim", "week08"] == 4
+    assert tables["코딩 시간(분)"].loc["kim", "week08"] == 40
+    assert tables["파일 수"].loc["kim", "week08"] == 2
+
+
+def test_trend_falls_back_to_summary_without_raw_rows(tmp_path):
+    store = HistoryStore(str(tmp_path / "history"))
+    summary = pd.DataFrame({"이름": ["이학생"], "user": ["lee"], "파일명": ["lib/a.js"], "총 커밋 수": [3],
+                            "코딩 시간(분)": [12], "코드 유사도": [0.4]})
+    store.append_summary("week09", summary)
+
+    tables = store.trend()
+    assert tables["총 커밋 수"].loc["lee", "week09"] == 3
+    assert tables["코딩 시간(분)"].loc["lee", "week09"] == 12
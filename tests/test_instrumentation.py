@@ -0,0 +1,28 @@
+import pytest
+
+import instrumentation
+
+
+@pytest.fixture
+def recorder():
+    recorder = instrumentation.enable()
+    yield recorder
+    instrumentation.disable()
+
+
+def test_students_with_the_same_name_are_kept_apart(recorder, capsys):
+    for username, requests_count in (("kim-a", 1), ("kim-b", 2)):
+        with instrumentation.student(username, name="김철수"):
+            for _ in range(requests_count):
+                instrumentation.record_http("https://api.github.com/repos/o/r/commits", 200, 10, 0.01)
+            instrumentation.record_cache("miss")
+
+    students = recorder.report()["students"]
+    assert set(students) == {"kim-a", "kim-b"}
+    assert [students[key]["name"] for key in ("kim-a", "kim-b")] == ["김철수", "김철수"]
+    assert students["kim-b"]["http"]["repos/:repo/commits"]["count"] == 2
+    assert students["kim-a"]["cache"] == {"miss": 1}
+
+    instrumentation.print_slowest_students()
+    output = capsys.readouterr().out
+    assert "김철수 (kim-a)" in output and "김철수 (kim-b)" in output
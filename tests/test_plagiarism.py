@@ -0,0 +1,27 @@
+import pandas as pd
+
+import main
+from plagiarism import find_suspicious_pairs
+
+CODE = """
+function add(a, b) {
+    const total = a + b;
+    console.log(`합계: ${total}`);
+    return total;
+}
+add(1, 2);
+"""
+
+
+def test_students_with_the_same_name_are_compared():
+    results = [
+        pd.DataFrame({"이름": ["김철수"], "user": ["kim-a"]}),
+        pd.DataFrame({"이름": ["김철수"], "user": ["kim-b"]}),
+        pd.DataFrame({"이름": ["이영희"], "user": ["lee"]}),
+    ]
+    labels = main._student_labels(results)
+    assert labels == {"kim-a": "김철수 (kim-a)", "kim-b": "김철수 (kim-b)", "lee": "이영희"}
+
+    submissions = [("kim-a", "lib/add.js", CODE), ("kim-b", "lib/add.js", CODE)]
+    pairs = find_suspicious_pairs(submissions, threshold=0.5, labels=labels)
+    assert pairs[["이름 A", "이름 B", "유사도 (%)"]].values.tolist() == [["김철수 (kim-a)", "김철수 (kim-b)", 100.0]]
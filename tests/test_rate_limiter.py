@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from rate_limiter import RateLimitError, RateLimitScheduler
+
+
+class FakeClock:
+    """
+    sleep이 실제로 기다리지 않고 시각만 앞당기는 가짜 시계입니다. 기다린 시간은 sleeps에 기록합니다.
+    """
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = json.dumps(body or {}).encode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    """
+    미리 정한 응답을 차례로 돌려주고, 요청을 보낸 시각을 기록합니다.
+    """
+
+    def __init__(self, clock, responses):
+        self.clock = clock
+        self.responses = list(responses)
+        self.sent_at = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.sent_at.append(self.clock())
+        return self.responses.pop(0)
+
+
+def _scheduler(clock, session, **kwargs):
+    return RateLimitScheduler(session_factory=lambda: session, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_bucket_spaces_requests_at_the_configured_rate():
+    clock = FakeClock()
+    session = FakeSession(clock, [FakeResponse() for _ in range(4)])
+    scheduler = _scheduler(clock, session, rate=2.0, burst=2)
+
+    for _ in range(4):
+        scheduler.get("https://api.github.com/x")
+
+    # burst 2개는 바로 보내고, 그 다음부터는 초당 2개(0.5초 간격)로 보냅니다.
+    start = session.sent_at[0]
+    assert [round(t - start, 6) for t in session.sent_at] == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_empty_budget_waits_until_reset():
+    clock = FakeClock()
+    reset_at = clock.now + 120
+    exhausted = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset_at)}
+    refilled = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": str(reset_at + 3600)}
+    session = FakeSession(clock, [FakeResponse(headers=exhausted), FakeResponse(headers=refilled)])
+    scheduler = _scheduler(clock, session)
+
+    scheduler.get("https://api.github.com/x")
+    scheduler.get("https://api.github.com/x")
+
+    # 예산이 바닥난 응답 뒤의 요청은 X-RateLimit-Reset 시각이 되어서야 보냅니다.
+    assert session.sent_at[1] == reset_at
+    assert clock.sleeps == [120]
+    report = scheduler.budget_report()["anonymous"]
+    assert report["remaining"] == 4999
+    assert report["requests"] == 2
+    assert report["retries"] == 0
+
+
+def test_secondary_rate_limit_403_is_retried_with_backoff():
+    clock = FakeClock()
+    limited = FakeResponse(403, body={"message": "You have exceeded a secondary rate limit."})
+    session = FakeSession(clock, [limited, limited, FakeResponse(body={"ok": True})])
+    scheduler = _scheduler(clock, session, secondary_backoff=60.0)
+
+    response = scheduler.get("https://api.github.com/x", headers={"Authorization": "token abcd1234"})
+
+    assert response.status_code == 200
+    # Retry-After가 없으면 secondary_backoff부터 지수적으로 늘려가며 기다립니다.
+    assert clock.sleeps == [60.0, 120.0]
+    assert scheduler.budget_report()["…1234"]["retries"] == 2
+
+
+def test_403_retry_after_header_is_respected():
+    clock = FakeClock()
+    limited = FakeResponse(403, headers={"Retry-After": "7"}, body={"message": "secondary rate limit"})
+    session = FakeSession(clock, [limited, FakeResponse()])
+    scheduler = _scheduler(clock, session)
+
+    assert scheduler.get("https://api.github.com/x").status_code == 200
+    assert clock.sleeps == [7.0]
+
+
+def test_plain_403_is_not_retried():
+    clock = FakeClock()
+    session = FakeSession(clock, [FakeResponse(403, body={"message": "Resource not accessible by integration"})])
+    scheduler = _scheduler(clock, session)
+
+    assert scheduler.get("https://api.github.com/x").status_code == 403
+    assert clock.sleeps == []
+
+
+def test_gives_up_after_max_retries():
+    clock = FakeClock()
+    limited = FakeResponse(429, headers={"Retry-After": "1"})
+    session = FakeSession(clock, [limited] * 3)
+    scheduler = _scheduler(clock, session, max_retries=2)
+
+    with pytest.raises(RateLimitError):
+        scheduler.get("https://api.github.com/x")
+    assert len(session.sent_at) == 3
@@ -0,0 +1,37 @@
+from response_cache import ResponseCache
+
+
+def _last_access(cache, key):
+    return cache._conn.execute("SELECT last_access FROM entries WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_get_does_not_count_or_write(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("etag", b"body", etag='"v1"')
+    before = _last_access(cache, "etag")
+
+    assert cache.get("etag") == (b"body", '"v1"', False)
+    assert cache.get("absent") is None
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert _last_access(cache, "etag") == before
+    cache.close()
+
+
+def test_access_times_are_flushed_in_batches(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path, flush_every=3)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.encode(), immutable=True)
+    stored = {key: _last_access(cache, key) for key in ("a", "b", "c")}
+
+    cache.mark_hit("a")
+    cache.mark_hit("b")
+    assert _last_access(cache, "a") == stored["a"]
+    cache.mark_hit("c")
+    assert all(_last_access(cache, key) > stored[key] for key in ("a", "b", "c"))
+
+    cache.mark_hit("a")
+    cache.close()
+    reopened = ResponseCache(path)
+    assert _last_access(reopened, "a") > _last_access(reopened, "b")
+    reopened.close()
@@ -0,0 +1,111 @@
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import git_analyzer
+import main
+from benchmarks.mock_github import MockGitHubServer
+from rate_limiter import RateLimitScheduler
+from run_journal import RunJournal
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEEKS = "week08,2025-10-20,2025-10-26\nweek09,2025-10-27,2025-11-02\n"
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    week_range = ("week08", datetime(2025, 10, 20), datetime(2025, 11, 2, 23, 59, 59))
+    # 제출 파일 경로가 "lib/..." 가 되도록 저장소 루트에서 기준 파일을 읽습니다.
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    try:
+        server = MockGitHubServer(n_students=4, commits_per_student=8, files_per_student=4, week_range=week_range)
+    finally:
+        os.chdir(cwd)
+    with server:
+        yield server
+
+
+@pytest.fixture
+def workspace(mock_server, tmp_path, monkeypatch):
+    """
+    모의 서버에 연결하고, 계정 목록/주차 정보/기준 파일이 있는 임시 디렉토리에서 실행합니다.
+    """
+    monkeypatch.setattr(git_analyzer, "GITHUB_API_URL", mock_server.api_url)
+    monkeypatch.setattr(git_analyzer, "GITHUB_RAW_URL", mock_server.raw_url)
+    monkeypatch.setattr(git_analyzer, "_scheduler",
+                        RateLimitScheduler(session_factory=git_analyzer._get_session, rate=1000, burst=1000))
+    monkeypatch.chdir(tmp_path)
+    os.symlink(os.path.join(REPO_ROOT, "lib"), "lib")
+    (tmp_path / "week_information.txt").write_text(WEEKS, encoding="utf-8")
+    (tmp_path / "users.txt").write_text("\n".join(mock_server.account_lines()) + "\n", encoding="utf-8")
+    return tmp_path
+
+
+def _analyzed_users(monkeypatch, stop_after=None):
+    """
+    _analyze_account_line을 감싸 분석한 학생의 사용자명을 기록하고, stop_after명을 분석한 뒤에는 실행을 중단시킵니다.
+    """
+    analyzed = []
+    original = main._analyze_account_line
+
+    def spy(line, *args, **kwargs):
+        if stop_after is not None and len(analyzed) >= stop_after:
+            raise KeyboardInterrupt
+        analyzed.append(line.split(",")[2])
+        return original(line, *args, **kwargs)
+
+    monkeypatch.setattr(main, "_analyze_account_line", spy)
+    return analyzed
+
+
+def _run(journal=None, resume=False):
+    main.analyze_multiple_users("users.txt", journal=journal, resume=resume, write_html=False,
+                                plagiarism_threshold=0.99, history_store=object())
+    return pd.read_csv("all_users_summary.csv")
+
+
+def test_resume_skips_finished_students_and_gives_the_same_csv(workspace, monkeypatch, mock_server):
+    expected = _run()
+    users = [line.split(",")[2] for line in mock_server.account_lines()]
+
+    with monkeypatch.context() as patch:
+        analyzed = _analyzed_users(patch, stop_after=2)
+        with pytest.raises(KeyboardInterrupt):
+            _run(journal=RunJournal(".journal"))
+    assert analyzed == users[:2]
+    assert len(os.listdir(".journal")) == 2
+
+    with monkeypatch.context() as patch:
+        analyzed = _analyzed_users(patch)
+        resumed = _run(journal=RunJournal(".journal"), resume=True)
+    assert analyzed == users[2:]
+    pd.testing.assert_frame_equal(resumed, expected)
+
+
+def test_resume_keeps_entry_when_only_the_name_changes(workspace, monkeypatch, mock_server):
+    _run(journal=RunJournal(".journal"))
+    lines = mock_server.account_lines()
+    renamed = lines[0].rsplit(",", 1)[0] + ",김철수"
+    moved = lines[1].replace("/homework", "/homework2")
+    (workspace / "users.txt").write_text("\n".join([renamed, moved] + lines[2:]) + "\n", encoding="utf-8")
+
+    analyzed = _analyzed_users(monkeypatch)
+    result = _run(journal=RunJournal(".journal"), resume=True)
+    # 이름만 바뀐 학생은 저장된 결과를 쓰고, 저장소 URL이 바뀐 학생만 다시 분석합니다.
+    assert analyzed == [lines[1].split(",")[2]]
+    assert (result["user"] == lines[0].split(",")[2]).sum() > 0
+    assert set(result.loc[result["user"] == lines[0].split(",")[2], "이름"]) == {"김철수"}
+    # URL이 바뀐 학생의 예전 항목은 지워지고, 새 URL은 모의 서버에 없는 저장소라 오류로 기록되지 않습니다.
+    assert len(os.listdir(".journal")) == len(lines) - 1
+
+
+def test_journal_files_are_json(workspace):
+    _run(journal=RunJournal(".journal"))
+    for name in os.listdir(".journal"):
+        with open(os.path.join(".journal", name), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        assert set(entry) == {"key", "result"}
@@ -0,0 +1,55 @@
+import difflib
+import math
+import os
+
+import pytest
+
+from similarity import SimilarityEngine, build_calibration_pairs, calibrate, score_pairs
+
+LIB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+
+REFERENCE = "let total = 0;\nfor (let i = 0; i < 10; i++) {\n    total += i;\n}\nconsole.log(total);\n"
+CLOSE = REFERENCE.replace("10", "20")
+UNRELATED = "const names = ['a', 'b'];\nnames.forEach(name => console.log(name.toUpperCase()));\n"
+
+
+def test_cutoff_returns_nan_instead_of_upper_bound():
+    engine = SimilarityEngine("char", cutoff=85)
+    assert math.isnan(engine.score(REFERENCE, UNRELATED))
+    assert engine.skipped == 1
+
+
+def test_cutoff_keeps_scores_that_are_compared():
+    exact = SimilarityEngine("char").score(REFERENCE, CLOSE)
+    engine = SimilarityEngine("char", cutoff=85)
+    assert engine.score(REFERENCE, CLOSE) == exact
+    assert engine.compared == 1
+
+
+def test_score_pairs_keeps_nan_across_processes():
+    pairs = [(REFERENCE, UNRELATED), (REFERENCE, CLOSE), (REFERENCE, UNRELATED + "\n")]
+    scores = score_pairs(pairs, engine=SimilarityEngine("char", cutoff=85), workers=2, chunksize=1)
+    assert math.isnan(scores[0]) and math.isnan(scores[2])
+    assert scores[1] == SimilarityEngine("char").score(REFERENCE, CLOSE)
+
+
+@pytest.fixture(scope="module")
+def calibration_pairs():
+    pairs = build_calibration_pairs(LIB_DIR)
+    if not pairs:
+        pytest.skip("lib/ 아래에 기준 .js 파일이 없습니다")
+    return pairs
+
+
+def test_default_mode_matches_character_difflib(calibration_pairs):
+    engine = SimilarityEngine()
+    assert engine.mode == "char"
+    for a, b in calibration_pairs[::10]:
+        assert engine.score(a, b) == round(difflib.SequenceMatcher(None, a, b).ratio() * 100, 2)
+
+
+@pytest.mark.parametrize("mode, minimum", [("token", 0.85), ("line", 0.75)])
+def test_calibration_agrees_with_char_scores_at_threshold(calibration_pairs, mode, minimum):
+    report = calibrate(calibration_pairs, mode, threshold=85.0)
+    assert report["samples"] == len(calibration_pairs)
+    assert report["agreement_at_threshold"] >= minimum
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import git_analyzer
+from watermark_store import WatermarkStore, merge_rows
+
+WEEK = [("week08", datetime(2024, 10, 20), datetime(2024, 10, 27, 23, 59, 59))]
+
+
+def _row(url, filename, additions=1):
+    return {"user": "kim", "date": datetime(2024, 10, 21, 10, 0), "filename": filename, "total_changes": additions,
+            "additions": additions, "deletions": 0, "status": "modified", "url": url}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = WatermarkStore(str(tmp_path))
+    key = WatermarkStore.make_key("o", "r", "main", "kim", "lib/", *WEEK[0][1:])
+    rows = [_row("https://github.com/o/r/commit/a", "lib/a.js")]
+    store.save(key, "author", "a", "2024-10-21T01:00:00Z", rows, known_shas={"a", "b"})
+
+    state = store.load(key)
+    assert state["rows"] == rows
+    assert state["known_shas"] == ["a", "b"]
+    assert store.load(key + "x") is None
+
+
+def test_merge_rows_replaces_same_commit_and_file():
+    old = [_row("u1", "lib/a.js"), _row("u1", "lib/b.js")]
+    new = [_row("u1", "lib/a.js", additions=5), _row("u2", "lib/a.js")]
+    merged = merge_rows(old, new)
+    assert sorted((row["url"], row["filename"], row["additions"]) for row in merged) == [
+        ("u1", "lib/a.js", 5), ("u1", "lib/b.js", 1), ("u2", "lib/a.js", 1)]
+
+
+def _commit(sha, date):
+    return {"sha": sha, "commit": {"author": {"name": "kim", "date": date}, "committer": {"date": date}}}
+
+
+def _detail(sha, date, files):
+    return {"sha": sha, "html_url": f"https://github.com/o/r/commit/{sha}", "author": {"login": "kim"},
+            "commit": {"author": {"name": "kim", "date": date}},
+            "files": [{"filename": f, "status": "added", "changes": 1, "additions": 1, "deletions": 0} for f in files]}
+
+
+def test_merged_commit_older_than_watermark_is_picked_up(stub_github, monkeypatch, tmp_path):
+    """
+    첫 실행 뒤, 워터마크(A)보다 committer 날짜가 오래된 브랜치 커밋 F가 병합 커밋 M과 함께 들어와도 다음 실행에서 집계해야 합니다.
+    """
+    monkeypatch.setattr(git_analyzer, "GITHUB_API_URL", stub_github.url)
+    monkeypatch.setattr(git_analyzer, "GITHUB_RAW_URL", f"{stub_github.url}/raw")
+    a_date, f_date, m_date = "2024-10-22T01:00:00Z", "2024-10-21T01:00:00Z", "2024-10-23T01:00:00Z"
+    history = [_commit("a" * 40, a_date)]
+
+    def list_commits(query):
+        # GitHub처럼 since 이후(committer 날짜 기준)의 커밋만 최신순으로 돌려줍니다.
+        since = query.get("since", [""])[0]
+        listed = [c for c in history if c["commit"]["committer"]["date"] >= since]
+        return 200, listed if query.get("page") == ["1"] else []
+
+    stub_github.routes.update({
+        "/repos/o/r": lambda query: (200, {"full_name": "o/r"}),
+        "/repos/o/r/commits": list_commits,
+        f"/repos/o/r/commits/{'a' * 40}": lambda query: (200, _detail("a" * 40, a_date, ["lib/a.js"])),
+        f"/repos/o/r/commits/{'f' * 40}": lambda query: (200, _detail("f" * 40, f_date, ["lib/f.js"])),
+        f"/repos/o/r/commits/{'m' * 40}": lambda query: (200, _detail("m" * 40, m_date, [])),
+        "/raw/o/r/main/lib/a.js": lambda query: (200, "let a = 1;\n"),
+        "/raw/o/r/main/lib/f.js": lambda query: (200, "let f = 1;\n"),
+    })
+    store = WatermarkStore(str(tmp_path / "incremental"))
+
+    def run():
+        return git_analyzer.analyze_commits("https://github.com/o/r", "token", "kim", week_ranges=WEEK,
+                                            concurrency=1, incremental_store=store)
+
+    assert run()["파일명"].tolist() == ["lib/a.js"]
+
+    history[:] = [_commit("m" * 40, m_date), _commit("a" * 40, a_date), _commit("f" * 40, f_date)]
+    assert sorted(run()["파일명"].tolist()) == ["lib/a.js", "lib/f.js"]
+    # 이미 처리한 커밋 A는 상세 조회를 다시 하지 않습니다.
+    assert stub_github.paths.count(f"/repos/o/r/commits/{'a' * 40}") == 1
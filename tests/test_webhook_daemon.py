@@ -0,0 +1,133 @@
+import hashlib
+import hmac
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import webhook_daemon
+from webhook_daemon import ReportDaemon, make_server, verify_signature
+
+SECRET = "s3cret"
+REPO_URL = "https://github.com/student0000/homework"
+
+
+def _sign(body, secret=SECRET):
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def _push(after="a" * 40):
+    return {
+        "ref": "refs/heads/main",
+        "after": after,
+        "repository": {"html_url": REPO_URL, "full_name": "student0000/homework", "name": "homework",
+                       "owner": {"login": "student0000"}},
+        "commits": [{"id": after, "added": ["lib/a.py"], "modified": [], "removed": []}],
+    }
+
+
+@pytest.fixture
+def daemon_server(tmp_path, monkeypatch):
+    """
+    학생 한 명짜리 ReportDaemon을 웹훅 서버/처리 스레드와 함께 띄웁니다.
+    apply_push는 실제 분석 대신 호출된 (저장소 키, payload 목록)만 기록합니다.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "week_information.txt").write_text("week08,2025-10-20,2025-10-26\n", encoding="utf-8")
+    (tmp_path / "users.txt").write_text(f"{REPO_URL},token,student0000,홍길동\n", encoding="utf-8")
+    daemon = ReportDaemon("users.txt", debounce=0.3)
+
+    calls = []
+    applied = threading.Event()
+
+    def apply_push(key, payloads):
+        calls.append((key, payloads))
+        applied.set()
+
+    monkeypatch.setattr(daemon, "apply_push", apply_push)
+    server = make_server(daemon, port=0, secret=SECRET)
+    threads = [threading.Thread(target=server.serve_forever, daemon=True),
+               threading.Thread(target=daemon.run_worker, daemon=True)]
+    for thread in threads:
+        thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/webhook"
+    yield daemon, url, calls, applied
+    server.shutdown()
+    server.server_close()
+    daemon.queue.close()
+    for thread in threads:
+        thread.join(timeout=5)
+
+
+def _post(url, payload, signature=None, delivery=None):
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json", "X-GitHub-Event": "push",
+               "X-Hub-Signature-256": _sign(body) if signature is None else signature}
+    if delivery:
+        headers["X-GitHub-Delivery"] = delivery
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_verify_signature():
+    body = b'{"ref": "refs/heads/main"}'
+    assert verify_signature(SECRET, body, _sign(body))
+    assert not verify_signature(SECRET, body, _sign(body, secret="other"))
+    assert not verify_signature(SECRET, body + b" ", _sign(body))
+    assert not verify_signature(SECRET, body, None)
+    assert not verify_signature(SECRET, body, _sign(body)[len("sha256="):])
+
+
+def test_bad_signature_is_rejected(daemon_server):
+    daemon, url, calls, applied = daemon_server
+
+    status, body = _post(url, _push(), signature=_sign(b"something else"), delivery="d-1")
+    assert status == 401
+    assert body == {"error": "invalid signature"}
+    status, _ = _post(url, _push(), signature="", delivery="d-2")
+    assert status == 401
+
+    assert daemon.queue.pending_count() == 0
+    assert not applied.wait(daemon.queue.delay * 3)
+    assert calls == []
+
+
+def test_pushes_within_debounce_trigger_one_rerun(daemon_server):
+    daemon, url, calls, applied = daemon_server
+
+    for index in range(3):
+        status, body = _post(url, _push(after=str(index) * 40), delivery=f"d-{index}")
+        assert (status, body) == (202, {"accepted": True, "reason": "queued"})
+
+    assert applied.wait(5)
+    # 다른 push가 더 들어올 수 있는 시간이 지나도 다시 처리하지 않습니다.
+    time.sleep(daemon.queue.delay * 3)
+    assert len(calls) == 1
+    key, payloads = calls[0]
+    assert key == webhook_daemon._normalize_repo_url(REPO_URL)
+    assert [payload["after"] for payload in payloads] == ["0" * 40, "1" * 40, "2" * 40]
+
+
+def test_duplicate_delivery_is_ignored(daemon_server):
+    daemon, url, calls, applied = daemon_server
+
+    assert _post(url, _push(), delivery="same-id")[1]["accepted"] is True
+    status, body = _post(url, _push(), delivery="same-id")
+    assert status == 202
+    assert body == {"accepted": False, "reason": "duplicate delivery same-id"}
+
+    assert applied.wait(5)
+    time.sleep(daemon.queue.delay * 3)
+    assert len(calls) == 1
+    assert len(calls[0][1]) == 1
+
+    # 이미 처리한 전달을 나중에 다시 보내도 재실행하지 않습니다.
+    assert _post(url, _push(), delivery="same-id")[1]["accepted"] is False
+    assert daemon.queue.pending_count() == 0
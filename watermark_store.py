@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class WatermarkStore:
+    """
+    저장소별로 가장 최신 커밋(SHA, 시각), 이미 처리한 커밋 SHA 목록과 파일별 커밋 행(raw_data)을 보관합니다.
+
+    상태는 키(저장소/브랜치/사용자/디렉토리/주차 범위) 하나당 JSON 파일 하나로 directory 아래에 저장되며,
+    다음 실행에서는 주차 범위의 커밋 목록을 다시 받되 처리하지 않은 커밋만 상세 조회하여 저장된 행에 병합합니다.
+    (병합으로 들어온 커밋은 날짜가 워터마크보다 오래되었을 수 있으므로 날짜만으로는 새 커밋을 가려낼 수 없습니다)
+    """
+
+    def __init__(self, directory=".incremental"):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(repo_owner, repo_name, branch, username, directory, start_filter, end_filter):
+        return "|".join([
+            f"{repo_owner}/{repo_name}", branch, username, directory,
+            start_filter.isoformat(), end_filter.isoformat()
+        ])
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, key):
+        """
+        저장된 상태를 반환합니다. 없으면 None.
+        상태: {"key", "mode", "newest_sha", "newest_date", "known_shas", "rows"} (rows의 date는 datetime으로 복원)
+        known_shas는 이 항목을 추가하기 전에 저장된 상태에는 없습니다.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("key") != key:
+            return None
+        for row in state["rows"]:
+            row["date"] = datetime.fromisoformat(row["date"])
+        return state
+
+    def save(self, key, mode, newest_sha, newest_date, rows, known_shas=None):
+        state = {
+            "key": key,
+            "mode": mode,
+            "newest_sha": newest_sha,
+            "newest_date": newest_date,
+            "known_shas": sorted(known_shas) if known_shas is not None else None,
+            "rows": [dict(row, date=row["date"].isoformat()) for row in rows],
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+
+def merge_rows(old_rows, new_rows):
+    """
+    (커밋 URL, 파일명)이 같은 행은 새 행으로 대체하여 두 raw_data 목록을 병합합니다.
+    """
+    merged = {(row["url"], row["filename"]): row for row in old_rows}
+    for row in new_rows:
+        merged[(row["url"], row["filename"])] = row
+    return list(merged.values())
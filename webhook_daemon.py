@@ -0,0 +1,453 @@
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from cohort_stats import IncrementalScorer
+from git_analyzer import (analyze_commits, configure_cache, fetch_commit_detail, fetch_file_contents,
+                          load_week_ranges, rows_from_push_payload, summarize_commit_rows, union_window)
+from html_parser import Z_SCOPES
+from main import write_reports
+from watermark_store import merge_rows
+
+
+# 중복 전달을 걸러내기 위해 기억해 둘 최근 웹훅 전달 ID 수
+MAX_REMEMBERED_DELIVERIES = 10000
+
+
+def _normalize_repo_url(url):
+    """
+    저장소 URL을 비교용 키(소문자 owner/repo)로 바꿉니다. 끝의 슬래시와 .git 은 무시합니다.
+    """
+    path = urlparse(url.strip()).path.strip("/").lower()
+    if path.endswith(".git"):
+        path = path[:-4]
+    return "/".join(path.split("/")[:2])
+
+
+class CoalescingQueue:
+    """
+    저장소별로 웹훅 payload를 모아 두었다가, 첫 payload가 들어온 뒤 delay초가 지나면 한 번에 꺼내 줍니다.
+    그 사이 같은 저장소로 들어온 push는 같은 항목에 합쳐져 재계산/렌더링이 한 번만 일어납니다.
+    """
+
+    def __init__(self, delay=2.0):
+        self.delay = delay
+        self._pending = OrderedDict()  # 저장소 키 -> (처리 예정 시각, payload 목록)
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, key, payload):
+        with self._cond:
+            if key in self._pending:
+                self._pending[key][1].append(payload)
+            else:
+                self._pending[key] = (time.monotonic() + self.delay, [payload])
+                self._cond.notify()
+
+    def get(self):
+        """
+        처리할 때가 된 (저장소 키, payload 목록)을 반환합니다. close() 후에는 None.
+        """
+        with self._cond:
+            while not self._closed:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                # 모든 항목의 대기 시간이 같으므로 가장 먼저 들어온 항목이 가장 먼저 처리할 항목입니다.
+                key, (due, payloads) = next(iter(self._pending.items()))
+                remaining = due - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                del self._pending[key]
+                return key, payloads
+            return None
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._pending)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class ReportDaemon:
+    """
+    GitHub push 웹훅을 받아 보고서를 계속 최신 상태로 유지하는 서비스입니다.
+
+    시작할 때 users_account.txt 의 모든 학생을 한 번 분석하여 파일별 커밋 행과 파일 내용을 메모리에 올려 두고,
+    이후에는 push payload를 raw_data 행으로 바꾸어 해당 학생의 행에만 병합합니다.
+    변경된 파일 내용만 다시 받아 그 학생의 요약을 재계산하고, 그 학생의 보고서와 종합 보고서만 다시 만듭니다.
+    코호트 Z-score 기준은 주차별 IncrementalScorer로 누적 갱신하며, z_scope="cohort"이면 기준이 옮겨져
+    이상치 판정/평가가 달라질 수 있는 다른 학생의 보고서도 함께 다시 만듭니다.
+    """
+
+    def __init__(self, account_file, branch="main", directory="lib/", z_scope="student", enrich=True,
+                 concurrency=1, debounce=2.0, robust=False):
+        if z_scope not in Z_SCOPES:
+            raise ValueError(f"지원하지 않는 Z-score 기준입니다: {z_scope} ({', '.join(Z_SCOPES)})")
+        self.branch = branch
+        self.directory = directory
+        self.z_scope = z_scope
+        self.enrich = enrich
+        self.concurrency = concurrency
+        self.queue = CoalescingQueue(debounce)
+        self.week_ranges = load_week_ranges()
+        self.start_filter, self.end_filter = union_window(self.week_ranges)
+        # 주차가 하나면 main.py 와 같은 방식(week_ranges=None)으로 집계하여 결과 형식을 맞춥니다.
+        self._week_option = self.week_ranges if len(self.week_ranges) > 1 else None
+        self.robust = robust
+        self.scorers = {label: IncrementalScorer(robust=robust) for label, _, _ in self.week_ranges}
+        self._render_lock = threading.Lock()
+        # 최근에 받은 웹훅 전달 ID (X-GitHub-Delivery). GitHub가 같은 전달을 다시 보내도 한 번만 처리합니다.
+        self._deliveries = OrderedDict()
+        self._deliveries_lock = threading.Lock()
+        self.analyze_options = {}
+        self.updates = 0
+        self.last_update = None
+
+        # 정규화된 저장소 URL -> 학생 상태 (users_account.txt 순서 유지)
+        self.students = OrderedDict()
+        with open(account_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                parts = line.strip().split(",")
+                github_url, token, username = parts[0], parts[1], parts[2]
+                self.students[_normalize_repo_url(github_url)] = {
+                    "github_url": github_url,
+                    "token": token,
+                    "username": username,
+                    "name": parts[3] if len(parts) > 3 else username,
+                    "rows": [],
+                    "sources": {},
+                    "summary": pd.DataFrame(),
+                    "ready": False,  # 초기 분석(또는 다시 분석)에 성공했는지 여부
+                }
+
+    @staticmethod
+    def _headers(token):
+        return {
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+
+    def bootstrap(self, **analyze_options):
+        """
+        모든 학생을 한 번 분석하여 초기 상태를 만들고 전체 보고서를 생성합니다.
+        analyze_options는 analyze_commits에 그대로 전달되며 (backend, concurrency 등), 이후 다시 분석할 때도 사용합니다.
+        """
+        self.analyze_options = analyze_options
+        for state in self.students.values():
+            print(f"🔍 초기 분석 중: {state['name']} ({state['github_url']})")
+            if self._analyze_student(state):
+                self._rescore(state)
+        self.render()
+
+    def _analyze_student(self, state):
+        """
+        학생 한 명의 저장소 전체(주차 범위)를 다시 분석하여 행/파일 내용/요약을 바꿉니다.
+        실패하면 그 학생을 보고서에서 빼 두고(ready=False) False를 반환하며, 다음 push 때 다시 분석합니다.
+        push만으로 만든 일부 요약이 전체 결과처럼 보고되지 않도록 하기 위함입니다.
+        """
+        try:
+            summary = analyze_commits(state["github_url"], state["token"], state["username"],
+                                      directory=self.directory, branch=self.branch, exclude_first_commit=True,
+                                      user_actual_name=state["name"], collect_sources=True, collect_rows=True,
+                                      week_ranges=self._week_option, **self.analyze_options)
+        except Exception as e:
+            print(f"❌ 오류 발생 ({state['github_url']}): {e}")
+            state.update(rows=[], sources={}, summary=pd.DataFrame(), ready=False)
+            return False
+        state["rows"] = [{key: value for key, value in row.items() if key != "week_label"}
+                         for row in summary.attrs.pop("rows", [])]
+        state["sources"] = summary.attrs.pop("sources", {})
+        state["summary"] = summary
+        state["ready"] = True
+        return True
+
+    def enqueue(self, payload, delivery=None):
+        """
+        push payload를 해당 저장소의 대기열에 넣습니다. 반환값: (처리 여부, 사유)
+        delivery(X-GitHub-Delivery)가 이미 대기열에 넣었던 전달이면 (재전송) 다시 넣지 않습니다.
+        """
+        if payload.get("ref") != f"refs/heads/{self.branch}":
+            return False, f"branch {payload.get('ref')} ignored"
+        repository = payload.get("repository", {})
+        key = _normalize_repo_url(repository.get("html_url") or repository.get("url") or "")
+        if key not in self.students:
+            return False, f"unknown repository {key}"
+        if delivery:
+            with self._deliveries_lock:
+                if delivery in self._deliveries:
+                    return False, f"duplicate delivery {delivery}"
+                self._deliveries[delivery] = True
+                if len(self._deliveries) > MAX_REMEMBERED_DELIVERIES:
+                    self._deliveries.popitem(last=False)
+        self.queue.put(key, payload)
+        return True, "queued"
+
+    def apply_push(self, key, payloads):
+        """
+        한 저장소에 모인 push payload들을 행으로 바꾸어 병합하고, 그 학생의 요약과 보고서를 갱신합니다.
+
+        강제 push(forced)나 브랜치 삭제(deleted)로 기록이 바뀌었거나 초기 분석에 실패했던 학생은
+        payload를 병합하지 않고 저장소 전체를 다시 분석합니다 (사라진 커밋의 행이 남거나 일부 요약만 보고되지 않도록).
+        """
+        state = self.students[key]
+        if any(payload.get("forced") or payload.get("deleted") for payload in payloads):
+            print(f"🔁 {state['name']}: 강제 push/브랜치 삭제로 기록이 바뀌어 저장소 전체를 다시 분석합니다.")
+            return self._reanalyze(state)
+        if not state["ready"]:
+            print(f"🔁 {state['name']}: 초기 분석에 실패했던 학생이라 저장소 전체를 다시 분석합니다.")
+            return self._reanalyze(state)
+
+        repository = payloads[-1]["repository"]
+        owner = repository["owner"].get("login") or repository["owner"].get("name")
+        repo_name = repository["name"]
+        headers = self._headers(state["token"])
+
+        def detail_loader(sha):
+            try:
+                return fetch_commit_detail(owner, repo_name, sha, headers)
+            except Exception as e:
+                print(f"⚠️ 커밋 상세 조회 실패, payload의 파일 목록만 사용합니다 ({sha[:7]}): {e}")
+                return None
+
+        new_rows, changed = [], set()
+        for payload in payloads:
+            new_rows.extend(rows_from_push_payload(payload, state["username"], self.start_filter, self.end_filter,
+                                                   directory=self.directory,
+                                                   detail_loader=detail_loader if self.enrich else None))
+            for commit in payload.get("commits", []):
+                for field in ("added", "modified", "removed"):
+                    changed.update(path for path in commit.get(field, []) if path.startswith(self.directory))
+        if not new_rows and not changed:
+            print(f"💤 {state['name']}: 분석 대상 변경 없음 (push {len(payloads)}건)")
+            return False
+
+        def content_loader(filenames):
+            # 이번 push에서 바뀌지 않은 파일은 메모리에 있는 내용을 그대로 사용합니다.
+            contents = {f: state["sources"][f] for f in filenames if f in state["sources"] and f not in changed}
+            missing = [f for f in filenames if f not in contents]
+            if missing:
+                contents.update(fetch_file_contents(owner, repo_name, self.branch, missing, headers,
+                                                    concurrency=self.concurrency))
+            return contents
+
+        state["rows"] = merge_rows(state["rows"], new_rows)
+        summary = summarize_commit_rows(state["rows"], state["username"], content_loader, directory=self.directory,
+                                        exclude_first_commit=True, user_actual_name=state["name"],
+                                        collect_sources=True, week_ranges=self._week_option)
+        state["sources"] = summary.attrs.pop("sources", {})
+        state["summary"] = summary
+        names = {state["name"]}
+        rescored = self._rescore(state)
+        if self.z_scope == "cohort":
+            # 코호트 기준이 옮겨져 판정이 달라질 수 있는 학생의 보고서도 함께 다시 만듭니다.
+            names |= rescored
+        print(f"🔄 {state['name']}: push {len(payloads)}건, 새 커밋 행 {len(new_rows)}개 반영 "
+              f"(보고서 다시 생성: {len(names)}명)")
+        self.render(names=sorted(names))
+        return True
+
+    def _reanalyze(self, state):
+        self._analyze_student(state)
+        names = {state["name"]}
+        rescored = self._rescore(state)
+        if self.z_scope == "cohort":
+            names |= rescored
+        self.render(names=sorted(names))
+        return True
+
+    def _rescore(self, state):
+        """
+        학생 한 명의 새 요약을 주차별 코호트 기준에 반영하고, 판정이 달라질 수 있는 학생 이름 집합을 반환합니다.
+        코호트 기준의 학생 키는 실제 이름이 아니라 정규화된 저장소 URL입니다 (이름이 같은 학생끼리 덮어쓰지 않도록).
+        """
+        summary = state["summary"]
+        rescored = set()
+        for label, scorer in self.scorers.items():
+            if self._week_option is None or summary.empty:
+                week_df = summary
+            else:
+                week_df = summary[summary["week_label"] == label]
+            rescored |= scorer.update(_normalize_repo_url(state["github_url"]), week_df)
+        return {self.students[key]["name"] for key in rescored}
+
+    def render(self, names=None):
+        """
+        all_users_summary.csv 와 종합 보고서를 다시 만들고, 학생별 보고서는 names(None이면 전체)만 다시 만듭니다.
+        """
+        with self._render_lock:
+            frames = [state["summary"] for state in self.students.values() if not state["summary"].empty]
+            if not frames:
+                print("❗ 분석할 커밋 데이터가 없습니다.")
+                return
+            combined_df = pd.concat(frames, ignore_index=True)
+            combined_df.to_csv("all_users_summary.csv", index=False)
+            write_reports(combined_df, self.week_ranges, z_scope=self.z_scope, report_workers=1, names=names,
+                          robust=self.robust,
+                          cohort_stats_by_week={label: scorer.stats() for label, scorer in self.scorers.items()})
+            self.updates += 1
+            self.last_update = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def run_worker(self):
+        """
+        대기열에서 저장소별로 모인 push를 꺼내 처리합니다. close()로 대기열을 닫으면 끝납니다.
+        """
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            key, payloads = item
+            try:
+                self.apply_push(key, payloads)
+            except Exception as e:
+                print(f"❌ 웹훅 처리 중 오류 발생 ({key}): {e}")
+
+    def status(self):
+        return {
+            "students": len(self.students),
+            "pending": self.queue.pending_count(),
+            "updates": self.updates,
+            "last_update": self.last_update,
+        }
+
+
+def verify_signature(secret, body, signature):
+    """
+    GitHub의 X-Hub-Signature-256 헤더(sha256=<HMAC 16진수>)가 body와 일치하는지 확인합니다.
+    """
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    """
+    POST /webhook: GitHub push 웹훅 (application/json 또는 application/x-www-form-urlencoded)
+    GET /status: 대기열/갱신 현황(JSON)
+    """
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if urlparse(self.path).path.rstrip("/") == "/status":
+            self._send_json(200, self.server.report_daemon.status())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") not in ("", "/webhook"):
+            self._send_json(404, {"error": "not found"})
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        secret = self.server.secret
+        if secret and not verify_signature(secret, body, self.headers.get("X-Hub-Signature-256")):
+            self._send_json(401, {"error": "invalid signature"})
+            return
+
+        event = self.headers.get("X-GitHub-Event", "push")
+        if event == "ping":
+            self._send_json(200, {"ok": True})
+            return
+        if event != "push":
+            self._send_json(202, {"accepted": False, "reason": f"event {event} ignored"})
+            return
+
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+                body = parse_qs(body.decode("utf-8"))["payload"][0]
+            payload = json.loads(body)
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": f"invalid payload: {e}"})
+            return
+
+        accepted, reason = self.server.report_daemon.enqueue(payload, self.headers.get("X-GitHub-Delivery"))
+        if accepted:
+            print(f"📨 push 수신: {payload['repository'].get('full_name')} (커밋 {len(payload.get('commits', []))}개)")
+        self._send_json(202, {"accepted": accepted, "reason": reason})
+
+    def log_message(self, format, *args):
+        # 요청마다 출력되는 기본 접근 로그 대신 위의 요약 메시지만 출력합니다.
+        pass
+
+
+def make_server(report_daemon, host="127.0.0.1", port=8080, secret=None):
+    """
+    report_daemon에 웹훅을 전달하는 HTTP 서버를 만듭니다 (port=0이면 빈 포트를 사용합니다).
+    """
+    server = ThreadingHTTPServer((host, port), _WebhookHandler)
+    server.daemon_threads = True
+    server.report_daemon = report_daemon
+    server.secret = secret
+    return server
+
+
+def serve(report_daemon, host="127.0.0.1", port=8080, secret=None):
+    """
+    웹훅 서버와 처리 스레드를 실행합니다. Ctrl-C로 종료합니다.
+    """
+    server = make_server(report_daemon, host=host, port=port, secret=secret)
+    worker = threading.Thread(target=report_daemon.run_worker, daemon=True)
+    worker.start()
+    print(f"🚀 웹훅 서버 실행 중: http://{host}:{server.server_address[1]}/webhook (상태: /status)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 웹훅 서버를 종료합니다.")
+    finally:
+        server.server_close()
+        report_daemon.queue.close()
+        worker.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GitHub push 웹훅으로 커밋 분석 보고서를 계속 갱신하는 서버")
+    parser.add_argument("account_file", nargs="?", default="users_account.txt",
+                        help="분석할 계정 목록 파일 (기본값: users_account.txt)")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드할 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="바인드할 포트 (기본값: 8080)")
+    parser.add_argument("--branch", default="main", help="분석할 브랜치 (기본값: main)")
+    parser.add_argument("--secret", default=os.environ.get("GITHUB_WEBHOOK_SECRET"),
+                        help="웹훅 서명 검증용 비밀 값 (기본값: GITHUB_WEBHOOK_SECRET 환경 변수, 없으면 검증 안 함)")
+    parser.add_argument("--debounce", type=float, default=2.0,
+                        help="같은 저장소의 push를 모아 한 번에 처리하기 위해 기다릴 시간(초) (기본값: 2)")
+    parser.add_argument("--no-enrich", action="store_true",
+                        help="커밋 상세 조회 없이 payload의 파일 목록만 사용합니다 (추가/삭제 라인 수는 0)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="학생별 커밋 상세 정보/파일 내용을 동시에 조회할 최대 요청 수 (기본값: 1)")
+    parser.add_argument("--cache", metavar="PATH", default=None,
+                        help="GitHub 응답을 저장할 SQLite 캐시 파일 경로 (재시작 시 초기 분석 비용을 줄입니다)")
+    parser.add_argument("--z-scope", choices=Z_SCOPES, default="student",
+                        help="학생별 보고서의 Z-score 기준 (기본값: student)")
+    parser.add_argument("--robust-z", action="store_true",
+                        help="Z-score 기준으로 평균/표준편차 대신 중앙값/MAD를 사용합니다")
+    args = parser.parse_args()
+
+    if args.cache:
+        configure_cache(args.cache)
+
+    daemon = ReportDaemon(args.account_file, branch=args.branch, z_scope=args.z_scope, enrich=not args.no_enrich,
+                          concurrency=args.concurrency, debounce=args.debounce, robust=args.robust_z)
+    daemon.bootstrap(concurrency=args.concurrency)
+    serve(daemon, host=args.host, port=args.port, secret=args.secret)
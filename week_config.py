@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+# week_information.txt(주차 라벨,시작일,종료일) 읽기 도구.
+# 표준 라이브러리만 사용하므로 pandas/numpy를 불러오지 않는 가벼운 명령(cli.py show-week 등)에서도 씁니다.
+
+
+def _parse_week_line(line):
+    label, start_str, end_str = line.split(",")
+    start = datetime.strptime(start_str.strip(), "%Y-%m-%d")
+    # end_str은 자정(00:00:00)을 의미하므로, 하루를 더해서 다음날 자정 직전(23:59:59)으로 간주합니다.
+    # 이렇게 하지 않으면 마지막 날에 커밋한 내용이 필터링되지 않을 수 있습니다.
+    end = datetime.strptime(end_str.strip(), "%Y-%m-%d") + timedelta(days=1, microseconds=-1)
+    return label.strip(), start, end
+
+
+def load_week_range(file_path="week_information.txt"):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return _parse_week_line(f.readline().strip())
+
+
+def load_week_ranges(file_path="week_information.txt"):
+    """
+    week_information.txt 의 모든 줄(주차 라벨,시작일,종료일)을 읽어 [(label, start, end), ...] 로 반환합니다.
+    주차 범위는 서로 겹치면 안 됩니다 (커밋 하나는 한 주차에만 속함).
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        week_ranges = [_parse_week_line(line.strip()) for line in f if line.strip()]
+
+    ordered = sorted(week_ranges, key=lambda week: week[1])
+    for (label_a, _, end_a), (label_b, start_b, _) in zip(ordered, ordered[1:]):
+        if start_b <= end_a:
+            raise ValueError(f"주차 범위가 겹칩니다: {label_a}, {label_b}")
+    return week_ranges
+
+
+def union_window(week_ranges):
+    """
+    여러 주차 범위를 모두 포함하는 (가장 이른 시작, 가장 늦은 종료)를 반환합니다.
+    """
+    return min(start for _, start, _ in week_ranges), max(end for _, _, end in week_ranges)